@@ -27,11 +27,33 @@ OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY", "")
 OPENAI_CHAT_MODEL = os.environ.get("OPENAI_CHAT_MODEL", "gpt-5.1-mini")
 OPENAI_EMBED_MODEL = os.environ.get("OPENAI_EMBED_MODEL", "text-embedding-3-small")
 OPENAI_EMBED_DIM = int(os.environ.get("OPENAI_EMBED_DIM", "1536"))
+# Seconds workers may keep reading the previous embedding version after a switch.
+EMBEDDING_VERSION_CACHE_TTL = int(os.environ.get("EMBEDDING_VERSION_CACHE_TTL", "30"))
 RECAPTCHA_SITE_KEY = os.environ.get("RECAPTCHA_SITE_KEY", "")
 RECAPTCHA_SECRET_KEY = os.environ.get("RECAPTCHA_SECRET_KEY", "")
 RECAPTCHA_MIN_SCORE = float(os.environ.get("RECAPTCHA_MIN_SCORE", "0.5"))
+# Seconds a successful verification is reused within one session (0 = off).
+RECAPTCHA_SESSION_TTL = int(os.environ.get("RECAPTCHA_SESSION_TTL", "0"))
 RESUME_URL = os.environ.get("RESUME_URL", "")
 
+# OpenAI resilience: per-request deadline, retries, hedging and circuit breaker
+CHAT_DEADLINE_SECONDS = float(os.environ.get("CHAT_DEADLINE_SECONDS", "15"))
+OPENAI_LLM_TIMEOUT = float(os.environ.get("OPENAI_LLM_TIMEOUT", "12"))
+OPENAI_EMBED_TIMEOUT = float(os.environ.get("OPENAI_EMBED_TIMEOUT", "4"))
+OPENAI_RETRIES = int(os.environ.get("OPENAI_RETRIES", "2"))
+OPENAI_HEDGE_ENABLED = os.environ.get("OPENAI_HEDGE_ENABLED", "1") == "1"
+OPENAI_HEDGE_QUANTILE = float(os.environ.get("OPENAI_HEDGE_QUANTILE", "0.95"))
+OPENAI_HEDGE_MIN_SAMPLES = int(os.environ.get("OPENAI_HEDGE_MIN_SAMPLES", "20"))
+OPENAI_BREAKER_THRESHOLD = int(os.environ.get("OPENAI_BREAKER_THRESHOLD", "5"))
+OPENAI_BREAKER_RESET_SECONDS = float(os.environ.get("OPENAI_BREAKER_RESET_SECONDS", "30"))
+LLM_ANSWER_CACHE_TTL = int(os.environ.get("LLM_ANSWER_CACHE_TTL", "3600"))
+
+# Outbound HTTP (pooled keep-alive client)
+HTTP_CONNECT_TIMEOUT = float(os.environ.get("HTTP_CONNECT_TIMEOUT", "2"))
+HTTP_READ_TIMEOUT = float(os.environ.get("HTTP_READ_TIMEOUT", "5"))
+HTTP_MAX_CONNECTIONS = int(os.environ.get("HTTP_MAX_CONNECTIONS", "10"))
+HTTP_KEEPALIVE_EXPIRY = float(os.environ.get("HTTP_KEEPALIVE_EXPIRY", "60"))
+
 # Application definition
 
 INSTALLED_APPS = [
@@ -48,7 +70,9 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
-    "django.contrib.sessions.middleware.SessionMiddleware",
+    "chatbot.observability.middleware.RequestTimingMiddleware",
+    "django.middleware.gzip.GZipMiddleware",
+    "chatbot.observability.middleware.TimedSessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
@@ -78,18 +102,23 @@ WSGI_APPLICATION = "config.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/6.0/ref/settings/#databases
 
+
+def database_from_url(url: str) -> dict:
+    parsed = urlparse(url)
+    return {
+        "ENGINE": "django.db.backends.postgresql",
+        "NAME": parsed.path.lstrip("/"),
+        "USER": parsed.username or "",
+        "PASSWORD": parsed.password or "",
+        "HOST": parsed.hostname or "",
+        "PORT": str(parsed.port or "5432"),
+    }
+
+
 DATABASE_URL = os.environ.get("DATABASE_URL", "")
 if DATABASE_URL:
-    parsed = urlparse(DATABASE_URL)
     DATABASES = {
-        "default": {
-            "ENGINE": "django.db.backends.postgresql",
-            "NAME": parsed.path.lstrip("/"),
-            "USER": parsed.username or "",
-            "PASSWORD": parsed.password or "",
-            "HOST": parsed.hostname or "",
-            "PORT": str(parsed.port or "5432"),
-        }
+        "default": database_from_url(DATABASE_URL),
     }
 elif os.environ.get("DB_NAME"):
     DATABASES = {
@@ -110,6 +139,135 @@ else:
         }
     }
 
+# Read replicas (comma separated URLs). Similarity search and other Chunk
+# reads go to a healthy replica; writes, sessions and ingest stay on default.
+DATABASE_REPLICA_URLS = [
+    url.strip()
+    for url in os.environ.get("DATABASE_REPLICA_URLS", "").split(",")
+    if url.strip()
+]
+REPLICA_CONNECT_TIMEOUT = int(os.environ.get("REPLICA_CONNECT_TIMEOUT", "2"))
+REPLICA_HEALTH_INTERVAL = float(os.environ.get("REPLICA_HEALTH_INTERVAL", "15"))
+REPLICA_MAX_LAG_SECONDS = float(os.environ.get("REPLICA_MAX_LAG_SECONDS", "30"))
+DATABASE_REPLICAS = []
+for index, url in enumerate(DATABASE_REPLICA_URLS):
+    alias = f"replica{index}"
+    DATABASES[alias] = {
+        **database_from_url(url),
+        "OPTIONS": {"connect_timeout": REPLICA_CONNECT_TIMEOUT},
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS.append(alias)
+DATABASE_ROUTERS = ["chatbot.infrastructure.django.routers.ReplicaRouter"] if DATABASE_REPLICAS else []
+
+# Cache
+# Shared across gunicorn workers when CACHE_URL points at Redis or the database
+# cache table (run `python manage.py createcachetable` once for "db").
+
+CACHE_URL = os.environ.get("CACHE_URL", "")
+if CACHE_URL.startswith(("redis://", "rediss://")):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": CACHE_URL,
+        }
+    }
+elif CACHE_URL == "db":
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+            "LOCATION": "django_cache",
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+# REST framework / chat admission control
+
+REST_FRAMEWORK = {
+    "NUM_PROXIES": (
+        int(os.environ["NUM_PROXIES"]) if os.environ.get("NUM_PROXIES") else None
+    ),
+    "DEFAULT_THROTTLE_RATES": {
+        "chat_ip": os.environ.get("CHAT_RATE_IP", "20/min"),
+        "chat_session": os.environ.get("CHAT_RATE_SESSION", "10/min"),
+    },
+}
+
+CHAT_MAX_CONCURRENCY = int(os.environ.get("CHAT_MAX_CONCURRENCY", "4"))
+CHAT_QUEUE_SIZE = int(os.environ.get("CHAT_QUEUE_SIZE", "8"))
+CHAT_QUEUE_TIMEOUT = float(os.environ.get("CHAT_QUEUE_TIMEOUT", "5"))
+CHAT_SLOT_TTL = int(os.environ.get("CHAT_SLOT_TTL", "120"))
+
+# Identical in-flight chat queries share one computation (per process via
+# futures, across workers via a short lock in the shared cache).
+CHAT_COALESCE_ENABLED = os.environ.get("CHAT_COALESCE_ENABLED", "1") == "1"
+CHAT_COALESCE_LOCK_TTL = int(os.environ.get("CHAT_COALESCE_LOCK_TTL", "30"))
+CHAT_COALESCE_WAIT_TIMEOUT = float(os.environ.get("CHAT_COALESCE_WAIT_TIMEOUT", "20"))
+CHAT_COALESCE_RESULT_TTL = int(os.environ.get("CHAT_COALESCE_RESULT_TTL", "10"))
+
+# Starter prompts on the chat page; their answers are precomputed by
+# `python manage.py warm_answers` (also run after every ingest).
+CHAT_SUGGESTED_QUESTIONS = [
+    question.strip()
+    for question in os.environ.get(
+        "CHAT_SUGGESTED_QUESTIONS",
+        "What is your tech stack?|Tell me about your work experience.|"
+        "What projects have you built?|How can I contact you?",
+    ).split("|")
+    if question.strip()
+]
+# Answers are rewritten and pruned by the ingest worker. A per-process LocMemCache
+# never hears about that, so its copies must expire soon after a re-ingest.
+CANNED_ANSWER_CACHE_TTL = int(
+    os.environ.get(
+        "CANNED_ANSWER_CACHE_TTL",
+        "30" if CACHES["default"]["BACKEND"].endswith(".LocMemCache") else "3600",
+    )
+)
+
+# Page and fragment caching
+# Bump PAGE_CACHE_VERSION (defaults to the Render deploy commit) to invalidate.
+PAGE_CACHE_VERSION = os.environ.get("PAGE_CACHE_VERSION") or os.environ.get("RENDER_GIT_COMMIT", "1")
+PAGE_CACHE_MAX_AGE = int(os.environ.get("PAGE_CACHE_MAX_AGE", "300"))
+FRAGMENT_CACHE_TTL = int(os.environ.get("FRAGMENT_CACHE_TTL", "86400"))
+
+# Observability
+# Bearer token for /api/metrics/; without one the endpoint is only served in DEBUG.
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN", "")
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "chatbot": {
+            "handlers": ["console"],
+            "level": os.environ.get("CHATBOT_LOG_LEVEL", "INFO"),
+        },
+    },
+}
+
+# pgvector >= 0.8 iterative index scans for filtered searches
+# ("relaxed_order", "strict_order", or "off" on older servers).
+PGVECTOR_ITERATIVE_SCAN = os.environ.get("PGVECTOR_ITERATIVE_SCAN", "relaxed_order")
+
+# Background ingestion (python manage.py run_ingest_worker)
+INGEST_WORKER_CONCURRENCY = int(os.environ.get("INGEST_WORKER_CONCURRENCY", "2"))
+INGEST_BATCH_SIZE = int(os.environ.get("INGEST_BATCH_SIZE", "16"))
+INGEST_MAX_ATTEMPTS = int(os.environ.get("INGEST_MAX_ATTEMPTS", "3"))
+INGEST_LEASE_SECONDS = int(os.environ.get("INGEST_LEASE_SECONDS", "300"))
+INGEST_MAX_UPLOAD_BYTES = int(os.environ.get("INGEST_MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+# Max SimHash Hamming distance (of 64 bits) at which an incoming chunk is
+# collapsed into an existing one of the same source type and language (-1 = off).
+INGEST_DEDUP_MAX_DISTANCE = int(os.environ.get("INGEST_DEDUP_MAX_DISTANCE", "3"))
+
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
 
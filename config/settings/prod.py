@@ -5,7 +5,9 @@ DEBUG = False
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
-    "django.contrib.sessions.middleware.SessionMiddleware",
+    "chatbot.observability.middleware.RequestTimingMiddleware",
+    "django.middleware.gzip.GZipMiddleware",
+    "chatbot.observability.middleware.TimedSessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
@@ -27,4 +29,8 @@ CSRF_TRUSTED_ORIGINS = [
 
 SECURE_PROXY_SSL_HEADER = ("HTTP_X_FORWARDED_PROTO", "https")
 
+# Render puts exactly one proxy in front of the app. Without a count DRF keys
+# throttles on the whole client-supplied X-Forwarded-For header.
+REST_FRAMEWORK["NUM_PROXIES"] = int(os.environ.get("NUM_PROXIES", "1"))
+
 STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
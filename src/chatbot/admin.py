@@ -1,11 +1,135 @@
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.db.models import Value
+from django.db.models.functions import Cast
+from django.template.response import TemplateResponse
+from pgvector.django import CosineDistance, VectorField
 
-from chatbot.models import Chunk
+from chatbot.infrastructure.embeddings.versions import get_active_version
+from chatbot.models import CannedAnswer, Chunk, ChunkEmbedding, EmbeddingVersion, IngestJob
+
+NEIGHBOUR_COUNT = 10
 
 
 @admin.register(Chunk)
 class ChunkAdmin(admin.ModelAdmin):
     list_display = ("source", "created_at")
     search_fields = ("source", "content")
+    exclude = ("embedding",)
+    readonly_fields = ("merged_sources",)
+    actions = ["nearest_neighbours"]
+    # Skip the unfiltered COUNT(*) shown next to search results.
+    show_full_result_count = False
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).without_embedding()
+
+    @admin.action(description="Show nearest neighbours of the selected chunk")
+    def nearest_neighbours(self, request, queryset):
+        selected = list(queryset.values("pk", "source", "content")[:2])
+        if len(selected) != 1:
+            self.message_user(request, "Select exactly one chunk.", level=messages.WARNING)
+            return None
+
+        chunk = selected[0]
+        version = get_active_version()
+        neighbours = self._neighbours(chunk["pk"], version)
+        if neighbours is None:
+            self.message_user(request, "The selected chunk has no embedding yet.", level=messages.WARNING)
+            return None
+        return TemplateResponse(
+            request,
+            "admin/chatbot/chunk/nearest_neighbours.html",
+            {
+                **self.admin_site.each_context(request),
+                "opts": self.model._meta,
+                "title": f"Nearest neighbours of {chunk['source']}",
+                "chunk": chunk,
+                "version": version,
+                "neighbours": [
+                    {"chunk": neighbour, "score": max(0.0, 1.0 - float(distance))}
+                    for neighbour, distance in neighbours
+                ],
+            },
+        )
+
+    def _neighbours(self, pk: int, version: EmbeddingVersion | None):
+        """Closest chunks through the index the chat read path uses."""
+        if version is None:
+            vector = Chunk.objects.filter(pk=pk).values_list("embedding", flat=True).first()
+            if vector is None:
+                return None
+            rows = (
+                Chunk.objects
+                .without_embedding()
+                .annotate(distance=CosineDistance("embedding", vector))
+                .order_by("distance")
+                .exclude(pk=pk)[:NEIGHBOUR_COUNT]
+            )
+            return [(row, row.distance) for row in rows]
+
+        embeddings = ChunkEmbedding.objects.filter(version=version)
+        vector = embeddings.filter(chunk_id=pk).values_list("embedding", flat=True).first()
+        if vector is None:
+            return None
+        typed = VectorField(dimensions=version.dimensions)
+        rows = (
+            embeddings
+            .annotate(
+                distance=CosineDistance(
+                    Cast("embedding", typed),
+                    Cast(Value(vector, output_field=VectorField()), typed),
+                )
+            )
+            .order_by("distance")
+            .exclude(chunk_id=pk)
+            .select_related("chunk")
+            .defer("embedding", "chunk__embedding")[:NEIGHBOUR_COUNT]
+        )
+        return [(row.chunk, row.distance) for row in rows]
+
+
+@admin.register(EmbeddingVersion)
+class EmbeddingVersionAdmin(admin.ModelAdmin):
+    list_display = ("name", "model", "dimensions", "status", "created_at", "activated_at")
+    readonly_fields = ("status", "created_at", "activated_at")
+
+    def has_add_permission(self, request):
+        # Versions are created and switched by backfill_embeddings / activate_embedding_version.
+        return False
+
+
+@admin.register(CannedAnswer)
+class CannedAnswerAdmin(admin.ModelAdmin):
+    list_display = ("question", "updated_at")
+    readonly_fields = ("normalized", "fingerprint", "updated_at")
+
+    def has_add_permission(self, request):
+        # Entries come from `python manage.py warm_answers`.
+        return False
+
+
+@admin.register(IngestJob)
+class IngestJobAdmin(admin.ModelAdmin):
+    list_display = ("filename", "source_type", "status", "done_chunks", "total_chunks", "attempts", "created_at")
+    list_filter = ("status", "source_type")
+    exclude = ("content",)
+    readonly_fields = (
+        "status",
+        "total_chunks",
+        "done_chunks",
+        "attempts",
+        "last_error",
+        "run_after",
+        "locked_by",
+        "locked_at",
+        "finished_at",
+    )
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).defer("content")
+
+    def has_add_permission(self, request):
+        # Uploads go through POST /api/ingest/jobs/ so the file is validated.
+        return False
 
 # Register your models here.
@@ -0,0 +1,36 @@
+import math
+from typing import Iterable, Sequence
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """Nearest-rank percentile, q in [0, 100]."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def latency_summary(seconds: Sequence[float]) -> dict[str, float]:
+    return {
+        "p50_ms": percentile(seconds, 50) * 1000,
+        "p95_ms": percentile(seconds, 95) * 1000,
+        "p99_ms": percentile(seconds, 99) * 1000,
+        "max_ms": max(seconds, default=0.0) * 1000,
+    }
+
+
+def recall_at_k(retrieved: Sequence[str], relevant: Iterable[str], k: int) -> float:
+    expected = set(relevant)
+    if not expected:
+        return 1.0
+    hits = expected.intersection(retrieved[:k])
+    return len(hits) / min(len(expected), k)
+
+
+def reciprocal_rank(retrieved: Sequence[str], relevant: Iterable[str]) -> float:
+    expected = set(relevant)
+    for rank, item in enumerate(retrieved, start=1):
+        if item in expected:
+            return 1.0 / rank
+    return 0.0
@@ -0,0 +1,29 @@
+import hashlib
+import re
+import unicodedata
+
+from chatbot.domain.ports import RetrievedChunk
+
+_WHITESPACE = re.compile(r"\s+")
+_TRAILING_PUNCTUATION = ".?!。？！"
+
+
+def normalize_question(text: str) -> str:
+    """Fold case, width and spacing so trivially different phrasings share one key."""
+    text = unicodedata.normalize("NFKC", text).casefold()
+    text = _WHITESPACE.sub(" ", text).strip()
+    return text.rstrip(_TRAILING_PUNCTUATION + " ")
+
+
+def chunk_fingerprint(chunks: list[RetrievedChunk]) -> str:
+    """Identify the retrieved context; it changes when ingestion touches those chunks."""
+    digest = hashlib.sha256()
+    for chunk in sorted(chunks, key=lambda c: (c["source"], c["content"])):
+        digest.update(chunk["source"].encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(chunk["content"].encode("utf-8"))
+        digest.update(b"\0")
+        for source in chunk.get("merged_sources", []):
+            digest.update(source.encode("utf-8"))
+            digest.update(b"\0")
+    return digest.hexdigest()
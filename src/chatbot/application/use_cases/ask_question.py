@@ -1,5 +1,7 @@
-from chatbot.domain.ports import ChunkRepository, LLMClient, RetrievedChunk
+from chatbot.domain.errors import UpstreamUnavailable
+from chatbot.domain.ports import ChunkFilter, ChunkRepository, LLMClient, RetrievedChunk
 from chatbot.application.policies import SimilarityPolicy
+from chatbot.observability.tracing import annotate
 
 
 SYSTEM_PROMPT = """You are Shintaro Miyata. Answer in first person as Shintaro Miyata.
@@ -13,9 +15,25 @@ class AskQuestionUseCase:
         self.llm = llm
         self.policy = policy
 
-    def execute(self, question: str) -> dict:
-        chunks = list(self.repo.search(question, k=4))
+    def retrieve(self, question: str, filters: ChunkFilter | None = None) -> list[RetrievedChunk]:
+        return list(self.repo.search(question, k=4, filters=filters))
+
+    def execute(self, question: str, filters: ChunkFilter | None = None) -> dict:
+        try:
+            chunks = self.retrieve(question, filters)
+        except UpstreamUnavailable:
+            # Retrieval is down; answer without context rather than failing.
+            annotate(retrieval_unavailable=True)
+            chunks = []
+        return self.answer(question, chunks)
+
+    def answer(self, question: str, chunks: list[RetrievedChunk]) -> dict:
+        annotate(
+            retrieved=len(chunks),
+            best_score=max((c["score"] for c in chunks), default=None),
+        )
         if self.policy.is_insufficient(chunks):
+            annotate(context_used=False)
             return {
                 "answer": self.llm.answer(
                     SYSTEM_PROMPT,
@@ -24,10 +42,11 @@ class AskQuestionUseCase:
                 "sources": [],
             }
         
+        annotate(context_used=True)
         context = "\n\n".join([f"[{c['source']}] {c['content']}" for c in chunks])
         user = f"context:\n{context}\n\nQuestion:\n{question}"
         answer = self.llm.answer(SYSTEM_PROMPT, user)
-        sources = sorted(set(c["source"] for c in chunks))
+        sources = sorted({source for c in chunks for source in (c["source"], *c.get("merged_sources", []))})
         return {
             "answer": answer,
             "sources": sources,
@@ -0,0 +1,50 @@
+import logging
+from typing import Sequence
+
+from chatbot.application.questions import chunk_fingerprint, normalize_question
+from chatbot.application.use_cases.ask_question import AskQuestionUseCase
+from chatbot.domain.ports import CannedAnswerStore
+
+logger = logging.getLogger(__name__)
+
+
+class WarmAnswersUseCase:
+    """Precompute answers for the suggested questions, skipping unchanged context."""
+
+    def __init__(self, ask: AskQuestionUseCase, store: CannedAnswerStore):
+        self.ask = ask
+        self.store = store
+
+    def execute(self, questions: Sequence[str], force: bool = False) -> dict[str, int]:
+        counts = {"generated": 0, "unchanged": 0, "failed": 0, "pruned": 0}
+        keys = []
+        for question in questions:
+            normalized = normalize_question(question)
+            if not normalized or normalized in keys:
+                continue
+            keys.append(normalized)
+            try:
+                chunks = self.ask.retrieve(question)
+                fingerprint = chunk_fingerprint(chunks)
+                existing = self.store.get(normalized)
+                if not force and existing and existing["fingerprint"] == fingerprint:
+                    counts["unchanged"] += 1
+                    continue
+                result = self.ask.answer(question, chunks)
+            except Exception:
+                # Keep serving the previous entry; the next warm-up retries.
+                logger.exception("Warming the answer for %r failed", question)
+                counts["failed"] += 1
+                continue
+            self.store.save(
+                normalized,
+                {
+                    "question": question,
+                    "answer": result["answer"],
+                    "sources": result["sources"],
+                    "fingerprint": fingerprint,
+                },
+            )
+            counts["generated"] += 1
+        counts["pruned"] = self.store.prune(keys)
+        return counts
@@ -0,0 +1,115 @@
+"""Micro-benchmarks for the offline fakes and hot paths.
+
+Run from the repository root with pytest-benchmark installed:
+
+    python -m pytest src/chatbot/benchmarks.py
+
+Named outside Django's test*.py pattern so `manage.py test` does not collect it.
+"""
+import os
+from importlib import import_module
+from unittest import mock
+
+import numpy as np
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.dev")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.test import override_settings  # noqa: E402
+from rest_framework.test import APIRequestFactory  # noqa: E402
+
+from chatbot.application.evaluation import recall_at_k  # noqa: E402
+from chatbot.application.policies import SimilarityPolicy  # noqa: E402
+from chatbot.application.use_cases.ask_question import AskQuestionUseCase  # noqa: E402
+from chatbot.infrastructure.embeddings.hash_embedder import HashEmbedder  # noqa: E402
+from chatbot.infrastructure.ingestion.dedup import NearDuplicateIndex, simhash  # noqa: E402
+from chatbot.infrastructure.llm.fake_client import FakeLLMClient  # noqa: E402
+from chatbot.infrastructure.memory.repositories import InMemoryVectorChunkRepository  # noqa: E402
+from chatbot.management.commands.benchmark_rag import BenchmarkChatView, SyntheticCorpus  # noqa: E402
+
+DIMENSIONS = 256
+K = 4
+QUERY = "w12 w345 w678 w901"
+
+
+@pytest.fixture(scope="module")
+def embedder():
+    return HashEmbedder(DIMENSIONS)
+
+
+@pytest.fixture(scope="module", params=[1_000, 10_000, 100_000], ids=lambda size: f"{size}-chunks")
+def corpus(request, embedder):
+    return SyntheticCorpus(embedder, request.param, words_per_chunk=40, vocabulary_size=5000, seed=0)
+
+
+@pytest.fixture(scope="module")
+def repo(embedder, corpus):
+    return InMemoryVectorChunkRepository(embedder, corpus.contents, corpus.sources, corpus.vectors)
+
+
+def test_hash_embedder(benchmark, embedder):
+    vector = benchmark(embedder.embed, "Django REST framework with pgvector on PostgreSQL")
+    assert len(vector) == DIMENSIONS
+
+
+def test_in_memory_search(benchmark, embedder, corpus, repo):
+    query, _ = corpus.queries(1, words_per_query=6)[0]
+    results = benchmark(repo.search, query, K)
+    retrieved = [chunk["source"] for chunk in results]
+    assert recall_at_k(retrieved, corpus.exact_top_k(embedder, query, K), K) == 1.0
+
+
+def test_ask_question(benchmark, repo):
+    use_case = AskQuestionUseCase(repo, FakeLLMClient(), SimilarityPolicy(threshold=0.0))
+    result = benchmark(use_case.execute, QUERY)
+    assert result["sources"]
+
+
+@override_settings(SESSION_ENGINE="django.contrib.sessions.backends.cache")
+def test_chat_view(benchmark, embedder):
+    contents = [f"w{i} w{i + 1} w{i + 2}" for i in range(0, 300, 3)]
+    repo = InMemoryVectorChunkRepository(
+        embedder,
+        contents,
+        [f"doc-{i}.md" for i in range(len(contents))],
+        np.stack([embedder.embed_array(text) for text in contents]),
+    )
+    view = BenchmarkChatView.as_view(
+        use_case=AskQuestionUseCase(repo, FakeLLMClient(), SimilarityPolicy(threshold=0.0)),
+    )
+    factory = APIRequestFactory()
+    session_store = import_module(settings.SESSION_ENGINE).SessionStore
+
+    def post():
+        request = factory.post(
+            "/api/chat/",
+            {"query": QUERY, "recaptcha_token": "t", "recaptcha_action": "chat"},
+            format="json",
+        )
+        request.session = session_store()
+        return view(request)
+
+    with mock.patch.object(BenchmarkChatView, "get_single_flight", return_value=None):
+        response = benchmark(post)
+    assert response.status_code == 200
+
+
+def test_simhash(benchmark):
+    text = "Built a Django and pgvector retrieval pipeline for a portfolio chatbot. " * 8
+    assert benchmark(simhash, text) == simhash(text)
+
+
+def test_near_duplicate_match(benchmark):
+    index = NearDuplicateIndex(max_distance=3)
+    for i in range(10_000):
+        index.add(simhash(f"chunk {i} of a synthetic document"), f"doc-{i}.md", f"doc-{i}")
+    fingerprint = simhash("chunk 42 of a synthetic document")
+    assert benchmark(index.match, fingerprint, "other") is not None
+
@@ -0,0 +1,2 @@
+class UpstreamUnavailable(Exception):
+    """An external dependency failed, timed out, or its circuit is open."""
@@ -1,15 +1,39 @@
-from typing import Protocol, Sequence, TypedDict
+from typing import NotRequired, Protocol, Sequence, TypedDict
 
 
 class RetrievedChunk(TypedDict):
     content: str
     source: str
     score: float
+    # Sources of near-duplicate chunks collapsed into this one at ingest.
+    merged_sources: NotRequired[list[str]]
+
+
+class ChunkFilter(TypedDict, total=False):
+    source_type: str
+    document_id: str
+    language: str
+    page: int
 
 
 class ChunkRepository(Protocol):
-    def search(self, query: str, k: int) -> Sequence[RetrievedChunk]: ...
+    def search(self, query: str, k: int, filters: ChunkFilter | None = None) -> Sequence[RetrievedChunk]: ...
 
 
 class LLMClient(Protocol):
-    def answer(self, system: str, user: str) -> str: ...
\ No newline at end of file
+    def answer(self, system: str, user: str) -> str: ...
+
+
+class CannedAnswer(TypedDict):
+    question: str
+    answer: str
+    sources: list[str]
+    fingerprint: str
+
+
+class CannedAnswerStore(Protocol):
+    def get(self, normalized: str) -> CannedAnswer | None: ...
+
+    def save(self, normalized: str, entry: CannedAnswer) -> None: ...
+
+    def prune(self, keep: Sequence[str]) -> int: ...
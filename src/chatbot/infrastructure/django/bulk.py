@@ -0,0 +1,261 @@
+import gzip
+from contextlib import contextmanager
+from pathlib import Path
+from typing import BinaryIO, Iterable
+
+from django.db import connection, transaction
+from django.db.models import CharField, OuterRef, Subquery, Value
+from django.utils import timezone
+from pgvector.django import HnswIndex, VectorField
+
+from chatbot.domain.ports import ChunkFilter
+from chatbot.models import Chunk, ChunkEmbedding, EmbeddingVersion
+
+# Column layout of exported files; import expects exactly these, in order.
+COPY_COLUMNS = (
+    "content",
+    "source",
+    "source_type",
+    "document_id",
+    "page",
+    "language",
+    "embedding",
+    "simhash",
+    "merged_sources",
+    "created_at",
+)
+COPY_TYPES = (
+    "text",
+    "varchar",
+    "varchar",
+    "varchar",
+    "int4",
+    "varchar",
+    "vector",
+    "int8",
+    "jsonb",
+    "timestamptz",
+)
+# Dumps add the active version's name and vector to every row (both NULL when
+# the legacy column is the read path), so the rows load without the API.
+EXPORT_COLUMNS = (*COPY_COLUMNS, "version_name", "version_embedding")
+EXPORT_TYPES = (*COPY_TYPES, "varchar", "vector")
+STAGING_TABLE = "chatbot_chunk_import"
+COPY_SIGNATURE = b"PGCOPY\n\xff\r\n\x00"
+READ_BLOCK = 1 << 20
+
+
+def copy_supported() -> bool:
+    if connection.vendor != "postgresql":
+        return False
+    from django.db.backends.postgresql.psycopg_any import is_psycopg3
+
+    return is_psycopg3
+
+
+def open_dump(path: Path, mode: str) -> BinaryIO:
+    if path.suffix == ".gz":
+        return gzip.open(path, mode, compresslevel=1)
+    return path.open(mode)
+
+
+def _copy_target(model=Chunk, columns=COPY_COLUMNS) -> str:
+    quote = connection.ops.quote_name
+    return f"{quote(model._meta.db_table)} ({', '.join(quote(column) for column in columns)})"
+
+
+def _register_vector(raw) -> None:
+    from pgvector.psycopg.vector import register_vector_info
+    from psycopg.types import TypeInfo
+
+    register_vector_info(raw, TypeInfo.fetch(raw.connection, "vector"))
+
+
+def _reserve_pks(model, count: int) -> list[int]:
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT nextval(pg_get_serial_sequence(%s, 'id')) FROM generate_series(1, %s)",
+            [model._meta.db_table, count],
+        )
+        return [pk for (pk,) in cursor.fetchall()]
+
+
+def insert_chunks(chunks: Iterable[Chunk], assign_pks: bool = False) -> int:
+    """Insert unsaved chunks with binary COPY, falling back to bulk_create.
+
+    Vectors go over the wire as packed float4 instead of text literals. COPY
+    returns no keys, so with `assign_pks` the ids are drawn from the sequence
+    first and set on the chunks.
+    """
+    if not copy_supported():
+        return len(Chunk.objects.bulk_create(list(chunks)))
+
+    from pgvector import Vector
+    from psycopg.types.json import Jsonb
+
+    columns, types = COPY_COLUMNS, COPY_TYPES
+    if assign_pks:
+        chunks = list(chunks)
+        for chunk, pk in zip(chunks, _reserve_pks(Chunk, len(chunks))):
+            chunk.pk = pk
+        columns, types = ("id", *columns), ("int8", *types)
+
+    now = timezone.now()
+    count = 0
+    connection.ensure_connection()
+    with connection.cursor() as cursor:
+        raw = cursor.cursor
+        _register_vector(raw)
+        with raw.copy(f"COPY {_copy_target(Chunk, columns)} FROM STDIN (FORMAT BINARY)") as copy:
+            copy.set_types(types)
+            for chunk in chunks:
+                row = (
+                    chunk.content,
+                    chunk.source,
+                    chunk.source_type,
+                    chunk.document_id,
+                    chunk.page,
+                    chunk.language,
+                    None if chunk.embedding is None else Vector(chunk.embedding),
+                    chunk.simhash,
+                    Jsonb(chunk.merged_sources),
+                    chunk.created_at or now,
+                )
+                copy.write_row((chunk.pk, *row) if assign_pks else row)
+                count += 1
+    return count
+
+
+def insert_chunk_embeddings(embeddings: Iterable[ChunkEmbedding]) -> int:
+    """COPY version vectors for chunks that already have ids."""
+    if not copy_supported():
+        return len(ChunkEmbedding.objects.bulk_create(list(embeddings)))
+
+    from pgvector import Vector
+
+    count = 0
+    connection.ensure_connection()
+    with connection.cursor() as cursor:
+        raw = cursor.cursor
+        _register_vector(raw)
+        target = _copy_target(ChunkEmbedding, ("chunk_id", "version_id", "embedding"))
+        with raw.copy(f"COPY {target} FROM STDIN (FORMAT BINARY)") as copy:
+            copy.set_types(("int8", "int8", "vector"))
+            for row in embeddings:
+                copy.write_row((row.chunk_id, row.version_id, Vector(row.embedding)))
+                count += 1
+    return count
+
+
+@contextmanager
+def deferred_vector_indexes():
+    """Drop the HNSW indexes for the block and rebuild them afterwards.
+
+    Building a graph once over the loaded rows is far cheaper than updating
+    every graph per inserted row. Run inside a transaction so a failed load
+    keeps the old indexes. DROP INDEX takes an ACCESS EXCLUSIVE lock on the
+    chunk table that is held until the transaction ends, so every search
+    blocks for the whole load and rebuild.
+    """
+    indexes = [index for index in Chunk._meta.indexes if isinstance(index, HnswIndex)]
+    with connection.schema_editor() as editor:
+        for index in indexes:
+            editor.remove_index(Chunk, index)
+    yield
+    with connection.schema_editor() as editor:
+        for index in indexes:
+            editor.add_index(Chunk, index)
+
+
+def active_version() -> EmbeddingVersion | None:
+    # Straight from the table: the cached read-path version may be stale here.
+    return EmbeddingVersion.objects.filter(status=EmbeddingVersion.Status.ACTIVE).first()
+
+
+def export_chunks(out: BinaryIO, filters: ChunkFilter | None = None) -> int:
+    """Stream chunks with their read-path vectors to `out` as a PostgreSQL binary COPY file."""
+    version = active_version()
+    qs = Chunk.objects.filter(**(filters or {})).order_by("pk")
+    if version is None:
+        qs = qs.annotate(
+            version_name=Value(None, output_field=CharField()),
+            version_embedding=Value(None, output_field=VectorField()),
+        )
+    else:
+        qs = qs.annotate(
+            version_name=Value(version.name, output_field=CharField()),
+            version_embedding=Subquery(
+                ChunkEmbedding.objects
+                .filter(version=version, chunk=OuterRef("pk"))
+                .values("embedding")[:1]
+            ),
+        )
+    sql, params = qs.values_list(*EXPORT_COLUMNS).query.sql_with_params()
+    with connection.cursor() as cursor:
+        raw = cursor.cursor
+        with raw.copy(f"COPY ({sql}) TO STDOUT (FORMAT BINARY)", params) as copy:
+            for block in copy:
+                out.write(block)
+        return raw.rowcount
+
+
+def import_chunks(source: BinaryIO) -> int:
+    """Load a file written by `export_chunks`.
+
+    Rows are staged in a temporary table and then inserted with fresh ids, the
+    vectors of the active version into ChunkEmbedding. If any row lacks the
+    vector the read path searches (the legacy column, or the active version by
+    name), this raises ValueError and loads nothing.
+    """
+    head = source.read(len(COPY_SIGNATURE))
+    if head != COPY_SIGNATURE:
+        raise ValueError("Not a PostgreSQL binary COPY file.")
+
+    quote = connection.ops.quote_name
+    staging = quote(STAGING_TABLE)
+    columns = ", ".join(quote(column) for column in COPY_COLUMNS)
+    version = active_version()
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f"CREATE TEMPORARY TABLE {staging} (chunk_id int8, "
+            + ", ".join(f"{quote(column)} {type_}" for column, type_ in zip(EXPORT_COLUMNS, EXPORT_TYPES))
+            + ")"
+        )
+        raw = cursor.cursor
+        target = f"{staging} ({', '.join(quote(column) for column in EXPORT_COLUMNS)})"
+        with raw.copy(f"COPY {target} FROM STDIN (FORMAT BINARY)") as copy:
+            copy.write(head)
+            while block := source.read(READ_BLOCK):
+                copy.write(block)
+
+        if version is None:
+            cursor.execute(f"SELECT count(*) FROM {staging} WHERE embedding IS NULL")
+            missing = "the legacy embedding column"
+        else:
+            cursor.execute(
+                f"SELECT count(*) FROM {staging} "
+                "WHERE version_name IS DISTINCT FROM %s OR version_embedding IS NULL",
+                [version.name],
+            )
+            missing = f"the active embedding version {version.name}"
+        (count,) = cursor.fetchone()
+        if count:
+            raise ValueError(f"{count} rows in the file have no vector for {missing}.")
+
+        cursor.execute(
+            f"UPDATE {staging} SET chunk_id = nextval(pg_get_serial_sequence(%s, 'id'))",
+            [Chunk._meta.db_table],
+        )
+        cursor.execute(
+            f"INSERT INTO {quote(Chunk._meta.db_table)} (id, {columns}) "
+            f"SELECT chunk_id, {columns} FROM {staging}"
+        )
+        count = cursor.rowcount
+        if version is not None:
+            cursor.execute(
+                f"INSERT INTO {_copy_target(ChunkEmbedding, ('chunk_id', 'version_id', 'embedding'))} "
+                f"SELECT chunk_id, %s, version_embedding FROM {staging}",
+                [version.pk],
+            )
+        cursor.execute(f"DROP TABLE {staging}")
+    return count
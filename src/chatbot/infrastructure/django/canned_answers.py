@@ -0,0 +1,92 @@
+import hashlib
+import logging
+from functools import lru_cache
+from typing import Sequence
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError
+
+from chatbot.application.policies import SimilarityPolicy
+from chatbot.application.questions import normalize_question
+from chatbot.application.use_cases.ask_question import AskQuestionUseCase
+from chatbot.application.use_cases.warm_answers import WarmAnswersUseCase
+from chatbot.domain.ports import CannedAnswer as CannedAnswerEntry
+from chatbot.infrastructure.django.repositories import PgVectorChunkRepository
+from chatbot.infrastructure.django.routers import use_primary
+from chatbot.infrastructure.llm.openai_client import OpenAILLMClient
+from chatbot.models import CannedAnswer
+from chatbot.observability.tracing import record_cache
+
+logger = logging.getLogger(__name__)
+
+
+def _cache_key(normalized: str) -> str:
+    return f"canned:{hashlib.sha256(normalized.encode('utf-8')).hexdigest()}"
+
+
+class DjangoCannedAnswerStore:
+    def get(self, normalized: str) -> CannedAnswerEntry | None:
+        key = _cache_key(normalized)
+        entry = cache.get(key)
+        if entry is None:
+            row = (
+                CannedAnswer.objects
+                .filter(normalized=normalized)
+                .values("question", "answer", "sources", "fingerprint")
+                .first()
+            )
+            if row is None:
+                return None
+            entry = row
+            cache.set(key, entry, settings.CANNED_ANSWER_CACHE_TTL)
+        return entry
+
+    def save(self, normalized: str, entry: CannedAnswerEntry) -> None:
+        CannedAnswer.objects.update_or_create(normalized=normalized, defaults=dict(entry))
+        cache.set(_cache_key(normalized), dict(entry), settings.CANNED_ANSWER_CACHE_TTL)
+
+    def prune(self, keep: Sequence[str]) -> int:
+        stale = list(CannedAnswer.objects.exclude(normalized__in=keep).values_list("normalized", flat=True))
+        if not stale:
+            return 0
+        CannedAnswer.objects.filter(normalized__in=stale).delete()
+        cache.delete_many([_cache_key(normalized) for normalized in stale])
+        return len(stale)
+
+
+@lru_cache(maxsize=1)
+def _suggested(questions: tuple[str, ...]) -> frozenset[str]:
+    return frozenset(normalize_question(question) for question in questions)
+
+
+def lookup_canned_answer(question: str) -> CannedAnswerEntry | None:
+    """Return the precomputed answer when `question` is one of the suggested questions."""
+    normalized = normalize_question(question)
+    # Only suggested questions are stored, so anything else skips the cache round trip.
+    if normalized not in _suggested(tuple(settings.CHAT_SUGGESTED_QUESTIONS)):
+        return None
+    try:
+        entry = DjangoCannedAnswerStore().get(normalized)
+    except DatabaseError:
+        # A missing table or a database hiccup must not fail the chat; the
+        # normal pipeline can still answer.
+        logger.warning("Canned answer lookup failed", exc_info=True)
+        entry = None
+    record_cache("canned_answer", entry is not None)
+    return entry
+
+
+def warm_canned_answers(force: bool = False, embedder=None, llm=None) -> dict[str, int]:
+    # No FallbackLLMClient here: a canned reply must never be stored as the answer.
+    ask = AskQuestionUseCase(
+        repo=PgVectorChunkRepository(embedder=embedder),
+        llm=llm or OpenAILLMClient(),
+        policy=SimilarityPolicy(threshold=0.15),
+    )
+    # Runs right after ingest, so read the primary rather than a lagging replica.
+    with use_primary():
+        return WarmAnswersUseCase(ask, DjangoCannedAnswerStore()).execute(
+            settings.CHAT_SUGGESTED_QUESTIONS,
+            force=force,
+        )
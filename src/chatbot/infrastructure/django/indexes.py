@@ -0,0 +1,33 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.db.backends.ddl_references import Statement
+from pgvector.django import HnswIndex
+
+
+class PostgresOnlyIndex:
+    """Index mixin that emits no DDL outside PostgreSQL.
+
+    The index stays in the model and migration state, so the SQLite fallback
+    for local development still migrates, including the table rebuilds SQLite
+    does on AlterField, which recreate every index in the state.
+    """
+
+    def create_sql(self, model, schema_editor, using="", **kwargs):
+        if schema_editor.connection.vendor != "postgresql":
+            return self.skipped_sql()
+        return super().create_sql(model, schema_editor, using=using, **kwargs)
+
+    def remove_sql(self, model, schema_editor, **kwargs):
+        if schema_editor.connection.vendor != "postgresql":
+            return self.skipped_sql()
+        return super().remove_sql(model, schema_editor, **kwargs)
+
+    def skipped_sql(self) -> Statement:
+        return Statement("-- %(name)s is PostgreSQL-only", name=self.name)
+
+
+class PostgresGinIndex(PostgresOnlyIndex, GinIndex):
+    pass
+
+
+class PostgresHnswIndex(PostgresOnlyIndex, HnswIndex):
+    pass
@@ -1,29 +1,101 @@
-from pgvector.django import CosineDistance
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections, transaction
+from django.db.models import F, Value
+from django.db.models.functions import Cast
+from pgvector.django import CosineDistance, VectorField
 
-from chatbot.models import Chunk
+from chatbot.domain.ports import ChunkFilter
+from chatbot.models import Chunk, ChunkEmbedding, EmbeddingVersion
+from chatbot.infrastructure.django.routers import get_replica_pool
 from chatbot.infrastructure.embeddings.openai_embedder import OpenAIEmbedder
+from chatbot.infrastructure.embeddings.versions import embedder_for, get_active_version
+from chatbot.observability.tracing import annotate, stage
+
+ITERATIVE_SCAN_MODES = {"relaxed_order", "strict_order"}
 
 class PgVectorChunkRepository:
-    def __init__(self):
-        self.embedder = OpenAIEmbedder()
+    def __init__(self, embedder=None):
+        # An injected embedder (benchmarks, fakes) always searches the legacy
+        # Chunk.embedding column; otherwise the active EmbeddingVersion decides.
+        self.embedder = embedder
 
-    def search(self, query: str, k: int = 4):
-        q_emb = self.embedder.embed(query)
+    def search(self, query: str, k: int = 4, filters: ChunkFilter | None = None):
+        version = None if self.embedder else get_active_version()
+        if version is None:
+            q_emb = (self.embedder or OpenAIEmbedder()).embed(query)
+            # cosine_distance: 小さいほど近い
+            qs = (
+                Chunk.objects
+                .filter(**(filters or {}))
+                .annotate(distance=CosineDistance("embedding", q_emb))
+                .order_by("distance")
+                .values("content", "source", "merged_sources", "distance")[:k]
+            )
+        else:
+            annotate(embedding_version=version.name)
+            qs = self._versioned(version, embedder_for(version).embed(query), k, filters)
 
-        # cosine_distance: 小さいほど近い
-        qs = (
-            Chunk.objects
-            .annotate(distance=CosineDistance("embedding", q_emb))
-            .order_by("distance")
-            .values("content", "source", "distance")[:k]
-        )
+        # qs.db asks the router again on every access; pin one alias so the
+        # SET LOCAL, the transaction and the query share a connection.
+        alias = qs.db
+        with stage("vector_search"):
+            try:
+                rows = self._fetch(qs, alias, filtered=bool(filters))
+            except OperationalError:
+                if alias == DEFAULT_DB_ALIAS:
+                    raise
+                # The replica went away mid-query; fail over to the primary.
+                get_replica_pool().mark_unhealthy(alias)
+                connections[alias].close()
+                rows = self._fetch(qs, DEFAULT_DB_ALIAS, filtered=bool(filters))
 
         results = []
-        for row in qs:
+        for row in rows:
             # distance -> score（暫定変換。0に近いほど良い）
             # ざっくり score = 1 - distance（負なら0に丸め）
             score = max(0.0, 1.0 - float(row["distance"]))
             results.append(
-                {"content": row["content"], "source": row["source"], "score": score}
+                {
+                    "content": row["content"],
+                    "source": row["source"],
+                    "score": score,
+                    "merged_sources": row["merged_sources"],
+                }
             )
         return results
+
+    def _versioned(self, version: EmbeddingVersion, q_emb, k: int, filters: ChunkFilter | None):
+        # Same expression and predicate as the version's partial HNSW index.
+        vector = VectorField(dimensions=version.dimensions)
+        return (
+            ChunkEmbedding.objects
+            .filter(version=version, **{f"chunk__{key}": value for key, value in (filters or {}).items()})
+            .annotate(
+                distance=CosineDistance(
+                    Cast("embedding", vector),
+                    Cast(Value(q_emb, output_field=VectorField()), vector),
+                )
+            )
+            .order_by("distance")
+            .values(
+                "distance",
+                content=F("chunk__content"),
+                source=F("chunk__source"),
+                merged_sources=F("chunk__merged_sources"),
+            )[:k]
+        )
+
+    def _fetch(self, qs, alias: str, filtered: bool) -> list[dict]:
+        qs = qs.using(alias)
+        mode = getattr(settings, "PGVECTOR_ITERATIVE_SCAN", "")
+        connection = connections[alias]
+        if not filtered or mode not in ITERATIVE_SCAN_MODES or connection.vendor != "postgresql":
+            return list(qs)
+
+        # A filter the partial indexes do not cover would otherwise let the HNSW
+        # scan stop after ef_search candidates and return fewer than k rows.
+        with transaction.atomic(using=alias):
+            with connection.cursor() as cursor:
+                cursor.execute(f"SET LOCAL hnsw.iterative_scan = {mode}")
+            rows = list(qs)
+        return sorted(rows, key=lambda row: row["distance"])
@@ -0,0 +1,123 @@
+import contextvars
+import itertools
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+logger = logging.getLogger(__name__)
+
+REPLICATED_MODELS = {"chatbot.chunk", "chatbot.chunkembedding"}
+
+_force_primary: contextvars.ContextVar[bool] = contextvars.ContextVar("chatbot_force_primary", default=False)
+
+
+@contextmanager
+def use_primary():
+    """Send every read inside the block to the primary (read-your-writes)."""
+    token = _force_primary.set(True)
+    try:
+        yield
+    finally:
+        _force_primary.reset(token)
+
+
+class ReplicaPool:
+    """Healthy-replica picker. Health is re-checked at most every `interval` seconds."""
+
+    def __init__(self, aliases: list[str], interval: float, max_lag: float):
+        self.aliases = aliases
+        self.interval = interval
+        self.max_lag = max_lag
+        self._healthy = {alias: True for alias in aliases}
+        self._checked_at = {alias: 0.0 for alias in aliases}
+        self._cycle = itertools.cycle(aliases) if aliases else None
+        self._lock = threading.Lock()
+
+    def mark_unhealthy(self, alias: str) -> None:
+        with self._lock:
+            self._healthy[alias] = False
+            self._checked_at[alias] = time.monotonic()
+        logger.warning("Replica %s marked unhealthy", alias)
+
+    def _check(self, alias: str) -> bool:
+        try:
+            with connections[alias].cursor() as cursor:
+                # A replica that has replayed everything it received is current,
+                # however long ago the primary last wrote.
+                cursor.execute(
+                    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+                    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+                )
+                (lag,) = cursor.fetchone()
+        except DatabaseError:
+            connections[alias].close()
+            return False
+        return float(lag) <= self.max_lag
+
+    def _is_healthy(self, alias: str) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            due = now - self._checked_at[alias] >= self.interval
+            if due:
+                # Claim the check so concurrent threads keep the cached state.
+                self._checked_at[alias] = now
+        if due:
+            healthy = self._check(alias)
+            with self._lock:
+                if healthy != self._healthy[alias]:
+                    logger.warning("Replica %s is now %s", alias, "healthy" if healthy else "unhealthy")
+                self._healthy[alias] = healthy
+        return self._healthy[alias]
+
+    def choose(self) -> str | None:
+        for _ in range(len(self.aliases)):
+            with self._lock:
+                alias = next(self._cycle)
+            if self._is_healthy(alias):
+                return alias
+        return None
+
+
+_pool: ReplicaPool | None = None
+_pool_lock = threading.Lock()
+
+
+def get_replica_pool() -> ReplicaPool:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ReplicaPool(
+                    list(getattr(settings, "DATABASE_REPLICAS", [])),
+                    settings.REPLICA_HEALTH_INTERVAL,
+                    settings.REPLICA_MAX_LAG_SECONDS,
+                )
+    return _pool
+
+
+class ReplicaRouter:
+    """Route Chunk reads to replicas; everything else uses the primary.
+
+    Reads stay on the primary inside `use_primary()` and inside a transaction
+    already open on the primary, so a writer sees its own rows.
+    """
+
+    def db_for_read(self, model, **hints):
+        if model._meta.label_lower not in REPLICATED_MODELS:
+            return None
+        if _force_primary.get() or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return get_replica_pool().choose() or DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
@@ -0,0 +1,38 @@
+import hashlib
+import re
+from functools import lru_cache
+
+import numpy as np
+
+TOKEN_RE = re.compile(r"\w+")
+
+
+class HashEmbedder:
+    """Deterministic offline embedder for benchmarks and local runs.
+
+    Each token maps to a unit vector seeded from its hash and a text embeds to
+    the normalised sum, so texts sharing words land close together.
+    """
+
+    def __init__(self, dimensions: int = 256):
+        self.dimensions = dimensions
+        self.model = f"hash-{dimensions}"
+        self._token_vector = lru_cache(maxsize=100_000)(self._make_token_vector)
+
+    def _make_token_vector(self, token: str) -> np.ndarray:
+        seed = int.from_bytes(hashlib.sha256(token.encode("utf-8")).digest()[:8], "little")
+        vector = np.random.default_rng(seed).standard_normal(self.dimensions).astype(np.float32)
+        return vector / np.linalg.norm(vector)
+
+    def token_vector(self, token: str) -> np.ndarray:
+        return self._token_vector(token.lower())
+
+    def embed_array(self, text: str) -> np.ndarray:
+        total = np.zeros(self.dimensions, dtype=np.float32)
+        for token in TOKEN_RE.findall(text):
+            total += self.token_vector(token)
+        norm = np.linalg.norm(total)
+        return total / norm if norm else total
+
+    def embed(self, text: str) -> list[float]:
+        return self.embed_array(text).tolist()
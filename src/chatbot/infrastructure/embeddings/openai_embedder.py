@@ -1,12 +1,36 @@
 from django.conf import settings
-from openai import OpenAI
+
+from chatbot.infrastructure.http.client import get_openai_client
+from chatbot.infrastructure.resilience import call_upstream
+from chatbot.observability.tracing import record_tokens, stage
 
 
 class OpenAIEmbedder:
-    def __init__(self):
-        self.client = OpenAI(api_key=settings.OPENAI_API_KEY)
-        self.model = getattr(settings, "OPENAI_EMBED_MODEL", "text-embedding-3-small")
+    def __init__(self, model: str | None = None, dimensions: int | None = None, batch: bool = False):
+        self.model = model or getattr(settings, "OPENAI_EMBED_MODEL", "text-embedding-3-small")
+        self.dimensions = dimensions
+        # Ingest and backfill retry per chunk themselves and are not latency
+        # bound, so they skip the inner retries and hedged duplicate requests.
+        self.batch = batch
 
     def embed(self, text: str) -> list[float]:
-        response = self.client.embeddings.create(model=self.model, input=text)
+        options = {"dimensions": self.dimensions} if self.dimensions else {}
+
+        def request(timeout: float):
+            return get_openai_client().with_options(timeout=timeout, max_retries=0).embeddings.create(
+                model=self.model,
+                input=text,
+                **options,
+            )
+
+        with stage("embed"):
+            response = call_upstream(
+                request,
+                name="openai_embed",
+                stage="embed",
+                attempt_timeout=settings.OPENAI_EMBED_TIMEOUT,
+                retries=0 if self.batch else None,
+                hedge=not self.batch,
+            )
+        record_tokens(self.model, response.usage)
         return response.data[0].embedding
@@ -0,0 +1,89 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from chatbot.infrastructure.embeddings.openai_embedder import OpenAIEmbedder
+from chatbot.models import Chunk, ChunkEmbedding, EmbeddingVersion
+
+ACTIVE_VERSION_CACHE_KEY = "embedding:active_version"
+LIVE_STATUSES = (
+    EmbeddingVersion.Status.BACKFILLING,
+    EmbeddingVersion.Status.READY,
+    EmbeddingVersion.Status.ACTIVE,
+)
+
+_MISSING = object()
+
+
+class EmbeddingVersionError(Exception):
+    """The version cannot be switched to (yet)."""
+
+
+def get_active_version() -> EmbeddingVersion | None:
+    """The version the read path searches; None means the legacy Chunk.embedding column."""
+    version = cache.get(ACTIVE_VERSION_CACHE_KEY, _MISSING)
+    if version is _MISSING:
+        version = EmbeddingVersion.objects.filter(status=EmbeddingVersion.Status.ACTIVE).first()
+        cache.set(ACTIVE_VERSION_CACHE_KEY, version, settings.EMBEDDING_VERSION_CACHE_TTL)
+    return version
+
+
+def live_versions() -> list[EmbeddingVersion]:
+    """Versions that new chunks must be embedded for."""
+    return list(EmbeddingVersion.objects.filter(status__in=LIVE_STATUSES).order_by("pk"))
+
+
+def embedder_for(version: EmbeddingVersion, batch: bool = False) -> OpenAIEmbedder:
+    return OpenAIEmbedder(model=version.model, dimensions=version.dimensions, batch=batch)
+
+
+def missing_chunks(version: EmbeddingVersion):
+    return Chunk.objects.without_embedding().filter(
+        ~Exists(ChunkEmbedding.objects.filter(version=version, chunk=OuterRef("pk")))
+    )
+
+
+def coverage(version: EmbeddingVersion) -> tuple[int, int]:
+    total = Chunk.objects.count()
+    return total - missing_chunks(version).count(), total
+
+
+def ensure_version_index(version: EmbeddingVersion) -> None:
+    """Build the version's HNSW index without blocking writes (run outside a transaction)."""
+    if connection.vendor != "postgresql":
+        return
+    table = connection.ops.quote_name(ChunkEmbedding._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {connection.ops.quote_name(version.index_name)} "
+            f"ON {table} USING hnsw ((embedding::vector({int(version.dimensions)})) vector_cosine_ops) "
+            f"WITH (m = 16, ef_construction = 64) WHERE version_id = {int(version.pk)}"
+        )
+
+
+def activate_version(version: EmbeddingVersion) -> EmbeddingVersion:
+    """Atomically make `version` the read path once every chunk has a vector for it."""
+    with transaction.atomic():
+        if connection.vendor == "postgresql":
+            # Hold off new chunks until commit so coverage cannot drop after the check.
+            with connection.cursor() as cursor:
+                cursor.execute(f"LOCK TABLE {connection.ops.quote_name(Chunk._meta.db_table)} IN SHARE MODE")
+        version = EmbeddingVersion.objects.select_for_update().get(pk=version.pk)
+        if version.status == EmbeddingVersion.Status.ACTIVE:
+            return version
+        if version.status == EmbeddingVersion.Status.RETIRED:
+            raise EmbeddingVersionError(f"{version.name} is retired.")
+        if missing_chunks(version).exists():
+            done, total = coverage(version)
+            raise EmbeddingVersionError(f"{version.name} covers {done}/{total} chunks; backfill first.")
+
+        EmbeddingVersion.objects.filter(status=EmbeddingVersion.Status.ACTIVE).update(
+            status=EmbeddingVersion.Status.RETIRED
+        )
+        version.status = EmbeddingVersion.Status.ACTIVE
+        version.activated_at = timezone.now()
+        version.save(update_fields=["status", "activated_at"])
+        transaction.on_commit(lambda: cache.delete(ACTIVE_VERSION_CACHE_KEY))
+    return version
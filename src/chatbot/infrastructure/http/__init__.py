@@ -0,0 +1 @@
+"""Outbound HTTP clients."""
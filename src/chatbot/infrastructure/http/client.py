@@ -0,0 +1,48 @@
+import threading
+from typing import TYPE_CHECKING
+
+from django.conf import settings
+
+if TYPE_CHECKING:
+    import httpx
+    from openai import OpenAI
+
+# httpx and openai take a large share of cold-start time, so both are
+# imported on first use instead of when the URLconf loads.
+_client: "httpx.Client | None" = None
+_openai_client: "OpenAI | None" = None
+_lock = threading.Lock()
+
+
+def get_http_client() -> "httpx.Client":
+    """Process-wide client so outbound calls reuse keep-alive connections."""
+    global _client
+    if _client is None:
+        with _lock:
+            if _client is None:
+                import httpx
+
+                _client = httpx.Client(
+                    timeout=httpx.Timeout(
+                        settings.HTTP_READ_TIMEOUT,
+                        connect=settings.HTTP_CONNECT_TIMEOUT,
+                    ),
+                    limits=httpx.Limits(
+                        max_connections=settings.HTTP_MAX_CONNECTIONS,
+                        max_keepalive_connections=settings.HTTP_MAX_CONNECTIONS,
+                        keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+                    ),
+                )
+    return _client
+
+
+def get_openai_client() -> "OpenAI":
+    """Process-wide OpenAI client, built on first use."""
+    global _openai_client
+    if _openai_client is None:
+        with _lock:
+            if _openai_client is None:
+                from openai import OpenAI
+
+                _openai_client = OpenAI(api_key=settings.OPENAI_API_KEY)
+    return _openai_client
@@ -0,0 +1 @@
+"""Document loading and the chunk/embed/store pipeline."""
@@ -0,0 +1,132 @@
+import hashlib
+import re
+from dataclasses import dataclass
+
+import numpy as np
+
+from chatbot.models import Chunk
+
+SHINGLE_SIZE = 5
+NON_WORD_RE = re.compile(r"\W+")
+
+
+def simhash(text: str) -> int:
+    """64-bit SimHash over character shingles, as a signed int for BigIntegerField.
+
+    Character shingles of the casefolded text with whitespace and punctuation
+    stripped work for Japanese as well as English, and ignore the spacing and
+    line-break noise that differs between PDF, DOCX and plain-text extractions.
+    """
+    normalized = NON_WORD_RE.sub("", text.casefold())
+    shingles = {
+        normalized[i:i + SHINGLE_SIZE]
+        for i in range(max(1, len(normalized) - SHINGLE_SIZE + 1))
+    }
+    digests = np.frombuffer(
+        b"".join(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest() for s in shingles),
+        dtype=np.uint8,
+    )
+    bits = np.unpackbits(digests).reshape(-1, 64)
+    votes = bits.sum(axis=0) * 2 > len(shingles)
+    return int(np.packbits(votes).view(">i8")[0])
+
+
+@dataclass(frozen=True)
+class Collapse:
+    """An incoming chunk folded into a stored (or earlier queued) near-duplicate."""
+
+    source: str
+    page: int | None
+    content: str
+    kept_source: str
+    distance: int
+
+
+class NearDuplicateIndex:
+    """SimHash fingerprints of the chunks a new chunk may collapse into.
+
+    Scoped to one source type and language. A chunk never collapses into its
+    own document, so re-ingesting a revised document keeps its new text. A
+    collapsed chunk no longer matches document_id or page filters for its own
+    document: its text is served by the kept chunk, which lists its source in
+    merged_sources.
+    """
+
+    def __init__(self, max_distance: int):
+        self.max_distance = max_distance
+        self.sources: list[str] = []
+        # Preallocated buffers; only the first `len(self.sources)` slots are in use.
+        self._hashes = np.empty(0, dtype=np.int64)
+        self._documents = np.empty(0, dtype=object)
+
+    @property
+    def hashes(self) -> np.ndarray:
+        return self._hashes[:len(self.sources)]
+
+    @property
+    def documents(self) -> np.ndarray:
+        return self._documents[:len(self.sources)]
+
+    @classmethod
+    def load(
+        cls,
+        source_type: str,
+        language: str,
+        max_distance: int,
+        after_pk: int | None = None,
+    ) -> "NearDuplicateIndex":
+        index = cls(max_distance)
+        if max_distance >= 0:
+            rows = list(
+                Chunk.objects
+                .filter(source_type=source_type, language=language, simhash__isnull=False)
+                .filter(pk__gt=after_pk or 0)
+                .order_by("pk")
+                .values_list("simhash", "source", "document_id")
+            )
+            index._hashes = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+            index._documents = np.array([row[2] for row in rows], dtype=object)
+            index.sources = [row[1] for row in rows]
+        return index
+
+    def add(self, fingerprint: int, source: str, document_id: str) -> None:
+        size = len(self.sources)
+        if size == len(self._hashes):
+            # Double the buffers rather than copy them on every add, which made
+            # fingerprinting a whole table quadratic.
+            capacity = max(64, 2 * size)
+            self._hashes = np.concatenate([self._hashes, np.empty(capacity - size, dtype=np.int64)])
+            self._documents = np.concatenate([self._documents, np.empty(capacity - size, dtype=object)])
+        self._hashes[size] = fingerprint
+        self._documents[size] = document_id
+        self.sources.append(source)
+
+    def match(self, fingerprint: int, document_id: str) -> tuple[int, str, int] | None:
+        """Return (fingerprint, source, Hamming distance) of the closest chunk in range.
+
+        Chunks of `document_id` itself are never candidates.
+        """
+        if self.max_distance < 0 or not len(self.hashes):
+            return None
+        distances = np.bitwise_count((self.hashes ^ np.int64(fingerprint)).view(np.uint64))
+        # Out of range for any 64-bit Hamming distance.
+        distances[self.documents == document_id] = 65
+        best = int(distances.argmin())
+        if distances[best] > self.max_distance:
+            return None
+        return int(self.hashes[best]), self.sources[best], int(distances[best])
+
+
+def merge_sources(source_type: str, language: str, merges: dict[int, set[str]]) -> None:
+    """Record the sources of collapsed chunks on the chunks they collapsed into."""
+    for fingerprint, sources in merges.items():
+        kept = (
+            Chunk.objects
+            .filter(source_type=source_type, language=language, simhash=fingerprint)
+            .only("source", "merged_sources")
+        )
+        for chunk in kept:
+            added = sorted(sources - {chunk.source} - set(chunk.merged_sources))
+            if added:
+                chunk.merged_sources = [*chunk.merged_sources, *added]
+                chunk.save(update_fields=["merged_sources"])
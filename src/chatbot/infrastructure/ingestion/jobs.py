@@ -0,0 +1,155 @@
+import logging
+import tempfile
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max, Q
+from django.utils import timezone
+
+from chatbot.infrastructure.django.canned_answers import warm_canned_answers
+from chatbot.infrastructure.django.routers import use_primary
+from chatbot.infrastructure.embeddings.openai_embedder import OpenAIEmbedder
+from chatbot.infrastructure.ingestion.dedup import Collapse
+from chatbot.infrastructure.ingestion.loaders import DocumentError, load_chunks
+from chatbot.infrastructure.ingestion.pipeline import ChunkMetadata, store_chunks
+from chatbot.models import Chunk, ChunkEmbedding, IngestJob
+
+logger = logging.getLogger(__name__)
+
+
+def claim_next_job(worker_id: str) -> IngestJob | None:
+    """Lease the oldest runnable job, including running jobs whose lease expired."""
+    now = timezone.now()
+    stale = now - timedelta(seconds=settings.INGEST_LEASE_SECONDS)
+    with transaction.atomic():
+        job = (
+            IngestJob.objects
+            .select_for_update(skip_locked=True)
+            .defer("content")
+            .filter(
+                Q(status=IngestJob.Status.PENDING, run_after__lte=now)
+                | Q(status=IngestJob.Status.RUNNING, locked_at__lt=stale)
+            )
+            .order_by("created_at")
+            .first()
+        )
+        if job is None:
+            return None
+        job.status = IngestJob.Status.RUNNING
+        job.locked_by = worker_id
+        job.locked_at = now
+        job.attempts += 1
+        job.save(update_fields=["status", "locked_by", "locked_at", "attempts", "updated_at"])
+    return job
+
+
+def run_job(job: IngestJob, embedder=None) -> None:
+    # Dedup candidates and the chunk watermark must not come from a lagging replica.
+    with use_primary():
+        _run_job(job, embedder)
+
+
+class LeaseLost(Exception):
+    """Another worker re-leased the job after this one's lease expired."""
+
+
+def _run_job(job: IngestJob, embedder) -> None:
+    # Every write is fenced on the lease, so a stalled worker whose job was
+    # re-leased cannot store batches or settle the job behind the new owner.
+    jobs = IngestJob.objects.filter(pk=job.pk, locked_by=job.locked_by)
+    try:
+        content = jobs.values_list("content", flat=True).get()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / Path(job.filename).name
+            path.write_bytes(bytes(content))
+            chunks = load_chunks(path)
+        if not chunks:
+            raise DocumentError("No content to ingest.")
+        jobs.update(total_chunks=len(chunks))
+        if job.chunk_watermark is None:
+            job.chunk_watermark = Chunk.objects.aggregate(last=Max("pk"))["last"] or 0
+            jobs.update(chunk_watermark=job.chunk_watermark)
+
+        def heartbeat(done: int) -> None:
+            # Runs in the batch transaction: losing the lease rolls the batch back.
+            if not jobs.update(done_chunks=done, locked_at=timezone.now()):
+                raise LeaseLost()
+
+        def log_duplicate(collapse: Collapse) -> None:
+            logger.info(
+                "Ingest job %s collapsed a chunk of %s (page %s) into %s (distance %s)",
+                job.pk,
+                collapse.source,
+                collapse.page,
+                collapse.kept_source,
+                collapse.distance,
+            )
+
+        store_chunks(
+            chunks,
+            ChunkMetadata(
+                source=job.source,
+                source_type=job.source_type,
+                document_id=job.document_id,
+                language=job.language,
+            ),
+            embedder or OpenAIEmbedder(batch=True),
+            start=job.done_chunks,
+            # Old chunks stay live until the replacement is complete.
+            stale_through=job.chunk_watermark if job.clear else None,
+            on_progress=heartbeat,
+            on_duplicate=log_duplicate,
+        )
+        with transaction.atomic():
+            if not _finish(jobs, IngestJob.Status.SUCCEEDED, "", content=b""):
+                raise LeaseLost()
+            if job.clear:
+                Chunk.objects.filter(pk__lte=job.chunk_watermark).delete()
+    except LeaseLost:
+        logger.warning("Ingest job %s was re-leased; %s stops working on it", job.pk, job.locked_by)
+        return
+    except DocumentError as exc:
+        _fail(job, jobs, str(exc))
+        return
+    except Exception as exc:
+        logger.exception("Ingest job %s failed (attempt %s)", job.pk, job.attempts)
+        if job.attempts >= settings.INGEST_MAX_ATTEMPTS:
+            _fail(job, jobs, repr(exc))
+        else:
+            jobs.update(
+                status=IngestJob.Status.PENDING,
+                last_error=repr(exc),
+                run_after=timezone.now() + timedelta(seconds=30 * 2 ** (job.attempts - 1)),
+                locked_by="",
+                locked_at=None,
+            )
+        return
+
+    try:
+        warm_canned_answers(embedder=embedder)
+    except Exception:
+        logger.exception("Warming suggested answers after job %s failed", job.pk)
+
+
+def _fail(job: IngestJob, jobs, error: str) -> None:
+    with transaction.atomic():
+        if not _finish(jobs, IngestJob.Status.FAILED, error) or job.chunk_watermark is None:
+            return
+        # Drop the batches this job stored, so search never mixes a partial
+        # document (or a partial replacement) into the results.
+        stored = Chunk.objects.filter(pk__gt=job.chunk_watermark, document_id=job.document_id, source=job.source)
+        ChunkEmbedding.objects.filter(chunk__in=stored).delete()
+        stored.delete()
+
+
+def _finish(jobs, status: str, error: str, **fields) -> int:
+    return jobs.update(
+        status=status,
+        last_error=error,
+        finished_at=timezone.now(),
+        locked_by="",
+        locked_at=None,
+        **fields,
+    )
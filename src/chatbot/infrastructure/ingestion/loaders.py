@@ -0,0 +1,101 @@
+from pathlib import Path
+
+SUPPORTED_SUFFIXES = (".pdf", ".docx", ".txt", ".md")
+
+
+class DocumentError(Exception):
+    """The document cannot be read or needs an optional dependency."""
+
+
+def chunk_text(text: str, max_chars: int = 1000) -> list[str]:
+    paragraphs = [p.strip() for p in text.split("\n") if p.strip()]
+    chunks: list[str] = []
+    current: list[str] = []
+    current_len = 0
+
+    for paragraph in paragraphs:
+        if current_len + len(paragraph) + 1 > max_chars and current:
+            chunks.append("\n".join(current))
+            current = []
+            current_len = 0
+        current.append(paragraph)
+        current_len += len(paragraph) + 1
+
+    if current:
+        chunks.append("\n".join(current))
+
+    return chunks
+
+
+def load_pages(path: Path) -> list[tuple[int | None, str]]:
+    """Return (page number, text) pairs; formats without pages yield a single None page."""
+    if path.suffix.lower() == ".pdf":
+        try:
+            from pypdf import PdfReader
+        except ImportError as exc:
+            raise DocumentError("pypdf is required for PDF ingestion. Run: pip install pypdf") from exc
+
+        reader = PdfReader(str(path))
+        return [(number, page.extract_text() or "") for number, page in enumerate(reader.pages, start=1)]
+    return [(None, load_text(path))]
+
+
+def load_text(path: Path) -> str:
+    if path.suffix.lower() == ".pdf":
+        return "\n".join(text for _, text in load_pages(path))
+    if path.suffix.lower() == ".docx":
+        try:
+            from docx import Document
+        except ImportError as exc:
+            raise DocumentError("python-docx is required for DOCX ingestion. Run: pip install python-docx") from exc
+
+        doc = Document(str(path))
+        parts = []
+        parts.extend([p.text for p in doc.paragraphs if p.text.strip()])
+
+        for table in doc.tables:
+            for row in table.rows:
+                for cell in row.cells:
+                    parts.extend([p.text for p in cell.paragraphs if p.text.strip()])
+
+        for section in doc.sections:
+            header = section.header
+            if header:
+                parts.extend([p.text for p in header.paragraphs if p.text.strip()])
+            footer = section.footer
+            if footer:
+                parts.extend([p.text for p in footer.paragraphs if p.text.strip()])
+
+        text = "\n".join(parts).strip()
+        if text:
+            return text
+
+        try:
+            import docx2txt
+        except ImportError as exc:
+            raise DocumentError(
+                "DOCX appears to use text boxes. Install docx2txt: pip install docx2txt"
+            ) from exc
+
+        return docx2txt.process(str(path)).strip()
+
+    return path.read_text(encoding="utf-8")
+
+
+def load_chunks(path: Path) -> list[tuple[int | None, str]]:
+    """Load a document and split it into (page number, chunk) pairs.
+
+    Parser failures (a corrupt PDF or DOCX, non-UTF-8 text) are permanent, so
+    they surface as DocumentError rather than as retryable errors.
+    """
+    try:
+        pages = load_pages(path)
+    except DocumentError:
+        raise
+    except Exception as exc:
+        raise DocumentError(f"Cannot read {path.name}: {exc}") from exc
+    return [
+        (page, chunk)
+        for page, text in pages
+        for chunk in chunk_text(text)
+    ]
@@ -0,0 +1,132 @@
+import random
+import time
+from dataclasses import dataclass
+from typing import Callable, Sequence
+
+from django.conf import settings
+from django.db import transaction
+
+from chatbot.domain.errors import UpstreamUnavailable
+from chatbot.infrastructure.django.bulk import insert_chunk_embeddings, insert_chunks
+from chatbot.infrastructure.embeddings.versions import embedder_for, live_versions
+from chatbot.infrastructure.ingestion.dedup import Collapse, NearDuplicateIndex, merge_sources, simhash
+from chatbot.infrastructure.resilience import transient_errors
+from chatbot.models import Chunk, ChunkEmbedding, EmbeddingVersion
+
+
+@dataclass(frozen=True)
+class ChunkMetadata:
+    source: str
+    source_type: str
+    document_id: str
+    language: str = ""
+
+
+def embed_with_retry(embedder, text: str, attempts: int = 4, base_delay: float = 1.0) -> list[float]:
+    for attempt in range(1, attempts + 1):
+        try:
+            return embedder.embed(text)
+        except (UpstreamUnavailable, *transient_errors()):
+            if attempt == attempts:
+                raise
+            delay = base_delay * 2 ** (attempt - 1)
+            time.sleep(delay + random.uniform(0, delay))
+    raise AssertionError("unreachable")
+
+
+def store_chunks(
+    chunks: Sequence[tuple[int | None, str]],
+    metadata: ChunkMetadata,
+    embedder,
+    *,
+    start: int = 0,
+    clear: bool = False,
+    stale_through: int | None = None,
+    batch_size: int | None = None,
+    on_progress: Callable[[int], None] | None = None,
+    on_duplicate: Callable[[Collapse], None] | None = None,
+) -> int:
+    """Embed and insert chunks[start:] batch by batch.
+
+    Embedding happens outside any transaction. Each batch is inserted together
+    with the `on_progress` callback in one transaction, so a run that dies can
+    resume from the last reported count.
+
+    `embedder` fills the legacy Chunk.embedding column while no embedding
+    version is active. Every live version (backfilling, ready or active) also
+    gets a vector, so a running backfill never falls behind new chunks.
+
+    A chunk whose SimHash is within INGEST_DEDUP_MAX_DISTANCE of a stored chunk
+    from another document is not embedded or stored; its source is added to
+    the kept chunk's merged_sources and reported to `on_duplicate`.
+
+    `clear` deletes every chunk with the first batch, so wrap the run in one
+    transaction to keep the swap atomic. A caller that instead deletes chunks
+    with ids up to `stale_through` after the run passes that id, so those
+    chunks are not dedup candidates.
+    """
+    batch_size = batch_size or settings.INGEST_BATCH_SIZE
+    max_distance = settings.INGEST_DEDUP_MAX_DISTANCE
+    if clear and start == 0:
+        duplicates = NearDuplicateIndex(max_distance)
+    else:
+        duplicates = NearDuplicateIndex.load(
+            metadata.source_type,
+            metadata.language,
+            max_distance,
+            after_pk=stale_through,
+        )
+    versions = [(version, embedder_for(version, batch=True)) for version in live_versions()]
+    legacy = not any(version.status == EmbeddingVersion.Status.ACTIVE for version, _ in versions)
+    done = start
+    for offset in range(start, len(chunks), batch_size):
+        batch = chunks[offset:offset + batch_size]
+        kept = []
+        collapsed = []
+        merges: dict[int, set[str]] = {}
+        for page, text in batch:
+            fingerprint = simhash(text)
+            match = duplicates.match(fingerprint, metadata.document_id)
+            if match is None:
+                kept.append((page, text, fingerprint))
+                continue
+            kept_fingerprint, kept_source, distance = match
+            merges.setdefault(kept_fingerprint, set()).add(metadata.source)
+            collapsed.append(Collapse(metadata.source, page, text, kept_source, distance))
+
+        objects = [
+            Chunk(
+                content=text,
+                source=metadata.source,
+                source_type=metadata.source_type,
+                document_id=metadata.document_id,
+                page=page,
+                language=metadata.language,
+                embedding=embed_with_retry(embedder, text) if legacy else None,
+                simhash=fingerprint,
+            )
+            for page, text, fingerprint in kept
+        ]
+        versioned = [
+            (version, [embed_with_retry(version_embedder, text) for _, text, _ in kept])
+            for version, version_embedder in versions
+        ]
+        with transaction.atomic():
+            if clear and offset == 0:
+                Chunk.objects.all().delete()
+            # The version rows need the chunk ids, which COPY does not return.
+            insert_chunks(objects, assign_pks=bool(versioned))
+            if versioned:
+                insert_chunk_embeddings(
+                    ChunkEmbedding(chunk=chunk, version=version, embedding=vector)
+                    for version, vectors in versioned
+                    for chunk, vector in zip(objects, vectors)
+                )
+            merge_sources(metadata.source_type, metadata.language, merges)
+            done = offset + len(batch)
+            if on_progress:
+                on_progress(done)
+        if on_duplicate:
+            for collapse in collapsed:
+                on_duplicate(collapse)
+    return done
@@ -0,0 +1,19 @@
+import hashlib
+import random
+import time
+
+
+class FakeLLMClient:
+    """Offline LLM stand-in with configurable latency for benchmarks."""
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, seed: int = 0):
+        self.latency = latency
+        self.jitter = jitter
+        self._random = random.Random(seed)
+
+    def answer(self, system: str, user: str) -> str:
+        delay = self.latency + self._random.uniform(0, self.jitter)
+        if delay > 0:
+            time.sleep(delay)
+        digest = hashlib.sha256(user.encode("utf-8")).hexdigest()[:12]
+        return f"Synthetic answer {digest}."
@@ -0,0 +1,32 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+
+from chatbot.domain.errors import UpstreamUnavailable
+from chatbot.domain.ports import LLMClient
+from chatbot.observability.tracing import annotate, record_cache
+
+
+class FallbackLLMClient:
+    """Serve a cached or canned answer when the primary client is unavailable."""
+
+    def __init__(self, primary: LLMClient, fallback: LLMClient):
+        self.primary = primary
+        self.fallback = fallback
+
+    def _cache_key(self, system: str, user: str) -> str:
+        digest = hashlib.sha256(f"{system}\0{user}".encode("utf-8")).hexdigest()
+        return f"llm:answer:{digest}"
+
+    def answer(self, system: str, user: str) -> str:
+        key = self._cache_key(system, user)
+        try:
+            answer = self.primary.answer(system, user)
+        except UpstreamUnavailable:
+            cached = cache.get(key)
+            record_cache("llm_answer", cached is not None)
+            annotate(llm_fallback=True)
+            return cached if cached is not None else self.fallback.answer(system, user)
+        cache.set(key, answer, settings.LLM_ANSWER_CACHE_TTL)
+        return answer
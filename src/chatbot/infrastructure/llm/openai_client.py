@@ -1,17 +1,28 @@
-from openai import OpenAI
 from django.conf import settings
 
-client = OpenAI(api_key=settings.OPENAI_API_KEY)
+from chatbot.infrastructure.http.client import get_openai_client
+from chatbot.infrastructure.resilience import call_upstream
+from chatbot.observability.tracing import record_tokens, stage
 
 class OpenAILLMClient:
     model = getattr(settings, "OPENAI_CHAT_MODEL", "gpt-5.1-mini")
 
     def answer(self, system: str, user: str) -> str:
-        r = client.chat.completions.create(
-            model=self.model,
-            messages=[
-                {"role": "system", "content": system},
-                {"role": "user", "content": user},
-            ],
-        )
+        def request(timeout: float):
+            return get_openai_client().with_options(timeout=timeout, max_retries=0).chat.completions.create(
+                model=self.model,
+                messages=[
+                    {"role": "system", "content": system},
+                    {"role": "user", "content": user},
+                ],
+            )
+
+        with stage("llm"):
+            r = call_upstream(
+                request,
+                name="openai_chat",
+                stage="llm",
+                attempt_timeout=settings.OPENAI_LLM_TIMEOUT,
+            )
+        record_tokens(self.model, r.usage)
         return r.choices[0].message.content
@@ -1,11 +1,57 @@
 from typing import Iterable, Sequence
 
-from chatbot.domain.ports import RetrievedChunk
+import numpy as np
+
+from chatbot.domain.ports import ChunkFilter, RetrievedChunk
+
+
+def _matches(metadata: dict, filters: ChunkFilter | None) -> bool:
+    return all(metadata.get(key) == value for key, value in (filters or {}).items())
 
 
 class InMemoryChunkRepository:
     def __init__(self, chunks: Iterable[RetrievedChunk] | None = None):
         self._chunks = list(chunks or [])
 
-    def search(self, query: str, k: int = 4) -> Sequence[RetrievedChunk]:
-        return self._chunks[:k]
+    def search(self, query: str, k: int = 4, filters: ChunkFilter | None = None) -> Sequence[RetrievedChunk]:
+        return [c for c in self._chunks if _matches(c, filters)][:k]
+
+
+class InMemoryVectorChunkRepository:
+    """Exact cosine search over an in-memory matrix of unit vectors."""
+
+    def __init__(
+        self,
+        embedder,
+        contents: Sequence[str],
+        sources: Sequence[str],
+        vectors: np.ndarray,
+        metadata: Sequence[dict] | None = None,
+    ):
+        self.embedder = embedder
+        self._contents = contents
+        self._sources = sources
+        self._vectors = vectors
+        self._metadata = metadata
+
+    def search(self, query: str, k: int = 4, filters: ChunkFilter | None = None) -> Sequence[RetrievedChunk]:
+        q_emb = np.asarray(self.embedder.embed(query), dtype=self._vectors.dtype)
+        scores = self._vectors @ q_emb
+        if filters:
+            metadata = self._metadata or [{}] * len(scores)
+            mask = np.fromiter((_matches(m, filters) for m in metadata), dtype=bool, count=len(scores))
+            scores = np.where(mask, scores, -np.inf)
+            k = min(k, int(mask.sum()))
+        k = min(k, len(scores))
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [
+            {
+                "content": self._contents[i],
+                "source": self._sources[i],
+                "score": max(0.0, float(scores[i])),
+            }
+            for i in top
+        ]
@@ -0,0 +1,209 @@
+import contextvars
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FutureTimeout
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Callable, TypeVar
+
+from django.conf import settings
+
+from chatbot.domain.errors import UpstreamUnavailable
+from chatbot.observability.metrics import STAGE_DURATION, UPSTREAM_CALLS
+from chatbot.observability.tracing import annotate
+
+T = TypeVar("T")
+
+
+@lru_cache(maxsize=1)
+def transient_errors() -> tuple[type[Exception], ...]:
+    # Resolved on first call so importing this module does not load openai.
+    import openai
+
+    return (
+        openai.APIConnectionError,
+        openai.APITimeoutError,
+        openai.RateLimitError,
+        openai.InternalServerError,
+    )
+
+
+_deadline: contextvars.ContextVar[float | None] = contextvars.ContextVar("chatbot_deadline", default=None)
+_hedge_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="hedge")
+
+
+@contextmanager
+def deadline(seconds: float):
+    """Bound every upstream call made inside the block by one shared time budget."""
+    token = _deadline.set(time.monotonic() + seconds)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> float | None:
+    expires_at = _deadline.get()
+    if expires_at is None:
+        return None
+    return expires_at - time.monotonic()
+
+
+class CircuitBreaker:
+    """Opens after consecutive failures, then lets one probe through per reset window."""
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._probing or time.monotonic() - self._opened_at < self.reset_timeout:
+                return False
+            self._probing = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def release_probe(self) -> None:
+        """Hand back a probe that was let through but never sent."""
+        with self._lock:
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._probing or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+            self._probing = False
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    with _breakers_lock:
+        if name not in _breakers:
+            _breakers[name] = CircuitBreaker(
+                name,
+                settings.OPENAI_BREAKER_THRESHOLD,
+                settings.OPENAI_BREAKER_RESET_SECONDS,
+            )
+        return _breakers[name]
+
+
+def _hedge_delay(stage: str) -> float | None:
+    if not settings.OPENAI_HEDGE_ENABLED:
+        return None
+    if STAGE_DURATION.count(stage=stage) < settings.OPENAI_HEDGE_MIN_SAMPLES:
+        return None
+    return STAGE_DURATION.quantile(settings.OPENAI_HEDGE_QUANTILE, stage=stage)
+
+
+def _hedged(fn: Callable[[float], T], timeout: float, stage: str) -> T:
+    delay = _hedge_delay(stage)
+    if delay is None or delay >= timeout:
+        return fn(timeout)
+
+    first = _hedge_pool.submit(contextvars.copy_context().run, fn, timeout)
+    try:
+        return first.result(timeout=delay)
+    except FutureTimeout:
+        pass
+
+    annotate(**{f"{stage}_hedged": True})
+    second = _hedge_pool.submit(contextvars.copy_context().run, fn, timeout - delay)
+    pending = {first, second}
+    error: BaseException | None = None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                return future.result()
+            error = future.exception()
+    raise error
+
+
+def call_upstream(
+    fn: Callable[[float], T],
+    *,
+    name: str,
+    stage: str,
+    attempt_timeout: float,
+    retries: int | None = None,
+    hedge: bool = True,
+) -> T:
+    """Run `fn(timeout)` with the breaker, deadline, jittered retries and hedging.
+
+    Transient failures are retried; anything else propagates unchanged. Once
+    retries or the deadline run out, or the breaker is open, this raises
+    UpstreamUnavailable so callers can fall back. Batch callers that retry on
+    their own pass `retries=0, hedge=False`.
+    """
+    budget = remaining()
+    if budget is not None and budget <= 0.05:
+        # Local stages spent the budget; the upstream is never asked.
+        UPSTREAM_CALLS.inc(upstream=name, outcome="deadline")
+        raise UpstreamUnavailable(f"No time left to call {name}")
+
+    breaker = get_breaker(name)
+    if not breaker.allow():
+        UPSTREAM_CALLS.inc(upstream=name, outcome="short_circuited")
+        raise UpstreamUnavailable(f"{name} circuit is open")
+
+    retries = settings.OPENAI_RETRIES if retries is None else retries
+    last_error: Exception | None = None
+    attempts = 0
+    for attempt in range(retries + 1):
+        budget = remaining()
+        if budget is not None and budget <= 0.05:
+            break
+        attempts += 1
+        timeout = attempt_timeout if budget is None else min(attempt_timeout, budget)
+        try:
+            result = _hedged(fn, timeout, stage) if hedge else fn(timeout)
+        except transient_errors() as exc:
+            last_error = exc
+            UPSTREAM_CALLS.inc(upstream=name, outcome="retryable_error")
+            if attempt < retries:
+                backoff = 0.2 * 2 ** attempt
+                backoff = random.uniform(0, backoff)
+                budget = remaining()
+                if budget is not None:
+                    backoff = min(backoff, max(0.0, budget - 0.05))
+                time.sleep(backoff)
+            continue
+        except Exception:
+            # The upstream answered; a client error says nothing about its health.
+            breaker.record_success()
+            UPSTREAM_CALLS.inc(upstream=name, outcome="error")
+            raise
+        breaker.record_success()
+        UPSTREAM_CALLS.inc(upstream=name, outcome="ok")
+        if attempt:
+            annotate(**{f"{stage}_retries": attempt})
+        return result
+
+    if not attempts:
+        # The budget ran out after the breaker let us through. A half-open
+        # breaker must get its probe back, or it refuses every later call.
+        breaker.release_probe()
+        UPSTREAM_CALLS.inc(upstream=name, outcome="deadline")
+        raise UpstreamUnavailable(f"No time left to call {name}")
+    breaker.record_failure()
+    UPSTREAM_CALLS.inc(upstream=name, outcome="unavailable")
+    raise UpstreamUnavailable(f"{name} failed after {attempts} attempt(s)") from last_error
@@ -0,0 +1,130 @@
+import hashlib
+import json
+import threading
+import time
+import uuid
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeout
+from typing import Callable, TypeVar
+
+from django.conf import settings
+from django.core.cache import cache as default_cache
+
+from chatbot.application.questions import normalize_question
+from chatbot.domain.ports import ChunkFilter
+from chatbot.observability.tracing import annotate, record_cache
+
+T = TypeVar("T")
+
+_MISSING = object()
+
+
+def chat_flight_key(question: str, filters: ChunkFilter | None) -> str:
+    payload = json.dumps([normalize_question(question), filters or {}], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SingleFlight:
+    """Coalesce concurrent calls for the same key into one computation.
+
+    Threads in this process wait on the leader's Future. Across workers the
+    leader holds a short `cache.add` lock and publishes its result under a
+    sibling key for `result_ttl` seconds; followers poll for it. A follower
+    whose leader fails or stalls past `wait_timeout` computes on its own.
+    """
+
+    poll_interval = 0.05
+
+    def __init__(
+        self,
+        name: str,
+        lock_ttl: int,
+        wait_timeout: float,
+        result_ttl: int,
+        cache=default_cache,
+    ):
+        self.name = name
+        self.lock_ttl = lock_ttl
+        self.wait_timeout = wait_timeout
+        self.result_ttl = result_ttl
+        self.cache = cache
+        self._futures: dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_chat(cls) -> "SingleFlight":
+        return _chat_flight
+
+    def do(self, key: str, fn: Callable[[], T]) -> T:
+        with self._lock:
+            future = self._futures.get(key)
+            leader = future is None
+            if leader:
+                future = self._futures[key] = Future()
+
+        if not leader:
+            try:
+                result = future.result(timeout=self.wait_timeout)
+            except FutureTimeout:
+                return fn()
+            record_cache(f"{self.name}_coalesce", True)
+            annotate(coalesced="local")
+            return result
+
+        try:
+            result = self._do_shared(key, fn)
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._futures.pop(key, None)
+
+    def _do_shared(self, key: str, fn: Callable[[], T]) -> T:
+        lock_key = f"flight:{self.name}:lock:{key}"
+        result_key = f"flight:{self.name}:result:{key}"
+        token = uuid.uuid4().hex
+
+        if not self.cache.add(lock_key, token, self.lock_ttl):
+            result = self._wait_for(lock_key, result_key)
+            if result is not _MISSING:
+                record_cache(f"{self.name}_coalesce", True)
+                annotate(coalesced="shared")
+                return result
+            # The other worker failed or is too slow; compute without the lock.
+            record_cache(f"{self.name}_coalesce", False)
+            return fn()
+
+        record_cache(f"{self.name}_coalesce", False)
+        # Drop a result left by an earlier flight so followers wait for this one.
+        self.cache.delete(result_key)
+        try:
+            result = fn()
+            self.cache.set(result_key, result, self.result_ttl)
+            return result
+        finally:
+            if self.cache.get(lock_key) == token:
+                self.cache.delete(lock_key)
+
+    def _wait_for(self, lock_key: str, result_key: str):
+        deadline = time.monotonic() + self.wait_timeout
+        while time.monotonic() < deadline:
+            time.sleep(self.poll_interval)
+            result = self.cache.get(result_key, _MISSING)
+            if result is not _MISSING:
+                return result
+            if self.cache.get(lock_key) is None:
+                # Released without a result: the leader raised.
+                return self.cache.get(result_key, _MISSING)
+        return _MISSING
+
+
+_chat_flight = SingleFlight(
+    "chat",
+    lock_ttl=settings.CHAT_COALESCE_LOCK_TTL,
+    wait_timeout=settings.CHAT_COALESCE_WAIT_TIMEOUT,
+    result_ttl=settings.CHAT_COALESCE_RESULT_TTL,
+)
@@ -0,0 +1,75 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from chatbot.infrastructure.http.client import get_http_client
+from chatbot.observability.tracing import record_cache
+
+SITEVERIFY_URL = "https://www.google.com/recaptcha/api/siteverify"
+SESSION_VERIFIED_KEY = "recaptcha_verified"
+# reCAPTCHA tokens expire two minutes after issue, so remembering them a
+# little longer than that is enough to refuse replays.
+TOKEN_SEEN_TTL = 180
+
+
+def verify_recaptcha(token: str, action: str) -> tuple[bool, str]:
+    if not settings.RECAPTCHA_SECRET_KEY:
+        return False, "recaptcha_not_configured"
+
+    import httpx
+
+    try:
+        resp = get_http_client().post(
+            SITEVERIFY_URL,
+            data={
+                "secret": settings.RECAPTCHA_SECRET_KEY,
+                "response": token,
+            },
+        )
+        resp.raise_for_status()
+        data = resp.json()
+    except (httpx.HTTPError, ValueError):
+        return False, "recaptcha_unavailable"
+
+    if not data.get("success"):
+        return False, "recaptcha_failed"
+
+    if data.get("action") != action:
+        return False, "recaptcha_action_mismatch"
+
+    score = float(data.get("score", 0))
+    if score < settings.RECAPTCHA_MIN_SCORE:
+        return False, "recaptcha_low_score"
+
+    return True, ""
+
+
+def _claim_token(token: str) -> bool:
+    digest = hashlib.sha256(token.encode("utf-8")).hexdigest()
+    return cache.add(f"recaptcha:seen:{digest}", 1, TOKEN_SEEN_TTL)
+
+
+def verify_recaptcha_for_session(session, token: str, action: str) -> tuple[bool, str]:
+    """Verify a token, reusing a recent success for the same session and action.
+
+    Caching is off unless RECAPTCHA_SESSION_TTL is set. Every token is still
+    single-use: a token seen before is refused even when siteverify is skipped.
+    """
+    if not _claim_token(token):
+        return False, "recaptcha_token_reused"
+
+    ttl = settings.RECAPTCHA_SESSION_TTL
+    now = time.time()
+    if ttl > 0:
+        verified = session.get(SESSION_VERIFIED_KEY) or {}
+        if verified.get("action") == action and verified.get("until", 0) > now:
+            record_cache("recaptcha", True)
+            return True, ""
+        record_cache("recaptcha", False)
+
+    ok, reason = verify_recaptcha(token, action)
+    if ok and ttl > 0:
+        session[SESSION_VERIFIED_KEY] = {"action": action, "until": now + ttl}
+    return ok, reason
@@ -1,12 +1,88 @@
+from pathlib import Path
+
+from django.conf import settings
 from rest_framework import serializers
 
+from chatbot.infrastructure.ingestion.loaders import SUPPORTED_SUFFIXES
+from chatbot.models import IngestJob, SourceType
+
+
+class ChunkFilterSerializer(serializers.Serializer):
+    source_type = serializers.ChoiceField(choices=SourceType.choices, required=False)
+    document_id = serializers.CharField(min_length=1, max_length=255, required=False)
+    language = serializers.CharField(min_length=1, max_length=16, required=False)
+    page = serializers.IntegerField(min_value=1, required=False)
+
 
 class ChatRequestSerializer(serializers.Serializer):
     query = serializers.CharField(min_length=1)
     recaptcha_token = serializers.CharField(min_length=1)
     recaptcha_action = serializers.CharField(min_length=1)
+    filters = ChunkFilterSerializer(required=False)
 
 
 class ChatResponseSerializer(serializers.Serializer):
     answer = serializers.CharField()
     sources = serializers.ListField(child=serializers.CharField())
+
+
+class IngestUploadSerializer(serializers.Serializer):
+    file = serializers.FileField()
+    source = serializers.CharField(max_length=255, required=False)
+    source_type = serializers.ChoiceField(choices=SourceType.choices, default=SourceType.DOCUMENT)
+    document_id = serializers.CharField(max_length=255, required=False)
+    language = serializers.CharField(max_length=16, required=False, default="")
+    clear = serializers.BooleanField(default=False)
+
+    def validate_file(self, value):
+        if Path(value.name).suffix.lower() not in SUPPORTED_SUFFIXES:
+            raise serializers.ValidationError(
+                f"Unsupported file type. Use one of: {', '.join(SUPPORTED_SUFFIXES)}."
+            )
+        if value.size > settings.INGEST_MAX_UPLOAD_BYTES:
+            raise serializers.ValidationError("File is too large.")
+        return value
+
+    def create(self, validated_data):
+        upload = validated_data["file"]
+        name = Path(upload.name).name
+        return IngestJob.objects.create(
+            filename=name,
+            content=upload.read(),
+            source=validated_data.get("source") or name,
+            source_type=validated_data["source_type"],
+            document_id=validated_data.get("document_id") or Path(name).stem,
+            language=validated_data["language"],
+            clear=validated_data["clear"],
+        )
+
+
+class IngestJobSerializer(serializers.ModelSerializer):
+    progress = serializers.SerializerMethodField()
+
+    class Meta:
+        model = IngestJob
+        fields = [
+            "id",
+            "filename",
+            "source",
+            "source_type",
+            "document_id",
+            "language",
+            "clear",
+            "status",
+            "total_chunks",
+            "done_chunks",
+            "progress",
+            "attempts",
+            "last_error",
+            "created_at",
+            "updated_at",
+            "finished_at",
+        ]
+        read_only_fields = fields
+
+    def get_progress(self, obj) -> float:
+        if not obj.total_chunks:
+            return 0.0
+        return round(obj.done_chunks / obj.total_chunks, 3)
@@ -0,0 +1,162 @@
+import time
+import uuid
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache as default_cache
+from rest_framework.exceptions import Throttled
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class TokenBucketThrottle(SimpleRateThrottle):
+    """Token bucket keyed per client, stored in the shared cache.
+
+    A rate of "20/min" means a bucket of 20 tokens refilled at 20 per minute,
+    so short bursts are allowed while the long-run rate stays bounded. Each
+    read-modify-write holds a short per-bucket lock taken with `cache.add`, so
+    concurrent requests in different workers cannot spend the same token.
+    """
+
+    lock_ttl = 2
+    lock_wait = 0.2
+    poll_interval = 0.005
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        lock_key = f"{self.key}:lock"
+        token = uuid.uuid4().hex
+        deadline = time.monotonic() + self.lock_wait
+        while not self.cache.add(lock_key, token, self.lock_ttl):
+            if time.monotonic() >= deadline:
+                # A bucket this contended is being hammered; refuse rather than race.
+                self.tokens = 0.0
+                return False
+            time.sleep(self.poll_interval)
+        try:
+            return self._take_token()
+        finally:
+            if self.cache.get(lock_key) == token:
+                self.cache.delete(lock_key)
+
+    def _take_token(self) -> bool:
+        self.now = self.timer()
+        refill_per_sec = self.num_requests / self.duration
+        tokens, updated_at = self.cache.get(self.key, (float(self.num_requests), self.now))
+        tokens = min(float(self.num_requests), tokens + (self.now - updated_at) * refill_per_sec)
+
+        if tokens >= 1:
+            self.tokens = tokens - 1
+            self.cache.set(self.key, (self.tokens, self.now), self.duration)
+            return True
+
+        self.tokens = tokens
+        self.cache.set(self.key, (self.tokens, self.now), self.duration)
+        return False
+
+    def wait(self):
+        refill_per_sec = self.num_requests / self.duration
+        return max(0.0, (1 - self.tokens) / refill_per_sec)
+
+
+class ChatIPThrottle(TokenBucketThrottle):
+    scope = "chat_ip"
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {"scope": self.scope, "ident": self.get_ident(request)}
+
+
+class ChatSessionThrottle(TokenBucketThrottle):
+    scope = "chat_session"
+
+    def get_cache_key(self, request, view):
+        # Clients that drop the session cookie share one bucket per IP instead
+        # of escaping this throttle.
+        ident = request.session.session_key or f"ip:{self.get_ident(request)}"
+        return self.cache_format % {"scope": self.scope, "ident": ident}
+
+
+class ConcurrencyGate:
+    """Global cap on in-flight requests with a bounded wait queue.
+
+    Each running request and each waiter owns one cache key created with
+    `cache.add`, which is atomic on the shared backends. Keys expire after
+    `slot_ttl` so a crashed worker cannot leak a slot forever.
+    """
+
+    poll_interval = 0.05
+
+    def __init__(
+        self,
+        name: str,
+        limit: int,
+        queue_size: int,
+        queue_timeout: float,
+        slot_ttl: int,
+        cache=default_cache,
+    ):
+        self.name = name
+        self.limit = limit
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self.slot_ttl = slot_ttl
+        self.cache = cache
+
+    @classmethod
+    def for_chat(cls) -> "ConcurrencyGate":
+        return cls(
+            "chat",
+            limit=settings.CHAT_MAX_CONCURRENCY,
+            queue_size=settings.CHAT_QUEUE_SIZE,
+            queue_timeout=settings.CHAT_QUEUE_TIMEOUT,
+            slot_ttl=settings.CHAT_SLOT_TTL,
+        )
+
+    def _claim(self, kind: str, size: int, token: str) -> str | None:
+        for index in range(size):
+            key = f"gate:{self.name}:{kind}:{index}"
+            if self.cache.add(key, token, self.slot_ttl):
+                return key
+        return None
+
+    def _release(self, key: str, token: str) -> None:
+        if self.cache.get(key) == token:
+            self.cache.delete(key)
+
+    def _reject(self):
+        raise Throttled(
+            wait=max(1, round(self.queue_timeout)),
+            detail="Too many chat requests in progress. Please retry shortly.",
+        )
+
+    @contextmanager
+    def slot(self):
+        if self.limit <= 0:
+            yield
+            return
+
+        token = uuid.uuid4().hex
+        slot_key = self._claim("slot", self.limit, token)
+        if slot_key is None:
+            queue_key = self._claim("queue", self.queue_size, token)
+            if queue_key is None:
+                self._reject()
+            try:
+                deadline = time.monotonic() + self.queue_timeout
+                while slot_key is None and time.monotonic() < deadline:
+                    time.sleep(self.poll_interval)
+                    slot_key = self._claim("slot", self.limit, token)
+            finally:
+                self._release(queue_key, token)
+            if slot_key is None:
+                self._reject()
+
+        try:
+            yield
+        finally:
+            self._release(slot_key, token)
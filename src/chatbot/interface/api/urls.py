@@ -1,6 +1,9 @@
 from django.urls import path
-from .views import ChatView
+from .views import ChatView, IngestJobDetailView, IngestJobListView, MetricsView
 
 urlpatterns = [
     path("chat/", ChatView.as_view()),
+    path("metrics/", MetricsView.as_view()),
+    path("ingest/jobs/", IngestJobListView.as_view()),
+    path("ingest/jobs/<int:pk>/", IngestJobDetailView.as_view()),
 ]
\ No newline at end of file
@@ -1,76 +1,89 @@
-import json
-from urllib.parse import urlencode
-from urllib.request import Request, urlopen
-
 from django.conf import settings
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
+from rest_framework.parsers import FormParser, MultiPartParser
+from rest_framework.permissions import IsAdminUser
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.views import APIView
 
-from chatbot.interface.api.serializers import ChatRequestSerializer
+from chatbot.interface.api.recaptcha import verify_recaptcha_for_session
+from chatbot.interface.api.serializers import (
+    ChatRequestSerializer,
+    IngestJobSerializer,
+    IngestUploadSerializer,
+)
+from chatbot.interface.api.throttling import ChatIPThrottle, ChatSessionThrottle, ConcurrencyGate
 from chatbot.application.use_cases.ask_question import AskQuestionUseCase
 from chatbot.application.policies import SimilarityPolicy
+from chatbot.infrastructure.django.canned_answers import lookup_canned_answer
 from chatbot.infrastructure.django.repositories import PgVectorChunkRepository
+from chatbot.infrastructure.llm.dummy_client import DummyLLMClient
+from chatbot.infrastructure.llm.fallback_client import FallbackLLMClient
 from chatbot.infrastructure.llm.openai_client import OpenAILLMClient
+from chatbot.infrastructure.resilience import deadline
+from chatbot.infrastructure.singleflight import SingleFlight, chat_flight_key
+from chatbot.models import IngestJob
+from chatbot.observability.metrics import REGISTRY
+from chatbot.observability.tracing import annotate, stage
 
 
 SESSION_HISTORY_KEY = "chat_history"
 
 
-def verify_recaptcha(token: str, action: str) -> tuple[bool, str]:
-    if not settings.RECAPTCHA_SECRET_KEY:
-        return False, "recaptcha_not_configured"
-
-    payload = urlencode(
-        {
-            "secret": settings.RECAPTCHA_SECRET_KEY,
-            "response": token,
-        }
-    ).encode("utf-8")
-    req = Request(
-        "https://www.google.com/recaptcha/api/siteverify",
-        data=payload,
-        headers={"Content-Type": "application/x-www-form-urlencoded"},
-    )
-    with urlopen(req, timeout=10) as resp:
-        data = json.loads(resp.read().decode("utf-8"))
+class ChatView(APIView):
+    throttle_classes = [ChatIPThrottle, ChatSessionThrottle]
 
-    if not data.get("success"):
-        return False, "recaptcha_failed"
+    def verify_recaptcha(self, request, token: str, action: str) -> tuple[bool, str]:
+        return verify_recaptcha_for_session(request.session, token, action)
 
-    if data.get("action") != action:
-        return False, "recaptcha_action_mismatch"
+    def get_use_case(self) -> AskQuestionUseCase:
+        return AskQuestionUseCase(
+            repo=PgVectorChunkRepository(),
+            llm=FallbackLLMClient(OpenAILLMClient(), DummyLLMClient()),
+            policy=SimilarityPolicy(threshold=0.15),
+        )
 
-    score = float(data.get("score", 0))
-    if score < settings.RECAPTCHA_MIN_SCORE:
-        return False, "recaptcha_low_score"
+    def get_concurrency_gate(self) -> ConcurrencyGate:
+        return ConcurrencyGate.for_chat()
 
-    return True, ""
+    def get_canned_answer(self, query: str):
+        return lookup_canned_answer(query)
 
+    def get_single_flight(self) -> SingleFlight | None:
+        return SingleFlight.for_chat() if settings.CHAT_COALESCE_ENABLED else None
 
-class ChatView(APIView):
     def post(self, request):
         ser = ChatRequestSerializer(data=request.data)
         ser.is_valid(raise_exception=True)
 
-        ok, reason = verify_recaptcha(
-            ser.validated_data["recaptcha_token"],
-            ser.validated_data["recaptcha_action"],
-        )
+        with stage("recaptcha"):
+            ok, reason = self.verify_recaptcha(
+                request,
+                ser.validated_data["recaptcha_token"],
+                ser.validated_data["recaptcha_action"],
+            )
         if not ok:
             return Response(
                 {"detail": "reCAPTCHA verification failed.", "reason": reason},
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        usecase = AskQuestionUseCase(
-            repo=PgVectorChunkRepository(),
-            llm=OpenAILLMClient(),
-            policy=SimilarityPolicy(threshold=0.15),
-        )
-
         query = ser.validated_data["query"]
-        result = usecase.execute(query)
+        filters = ser.validated_data.get("filters") or None
+        canned = None if filters else self.get_canned_answer(query)
+        if canned is not None:
+            annotate(canned=True)
+            result = {"answer": canned["answer"], "sources": canned["sources"]}
+        else:
+            usecase = self.get_use_case()
+
+            def compute() -> dict:
+                with self.get_concurrency_gate().slot(), deadline(settings.CHAT_DEADLINE_SECONDS):
+                    return usecase.execute(query, filters=filters)
+
+            flight = self.get_single_flight()
+            result = flight.do(chat_flight_key(query, filters), compute) if flight else compute()
 
         history = request.session.get(SESSION_HISTORY_KEY, [])
         history = [
@@ -85,3 +98,43 @@ class ChatView(APIView):
         request.session[SESSION_HISTORY_KEY] = history
         request.session.modified = True
         return Response(result, status=status.HTTP_200_OK)
+
+
+class MetricsView(APIView):
+    authentication_classes = []
+    permission_classes = []
+
+    def get(self, request):
+        token = settings.METRICS_TOKEN
+        if token:
+            if request.headers.get("Authorization") != f"Bearer {token}":
+                return HttpResponse(status=status.HTTP_401_UNAUTHORIZED)
+        elif not settings.DEBUG:
+            return HttpResponse(status=status.HTTP_404_NOT_FOUND)
+        return HttpResponse(
+            REGISTRY.render(),
+            content_type="text/plain; version=0.0.4; charset=utf-8",
+        )
+
+
+class IngestJobListView(APIView):
+    permission_classes = [IsAdminUser]
+    parser_classes = [MultiPartParser, FormParser]
+
+    def get(self, request):
+        jobs = IngestJob.objects.defer("content")[:50]
+        return Response(IngestJobSerializer(jobs, many=True).data)
+
+    def post(self, request):
+        ser = IngestUploadSerializer(data=request.data)
+        ser.is_valid(raise_exception=True)
+        job = ser.save()
+        return Response(IngestJobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
+
+
+class IngestJobDetailView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, pk: int):
+        job = get_object_or_404(IngestJob.objects.defer("content"), pk=pk)
+        return Response(IngestJobSerializer(job).data)
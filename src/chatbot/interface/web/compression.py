@@ -0,0 +1,29 @@
+import gzip
+
+try:
+    import brotli
+except ImportError:  # Brotli is optional; gzip is always available.
+    brotli = None
+
+
+def compress_variants(body: bytes) -> dict[str, bytes]:
+    variants = {
+        "identity": body,
+        "gzip": gzip.compress(body, compresslevel=9, mtime=0),
+    }
+    if brotli is not None:
+        variants["br"] = brotli.compress(body, quality=11)
+    return variants
+
+
+def pick_encoding(accept_encoding: str, available) -> str:
+    accepted = set()
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        if params.strip().replace(" ", "") in ("q=0", "q=0.0"):
+            continue
+        accepted.add(name.strip().lower())
+    for encoding in ("br", "gzip"):
+        if encoding in available and (encoding in accepted or "*" in accepted):
+            return encoding
+    return "identity"
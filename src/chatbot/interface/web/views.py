@@ -1,8 +1,20 @@
+import hashlib
+from datetime import datetime, timezone
+
 from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
 from django.shortcuts import redirect, render
+from django.template.loader import render_to_string
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+from django.utils.safestring import mark_safe
 from django.views.decorators.http import require_http_methods
 
+from chatbot.interface.web.compression import compress_variants, pick_encoding
+
 SESSION_HISTORY_KEY = "chat_history"
+MESSAGE_TEMPLATE = "chatbot/partials/message.html"
 
 
 def _get_history(request):
@@ -14,6 +26,30 @@ def _save_history(request, history):
     request.session.modified = True
 
 
+def _message_cache_key(message) -> str:
+    digest = hashlib.sha256(
+        f"{message.get('role')}\0{message.get('content')}".encode("utf-8")
+    ).hexdigest()
+    return f"fragment:message:{settings.PAGE_CACHE_VERSION}:{digest}"
+
+
+def _render_history(history) -> list[str]:
+    """Render each message once and reuse the HTML across requests and sessions."""
+    keys = [_message_cache_key(m) for m in history]
+    cached = cache.get_many(keys)
+    missing = {}
+    rendered = []
+    for key, message in zip(keys, history):
+        html = cached.get(key)
+        if html is None:
+            html = render_to_string(MESSAGE_TEMPLATE, {"m": message})
+            missing[key] = html
+        rendered.append(mark_safe(html))
+    if missing:
+        cache.set_many(missing, settings.FRAGMENT_CACHE_TTL)
+    return rendered
+
+
 @require_http_methods(["GET"])
 def chat_view(request):
     history = _get_history(request)
@@ -22,15 +58,48 @@ def chat_view(request):
         "chatbot/chat.html",
         {
             "history": history,
+            "rendered_history": _render_history(history),
             "recaptcha_site_key": settings.RECAPTCHA_SITE_KEY,
             "resume_url": settings.RESUME_URL,
+            "suggested_questions": settings.CHAT_SUGGESTED_QUESTIONS,
         },
     )
 
 
+def _home_page() -> dict:
+    key = f"page:home:{settings.PAGE_CACHE_VERSION}"
+    page = None if settings.DEBUG else cache.get(key)
+    if page is None:
+        body = render_to_string("chatbot/home.html").encode("utf-8")
+        page = {
+            "etag": f'W/"{hashlib.sha256(body).hexdigest()[:32]}"',
+            "last_modified": datetime.now(timezone.utc).replace(microsecond=0).timestamp(),
+            "variants": compress_variants(body),
+        }
+        # No expiry: a new PAGE_CACHE_VERSION (e.g. the deploy commit) moves to a new key.
+        cache.set(key, page, None)
+    return page
+
+
 @require_http_methods(["GET"])
 def home_view(request):
-    return render(request, "chatbot/home.html")
+    page = _home_page()
+    response = get_conditional_response(
+        request,
+        etag=page["etag"],
+        last_modified=int(page["last_modified"]),
+    )
+    if response is None:
+        encoding = pick_encoding(request.headers.get("Accept-Encoding", ""), page["variants"])
+        response = HttpResponse(page["variants"][encoding], content_type="text/html; charset=utf-8")
+        if encoding != "identity":
+            response["Content-Encoding"] = encoding
+
+    response["ETag"] = page["etag"]
+    response["Last-Modified"] = http_date(page["last_modified"])
+    response["Cache-Control"] = f"public, max-age={settings.PAGE_CACHE_MAX_AGE}"
+    patch_vary_headers(response, ["Accept-Encoding"])
+    return response
 
 
 @require_http_methods(["GET", "POST"])
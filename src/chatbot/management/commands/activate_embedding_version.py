@@ -0,0 +1,45 @@
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+
+from chatbot.infrastructure.django.routers import use_primary
+from chatbot.infrastructure.embeddings.versions import (
+    EmbeddingVersionError,
+    activate_version,
+    coverage,
+    ensure_version_index,
+)
+from chatbot.models import EmbeddingVersion
+
+
+class Command(BaseCommand):
+    help = "Switch the chat read path to a fully backfilled embedding version."
+
+    def add_arguments(self, parser):
+        parser.add_argument("name", type=str, nargs="?", help="Version to activate; omit to list versions.")
+        parser.add_argument(
+            "--no-warm",
+            action="store_true",
+            help="Skip regenerating precomputed answers for the suggested questions.",
+        )
+
+    def handle(self, *args, **options):
+        with use_primary():
+            if not options["name"]:
+                for version in EmbeddingVersion.objects.order_by("pk"):
+                    done, total = coverage(version)
+                    self.stdout.write(f"{version}  {done}/{total} chunks")
+                return
+
+            version = EmbeddingVersion.objects.filter(name=options["name"]).first()
+            if version is None:
+                raise CommandError(f"Unknown version: {options['name']}")
+
+            ensure_version_index(version)
+            try:
+                activate_version(version)
+            except EmbeddingVersionError as exc:
+                raise CommandError(str(exc)) from exc
+
+        self.stdout.write(self.style.SUCCESS(f"{version.name} is now active."))
+        if not options["no_warm"]:
+            call_command("warm_answers", stdout=self.stdout)
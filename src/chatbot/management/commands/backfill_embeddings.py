@@ -0,0 +1,132 @@
+import time
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from chatbot.infrastructure.django.routers import use_primary
+from chatbot.infrastructure.embeddings.versions import (
+    EmbeddingVersionError,
+    activate_version,
+    embedder_for,
+    ensure_version_index,
+    missing_chunks,
+)
+from chatbot.infrastructure.ingestion.pipeline import embed_with_retry
+from chatbot.models import Chunk, ChunkEmbedding, EmbeddingVersion
+
+
+class Command(BaseCommand):
+    help = "Re-embed existing chunks for an embedding version, in throttled batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("name", type=str, help="Version name, e.g. te3-small-512.")
+        parser.add_argument("--model", type=str, default=None, help="Embedding model (required for a new version).")
+        parser.add_argument(
+            "--dimensions",
+            type=int,
+            default=None,
+            help="Vector dimensions (required for a new version).",
+        )
+        parser.add_argument("--batch-size", type=int, default=64)
+        parser.add_argument(
+            "--pause",
+            type=float,
+            default=1.0,
+            help="Seconds to sleep between batches to stay under API rate limits.",
+        )
+        parser.add_argument("--max-batches", type=int, default=0, help="Stop after this many batches (0 = all).")
+        parser.add_argument(
+            "--activate",
+            action="store_true",
+            help="Switch the read path to this version once every chunk is covered.",
+        )
+        parser.add_argument(
+            "--no-warm",
+            action="store_true",
+            help="Skip regenerating precomputed answers after --activate.",
+        )
+
+    def handle(self, *args, **options):
+        with use_primary():
+            version = self.load_version(options)
+            self.backfill(version, options)
+
+            if missing_chunks(version).exists():
+                self.stdout.write("Backfill incomplete; run again to continue.")
+                return
+
+            if version.status == EmbeddingVersion.Status.BACKFILLING:
+                version.status = EmbeddingVersion.Status.READY
+                version.save(update_fields=["status"])
+            self.stdout.write(f"Building index {version.index_name}...")
+            ensure_version_index(version)
+            self.stdout.write(self.style.SUCCESS(f"{version.name} covers every chunk."))
+
+            if options["activate"]:
+                try:
+                    activate_version(version)
+                except EmbeddingVersionError as exc:
+                    raise CommandError(str(exc)) from exc
+                self.stdout.write(self.style.SUCCESS(f"{version.name} is now active."))
+
+        if options["activate"] and not options["no_warm"]:
+            call_command("warm_answers", stdout=self.stdout)
+
+    def load_version(self, options) -> EmbeddingVersion:
+        version = EmbeddingVersion.objects.filter(name=options["name"]).first()
+        if version is None:
+            if not options["model"] or not options["dimensions"]:
+                raise CommandError("A new version needs --model and --dimensions.")
+            version = EmbeddingVersion.objects.create(
+                name=options["name"],
+                model=options["model"],
+                dimensions=options["dimensions"],
+            )
+            self.stdout.write(f"Created version {version}.")
+            return version
+
+        if version.status == EmbeddingVersion.Status.RETIRED:
+            raise CommandError(f"{version.name} is retired.")
+        if options["model"] and options["model"] != version.model:
+            raise CommandError(f"{version.name} uses model {version.model}.")
+        if options["dimensions"] and options["dimensions"] != version.dimensions:
+            raise CommandError(f"{version.name} uses {version.dimensions} dimensions.")
+        return version
+
+    def backfill(self, version: EmbeddingVersion, options) -> None:
+        embedder = embedder_for(version, batch=True)
+        remaining = missing_chunks(version).count()
+        self.stdout.write(f"{remaining} chunk(s) to embed for {version.name}.")
+
+        done = 0
+        batches = 0
+        while True:
+            batch = list(
+                missing_chunks(version).order_by("pk").values_list("pk", "content")[: options["batch_size"]]
+            )
+            if not batch:
+                break
+            vectors = [embed_with_retry(embedder, content) for _, content in batch]
+            with transaction.atomic():
+                # Lock the chunks so a concurrent delete cannot orphan the new rows.
+                alive = set(
+                    Chunk.objects
+                    .select_for_update()
+                    .filter(pk__in=[pk for pk, _ in batch])
+                    .values_list("pk", flat=True)
+                )
+                ChunkEmbedding.objects.bulk_create(
+                    [
+                        ChunkEmbedding(chunk_id=pk, version=version, embedding=vector)
+                        for (pk, _), vector in zip(batch, vectors)
+                        if pk in alive
+                    ],
+                    ignore_conflicts=True,
+                )
+            done += len(batch)
+            batches += 1
+            self.stdout.write(f"  {done}/{remaining} embedded")
+            if options["max_batches"] and batches >= options["max_batches"]:
+                break
+            time.sleep(options["pause"])
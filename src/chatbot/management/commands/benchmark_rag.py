@@ -0,0 +1,286 @@
+import json
+import resource
+import time
+from concurrent.futures import ThreadPoolExecutor
+from importlib import import_module
+from pathlib import Path
+from typing import Any, Sequence
+
+import numpy as np
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from rest_framework.test import APIRequestFactory
+
+from chatbot.application.evaluation import latency_summary, recall_at_k
+from chatbot.application.policies import SimilarityPolicy
+from chatbot.application.use_cases.ask_question import AskQuestionUseCase
+from chatbot.infrastructure.django.bulk import insert_chunks
+from chatbot.infrastructure.django.repositories import PgVectorChunkRepository
+from chatbot.infrastructure.embeddings.hash_embedder import HashEmbedder
+from chatbot.infrastructure.llm.fake_client import FakeLLMClient
+from chatbot.infrastructure.memory.repositories import InMemoryVectorChunkRepository
+from chatbot.interface.api.throttling import ConcurrencyGate
+from chatbot.interface.api.views import ChatView
+from chatbot.models import Chunk
+
+SYNTHETIC_PREFIX = "synthetic-"
+BACKENDS = ("memory", "pgvector")
+
+
+class SyntheticTexts(Sequence[str]):
+    """Chunk texts rendered on demand from word indices to keep 1M-chunk corpora small."""
+
+    def __init__(self, vocabulary: list[str], word_ids: np.ndarray):
+        self.vocabulary = vocabulary
+        self.word_ids = word_ids
+
+    def __len__(self) -> int:
+        return len(self.word_ids)
+
+    def __getitem__(self, index):
+        return " ".join(self.vocabulary[i] for i in self.word_ids[index])
+
+
+class SyntheticSources(Sequence[str]):
+    def __init__(self, size: int):
+        self.size = size
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, index):
+        if not 0 <= index < self.size:
+            raise IndexError(index)
+        return f"{SYNTHETIC_PREFIX}{index}"
+
+
+class SyntheticCorpus:
+    def __init__(self, embedder: HashEmbedder, size: int, words_per_chunk: int, vocabulary_size: int, seed: int):
+        rng = np.random.default_rng(seed)
+        self.vocabulary = [f"w{i}" for i in range(vocabulary_size)]
+        vocab_matrix = np.stack([embedder.token_vector(word) for word in self.vocabulary])
+
+        self.word_ids = rng.integers(0, vocabulary_size, size=(size, words_per_chunk), dtype=np.int32)
+        self.vectors = np.empty((size, embedder.dimensions), dtype=np.float32)
+        for start in range(0, size, 1_000):
+            batch = vocab_matrix[self.word_ids[start:start + 1_000]].sum(axis=1)
+            batch /= np.linalg.norm(batch, axis=1, keepdims=True)
+            self.vectors[start:start + len(batch)] = batch
+
+        self.contents = SyntheticTexts(self.vocabulary, self.word_ids)
+        self.sources = SyntheticSources(size)
+        self._rng = rng
+
+    def queries(self, count: int, words_per_query: int) -> list[tuple[str, int]]:
+        targets = self._rng.integers(0, len(self.word_ids), size=count)
+        queries = []
+        for target in targets:
+            words = self._rng.choice(self.word_ids[target], size=words_per_query, replace=False)
+            queries.append((" ".join(self.vocabulary[i] for i in words), int(target)))
+        return queries
+
+    def exact_top_k(self, embedder: HashEmbedder, query: str, k: int) -> list[str]:
+        scores = self.vectors @ embedder.embed_array(query)
+        top = np.argpartition(-scores, k - 1)[:k]
+        return [self.sources[i] for i in top[np.argsort(-scores[top])]]
+
+
+class BenchmarkChatView(ChatView):
+    throttle_classes = []
+    use_case = None
+    max_concurrency = 0
+
+    def verify_recaptcha(self, request, token, action):
+        return True, ""
+
+    def get_use_case(self):
+        return self.use_case
+
+    def get_concurrency_gate(self):
+        return ConcurrencyGate("benchmark", self.max_concurrency, 0, 0, 60)
+
+    def get_canned_answer(self, query):
+        return None
+
+
+def peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class Command(BaseCommand):
+    help = "Benchmark retrieval and the chat endpoint offline with deterministic fakes."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            default="1000,10000,100000",
+            help="Comma separated corpus sizes (up to 1000000).",
+        )
+        parser.add_argument(
+            "--backends",
+            default="memory",
+            help=f"Comma separated repository backends: {', '.join(BACKENDS)}.",
+        )
+        parser.add_argument("--dim", type=int, default=256, help="Embedding dimensions.")
+        parser.add_argument("--k", type=int, default=4)
+        parser.add_argument("--queries", type=int, default=200, help="Retrieval queries per run.")
+        parser.add_argument("--requests", type=int, default=200, help="Chat requests per load run.")
+        parser.add_argument("--concurrency", type=int, default=8, help="Concurrent chat clients.")
+        parser.add_argument(
+            "--max-concurrency",
+            type=int,
+            default=0,
+            help="Apply the chat concurrency gate with this limit (0 = off).",
+        )
+        parser.add_argument("--llm-latency", type=float, default=0.05, help="Fake LLM latency in seconds.")
+        parser.add_argument("--llm-jitter", type=float, default=0.0, help="Extra random fake LLM latency.")
+        parser.add_argument("--words-per-chunk", type=int, default=40)
+        parser.add_argument("--vocabulary", type=int, default=5000)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--json", dest="json_path", default=None, help="Write results as JSON.")
+
+    def handle(self, *args, **options):
+        sizes = [int(size) for size in options["sizes"].split(",") if size.strip()]
+        backends = [name.strip() for name in options["backends"].split(",") if name.strip()]
+        unknown = set(backends) - set(BACKENDS)
+        if unknown:
+            raise CommandError(f"Unknown backend(s): {', '.join(sorted(unknown))}")
+
+        embedder = HashEmbedder(options["dim"])
+        results = []
+        for size in sizes:
+            started = time.perf_counter()
+            corpus = SyntheticCorpus(
+                embedder,
+                size,
+                options["words_per_chunk"],
+                options["vocabulary"],
+                options["seed"],
+            )
+            build_seconds = time.perf_counter() - started
+            for backend in backends:
+                repo, cleanup = self.build_repository(backend, embedder, corpus)
+                try:
+                    result = {
+                        "backend": backend,
+                        "chunks": size,
+                        "dim": options["dim"],
+                        "corpus_build_s": round(build_seconds, 3),
+                        "vectors_mb": round(corpus.vectors.nbytes / 1024 / 1024, 1),
+                        "retrieval": self.run_retrieval(repo, embedder, corpus, options),
+                        "chat": self.run_load(repo, corpus, options),
+                        "peak_rss_mb": round(peak_rss_mb(), 1),
+                    }
+                finally:
+                    cleanup()
+                results.append(result)
+                self.report(result)
+
+        if options["json_path"]:
+            path = Path(options["json_path"])
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(results, indent=2), encoding="utf-8")
+            self.stdout.write(self.style.SUCCESS(f"Saved: {path}"))
+
+    def build_repository(self, backend: str, embedder: HashEmbedder, corpus: SyntheticCorpus):
+        if backend == "memory":
+            repo = InMemoryVectorChunkRepository(embedder, corpus.contents, corpus.sources, corpus.vectors)
+            return repo, lambda: None
+
+        if connection.vendor != "postgresql":
+            raise CommandError("The pgvector backend needs a PostgreSQL database.")
+        dimensions = Chunk._meta.get_field("embedding").dimensions
+        if embedder.dimensions != dimensions:
+            raise CommandError(f"The pgvector backend needs --dim {dimensions}.")
+        if Chunk.objects.exclude(source__startswith=SYNTHETIC_PREFIX).exists():
+            raise CommandError("Refusing to benchmark pgvector against a database that holds real chunks.")
+
+        def cleanup():
+            Chunk.objects.filter(source__startswith=SYNTHETIC_PREFIX).delete()
+
+        cleanup()
+        for start in range(0, len(corpus.sources), 1000):
+            stop = min(start + 1000, len(corpus.sources))
+            insert_chunks(
+                Chunk(
+                    content=corpus.contents[i],
+                    source=corpus.sources[i],
+                    embedding=corpus.vectors[i],
+                )
+                for i in range(start, stop)
+            )
+        return PgVectorChunkRepository(embedder=embedder), cleanup
+
+    def run_retrieval(self, repo, embedder: HashEmbedder, corpus: SyntheticCorpus, options) -> dict[str, Any]:
+        k = options["k"]
+        latencies = []
+        recalls = []
+        target_hits = 0
+        for query, target in corpus.queries(options["queries"], min(8, options["words_per_chunk"])):
+            started = time.perf_counter()
+            chunks = repo.search(query, k=k)
+            latencies.append(time.perf_counter() - started)
+            retrieved = [c["source"] for c in chunks]
+            recalls.append(recall_at_k(retrieved, corpus.exact_top_k(embedder, query, k), k))
+            target_hits += corpus.sources[target] in retrieved
+
+        total = sum(latencies)
+        return {
+            **{key: round(value, 3) for key, value in latency_summary(latencies).items()},
+            "qps": round(len(latencies) / total, 1) if total else 0.0,
+            f"recall@{k}": round(sum(recalls) / len(recalls), 4) if recalls else 0.0,
+            "target_hit_rate": round(target_hits / len(latencies), 4) if latencies else 0.0,
+        }
+
+    def run_load(self, repo, corpus: SyntheticCorpus, options) -> dict[str, Any]:
+        usecase = AskQuestionUseCase(
+            repo=repo,
+            llm=FakeLLMClient(options["llm_latency"], options["llm_jitter"], options["seed"]),
+            policy=SimilarityPolicy(threshold=0.15),
+        )
+        view = BenchmarkChatView.as_view(use_case=usecase, max_concurrency=options["max_concurrency"])
+        factory = APIRequestFactory()
+        queries = [query for query, _ in corpus.queries(options["requests"], min(8, options["words_per_chunk"]))]
+        session_store = import_module(settings.SESSION_ENGINE).SessionStore
+
+        def send(query: str) -> tuple[float, int]:
+            request = factory.post(
+                "/api/chat/",
+                {"query": query, "recaptcha_token": "benchmark", "recaptcha_action": "chat"},
+                format="json",
+            )
+            request.session = session_store()
+            started = time.perf_counter()
+            response = view(request)
+            return time.perf_counter() - started, response.status_code
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options["concurrency"]) as pool:
+            outcomes = list(pool.map(send, queries))
+        wall = time.perf_counter() - started
+
+        latencies = [seconds for seconds, _ in outcomes]
+        errors = sum(1 for _, status_code in outcomes if status_code != 200)
+        return {
+            **{key: round(value, 3) for key, value in latency_summary(latencies).items()},
+            "rps": round(len(outcomes) / wall, 1) if wall else 0.0,
+            "errors": errors,
+        }
+
+    def report(self, result: dict[str, Any]) -> None:
+        retrieval = result["retrieval"]
+        chat = result["chat"]
+        recall_key = next(key for key in retrieval if key.startswith("recall@"))
+        self.stdout.write(
+            f"[{result['backend']}] chunks={result['chunks']} dim={result['dim']} "
+            f"build={result['corpus_build_s']}s vectors={result['vectors_mb']}MB rss={result['peak_rss_mb']}MB"
+        )
+        self.stdout.write(
+            f"  retrieval p50={retrieval['p50_ms']}ms p95={retrieval['p95_ms']}ms p99={retrieval['p99_ms']}ms "
+            f"qps={retrieval['qps']} {recall_key}={retrieval[recall_key]} target_hit={retrieval['target_hit_rate']}"
+        )
+        self.stdout.write(
+            f"  chat      p50={chat['p50_ms']}ms p95={chat['p95_ms']}ms p99={chat['p99_ms']}ms "
+            f"rps={chat['rps']} errors={chat['errors']}"
+        )
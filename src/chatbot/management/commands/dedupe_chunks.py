@@ -0,0 +1,77 @@
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from chatbot.infrastructure.django.routers import use_primary
+from chatbot.infrastructure.ingestion.dedup import NearDuplicateIndex, merge_sources, simhash
+from chatbot.models import Chunk
+
+
+class Command(BaseCommand):
+    help = "Fingerprint stored chunks and collapse near-duplicates ingested before deduplication existed."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--max-distance",
+            type=int,
+            default=None,
+            help="Max SimHash Hamming distance (defaults to INGEST_DEDUP_MAX_DISTANCE).",
+        )
+        parser.add_argument("--dry-run", action="store_true", help="Report what would be collapsed.")
+        parser.add_argument(
+            "--no-warm",
+            action="store_true",
+            help="Skip regenerating precomputed answers for the suggested questions.",
+        )
+
+    def handle(self, *args, **options):
+        max_distance = options["max_distance"]
+        if max_distance is None:
+            max_distance = settings.INGEST_DEDUP_MAX_DISTANCE
+
+        collapsed = 0
+        with use_primary():
+            scopes = Chunk.objects.values_list("source_type", "language").distinct().order_by()
+            for source_type, language in list(scopes):
+                with transaction.atomic():
+                    collapsed += self.dedupe(source_type, language, max_distance, options["dry_run"])
+
+        verb = "Would collapse" if options["dry_run"] else "Collapsed"
+        self.stdout.write(self.style.SUCCESS(f"{verb} {collapsed} near-duplicate chunks."))
+        if collapsed and not options["dry_run"] and not options["no_warm"]:
+            call_command("warm_answers", stdout=self.stdout)
+
+    def dedupe(self, source_type: str, language: str, max_distance: int, dry_run: bool) -> int:
+        duplicates = NearDuplicateIndex(max_distance)
+        fingerprinted = []
+        removed = []
+        merges: dict[int, set[str]] = {}
+        rows = (
+            Chunk.objects
+            .filter(source_type=source_type, language=language)
+            .order_by("pk")
+            .values_list("pk", "source", "document_id", "content", "simhash", "merged_sources")
+        )
+        # Oldest chunk wins, so chunks already cited keep their ids.
+        for pk, source, document_id, content, fingerprint, merged in rows.iterator(chunk_size=2000):
+            if fingerprint is None:
+                fingerprint = simhash(content)
+                fingerprinted.append(Chunk(pk=pk, simhash=fingerprint))
+            match = duplicates.match(fingerprint, document_id)
+            if match is None:
+                duplicates.add(fingerprint, source, document_id)
+                continue
+            kept_fingerprint, kept_source, distance = match
+            removed.append(pk)
+            merges.setdefault(kept_fingerprint, set()).update([source, *merged])
+            self.stdout.write(
+                f"  [{source_type}/{language or '-'}] {source} #{pk} -> {kept_source} "
+                f"(distance {distance}): {content[:60]!r}"
+            )
+
+        if not dry_run:
+            Chunk.objects.bulk_update(fingerprinted, ["simhash"], batch_size=2000)
+            Chunk.objects.filter(pk__in=removed).delete()
+            merge_sources(source_type, language, merges)
+        return len(removed)
@@ -0,0 +1,177 @@
+import json
+import time
+from pathlib import Path
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError
+
+from chatbot.application.evaluation import latency_summary
+from chatbot.application.policies import SimilarityPolicy
+from chatbot.infrastructure.django.repositories import PgVectorChunkRepository
+
+
+def load_golden_set(path: Path) -> list[dict[str, Any]]:
+    text = path.read_text(encoding="utf-8")
+    if path.suffix.lower() in (".yaml", ".yml"):
+        try:
+            import yaml
+        except ImportError as exc:
+            raise CommandError("PyYAML is required for YAML question sets. Run: pip install pyyaml") from exc
+        data = yaml.safe_load(text)
+    else:
+        data = json.loads(text)
+
+    if isinstance(data, dict):
+        data = data.get("questions", [])
+    if not isinstance(data, list) or not data:
+        raise CommandError("Question set must be a non-empty list (or a mapping with a 'questions' list).")
+
+    questions = []
+    for index, item in enumerate(data):
+        if not isinstance(item, dict) or not item.get("question"):
+            raise CommandError(f"Entry {index} needs a 'question'.")
+        questions.append(
+            {
+                "question": item["question"],
+                "expected_sources": list(item.get("expected_sources", [])),
+                "filters": item.get("filters") or None,
+            }
+        )
+    return questions
+
+
+def ranked_sources(chunks) -> list[list[str]]:
+    """Each retrieved chunk's source followed by the sources merged into it.
+
+    A near-duplicate collapsed at ingest is served by the chunk it merged into,
+    so every source of that chunk counts as retrieved at the chunk's rank.
+    """
+    return [[chunk["source"], *chunk.get("merged_sources", [])] for chunk in chunks]
+
+
+def score_sources(ranked: list[list[str]], expected_sources, k: int) -> tuple[float, float]:
+    """recall@k and reciprocal rank as in chatbot.application.evaluation, over ranked_sources."""
+    expected = set(expected_sources)
+    if not expected:
+        return 1.0, 0.0
+    found = expected.intersection(source for sources in ranked[:k] for source in sources)
+    first = next((rank for rank, sources in enumerate(ranked, start=1) if expected.intersection(sources)), None)
+    return len(found) / min(len(expected), k), 1.0 / first if first else 0.0
+
+
+def find_regressions(current: dict[str, float], baseline: dict[str, float], options) -> list[str]:
+    regressions = []
+    for name in ("recall", "mrr"):
+        before = baseline.get(name, 0.0)
+        if before - current[name] > options["max_quality_drop"]:
+            regressions.append(f"{name} dropped {before:.3f} -> {current[name]:.3f}")
+
+    before = baseline.get("fallback_rate", 0.0)
+    if current["fallback_rate"] - before > options["max_fallback_increase"]:
+        regressions.append(f"fallback_rate rose {before:.3f} -> {current['fallback_rate']:.3f}")
+
+    base_p95 = baseline.get("p95_ms", 0.0)
+    if base_p95 and current["p95_ms"] > base_p95 * (1 + options["max_latency_increase"]):
+        regressions.append(f"p95 latency rose {base_p95:.1f}ms -> {current['p95_ms']:.1f}ms")
+    return regressions
+
+
+class Command(BaseCommand):
+    help = "Evaluate retrieval quality and latency over a golden question set."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", type=str, help="JSON or YAML question set.")
+        parser.add_argument("--k", type=int, default=4)
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=0.15,
+            help="SimilarityPolicy threshold used for the no-context fallback rate.",
+        )
+        parser.add_argument("--baseline", type=str, default=None, help="Baseline JSON to compare against.")
+        parser.add_argument(
+            "--save-baseline",
+            type=str,
+            default=None,
+            help="Write this run as a baseline JSON.",
+        )
+        parser.add_argument("--max-quality-drop", type=float, default=0.02)
+        parser.add_argument("--max-fallback-increase", type=float, default=0.05)
+        parser.add_argument(
+            "--max-latency-increase",
+            type=float,
+            default=0.5,
+            help="Allowed relative p95 latency increase (0.5 = +50%%).",
+        )
+        parser.add_argument("--verbose-queries", action="store_true", help="Print every query result.")
+
+    def handle(self, *args, **options):
+        path = Path(options["path"])
+        if not path.exists():
+            raise CommandError(f"File not found: {path}")
+
+        questions = load_golden_set(path)
+        repo = PgVectorChunkRepository()
+        policy = SimilarityPolicy(threshold=options["threshold"])
+        k = options["k"]
+
+        rows = []
+        for item in questions:
+            started = time.perf_counter()
+            chunks = list(repo.search(item["question"], k=k, filters=item["filters"]))
+            elapsed = time.perf_counter() - started
+
+            ranked = ranked_sources(chunks)
+            recall, rr = score_sources(ranked, item["expected_sources"], k)
+            row = {
+                "question": item["question"],
+                "retrieved": list(dict.fromkeys(source for sources in ranked for source in sources)),
+                "recall": recall,
+                "rr": rr,
+                "fallback": policy.is_insufficient(chunks),
+                "latency_ms": round(elapsed * 1000, 1),
+            }
+            rows.append(row)
+            if options["verbose_queries"]:
+                self.stdout.write(
+                    f"{row['latency_ms']:>8}ms recall={row['recall']:.2f} rr={row['rr']:.2f} "
+                    f"fallback={row['fallback']} {item['question']}"
+                )
+
+        latencies = [row["latency_ms"] / 1000 for row in rows]
+        metrics = {
+            "recall": sum(row["recall"] for row in rows) / len(rows),
+            "mrr": sum(row["rr"] for row in rows) / len(rows),
+            "fallback_rate": sum(row["fallback"] for row in rows) / len(rows),
+            **latency_summary(latencies),
+        }
+
+        self.stdout.write(
+            f"questions={len(rows)} k={k} threshold={options['threshold']} "
+            f"recall@{k}={metrics['recall']:.3f} mrr={metrics['mrr']:.3f} "
+            f"fallback_rate={metrics['fallback_rate']:.3f} "
+            f"p50={metrics['p50_ms']:.1f}ms p95={metrics['p95_ms']:.1f}ms"
+        )
+
+        if options["save_baseline"]:
+            baseline_path = Path(options["save_baseline"])
+            baseline_path.parent.mkdir(parents=True, exist_ok=True)
+            baseline_path.write_text(
+                json.dumps(
+                    {"k": k, "threshold": options["threshold"], "metrics": metrics, "queries": rows},
+                    indent=2,
+                    ensure_ascii=False,
+                ),
+                encoding="utf-8",
+            )
+            self.stdout.write(self.style.SUCCESS(f"Saved: {baseline_path}"))
+
+        if options["baseline"]:
+            baseline_path = Path(options["baseline"])
+            if not baseline_path.exists():
+                raise CommandError(f"Baseline not found: {baseline_path}")
+            baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+            regressions = find_regressions(metrics, baseline.get("metrics", {}), options)
+            if regressions:
+                raise CommandError("Regression against baseline:\n  " + "\n  ".join(regressions))
+            self.stdout.write(self.style.SUCCESS("No regression against baseline."))
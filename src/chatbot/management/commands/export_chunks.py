@@ -0,0 +1,46 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from chatbot.infrastructure.django.bulk import active_version, copy_supported, export_chunks, open_dump
+from chatbot.models import Chunk, SourceType
+
+
+class Command(BaseCommand):
+    help = (
+        "Export chunks with their legacy and active-version embeddings as a binary COPY file "
+        "(.gz to compress)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", type=str, help="Output file, e.g. chunks.pgcopy or chunks.pgcopy.gz.")
+        parser.add_argument("--source-type", choices=SourceType.values, default=None)
+        parser.add_argument("--document-id", type=str, default=None)
+
+    def handle(self, *args, **options):
+        if not copy_supported():
+            raise CommandError("Export needs PostgreSQL with psycopg 3.")
+
+        filters = {
+            key: options[key]
+            for key in ("source_type", "document_id")
+            if options[key]
+        }
+        path = Path(options["path"])
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open_dump(path, "wb") as out:
+            count = export_chunks(out, filters)
+        size_mb = path.stat().st_size / 1024 / 1024
+        self.stdout.write(self.style.SUCCESS(f"Exported {count} chunks to {path} ({size_mb:.1f}MB)."))
+        version = active_version()
+        if version is None:
+            missing = Chunk.objects.filter(**filters, embedding__isnull=True).count()
+            vector = "legacy vector"
+        else:
+            self.stdout.write(f"Vectors of the active embedding version {version.name} are included.")
+            missing = Chunk.objects.filter(**filters).exclude(embeddings__version=version).count()
+            vector = f"{version.name} vector"
+        if missing:
+            self.stderr.write(
+                f"{missing} exported chunks have no {vector}; import_chunks will refuse this file."
+            )
@@ -336,5 +336,6 @@ class Command(BaseCommand):
                 "ingest_document",
                 str(output_path),
                 source="github-summary",
+                source_type="github",
                 clear=options["clear"],
             )
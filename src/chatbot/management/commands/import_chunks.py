@@ -0,0 +1,91 @@
+import time
+from contextlib import nullcontext
+from pathlib import Path
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from chatbot.infrastructure.django.bulk import (
+    copy_supported,
+    deferred_vector_indexes,
+    import_chunks,
+    open_dump,
+)
+from chatbot.infrastructure.embeddings.versions import live_versions
+from chatbot.models import Chunk, EmbeddingVersion
+
+
+class Command(BaseCommand):
+    help = "Load chunks written by export_chunks without calling the embeddings API."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", type=str, help="File written by export_chunks.")
+        parser.add_argument(
+            "--clear",
+            action="store_true",
+            help="Delete existing chunks before importing.",
+        )
+        parser.add_argument(
+            "--rebuild-indexes",
+            action="store_true",
+            help=(
+                "Drop the HNSW indexes for the load and rebuild them afterwards. Much faster for "
+                "large files, but holds an ACCESS EXCLUSIVE lock on the chunk table until the "
+                "rebuild commits, so chat searches block meanwhile."
+            ),
+        )
+        parser.add_argument(
+            "--backfill",
+            action="store_true",
+            help=(
+                "Allow importing while an embedding version is backfilling or ready and run "
+                "backfill_embeddings for it afterwards (calls the embeddings API)."
+            ),
+        )
+        parser.add_argument(
+            "--no-warm",
+            action="store_true",
+            help="Skip regenerating precomputed answers for the suggested questions.",
+        )
+
+    def handle(self, *args, **options):
+        if not copy_supported():
+            raise CommandError("Import needs PostgreSQL with psycopg 3.")
+        path = Path(options["path"])
+        if not path.exists():
+            raise CommandError(f"File not found: {path}")
+
+        # Dumps carry the legacy column and the exporting database's active
+        # version, which import_chunks checks against ours. Versions still
+        # backfilling (or ready) get no vectors from the file.
+        versions = [
+            version
+            for version in live_versions()
+            if version.status != EmbeddingVersion.Status.ACTIVE
+        ]
+        if versions and not options["backfill"]:
+            names = ", ".join(version.name for version in versions)
+            raise CommandError(
+                f"Embedding version(s) {names} are live and the dump has no vectors for them. "
+                "Rerun with --backfill to embed the imported chunks for them afterwards."
+            )
+
+        started = time.perf_counter()
+        indexes = deferred_vector_indexes() if options["rebuild_indexes"] else nullcontext()
+        with transaction.atomic(), open_dump(path, "rb") as source:
+            if options["clear"]:
+                Chunk.objects.all().delete()
+            with indexes:
+                try:
+                    count = import_chunks(source)
+                except ValueError as exc:
+                    raise CommandError(str(exc)) from exc
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Imported {count} chunks in {time.perf_counter() - started:.1f}s.")
+        )
+        for version in versions:
+            call_command("backfill_embeddings", version.name, no_warm=True, stdout=self.stdout)
+        if not options["no_warm"]:
+            call_command("warm_answers", stdout=self.stdout)
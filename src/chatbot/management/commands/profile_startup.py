@@ -0,0 +1,80 @@
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# What a fresh worker does before it can answer its first request.
+STARTUP_SCRIPT = """
+import django
+from django.conf import settings
+from django.urls import get_resolver
+
+django.setup()
+from {wsgi_module} import application
+get_resolver().url_patterns
+"""
+
+
+def parse_importtime(stderr: str) -> list[tuple[str, int, int]]:
+    """Return (module, self_us, cumulative_us) rows from `-X importtime` output."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue
+        rows.append((parts[2].strip(), int(parts[0]), int(parts[1])))
+    return rows
+
+
+class Command(BaseCommand):
+    help = "Profile cold start: per-module import time up to a loaded URLconf."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--limit", type=int, default=25, help="Modules to list.")
+        parser.add_argument(
+            "--runs",
+            type=int,
+            default=1,
+            help="Fresh interpreters to start; wall time is reported for each.",
+        )
+
+    def handle(self, *args, **options):
+        wsgi_module = settings.WSGI_APPLICATION.rsplit(".", 1)[0]
+        script = STARTUP_SCRIPT.format(wsgi_module=wsgi_module)
+
+        walls = []
+        stderr = ""
+        for _ in range(max(1, options["runs"])):
+            started = time.perf_counter()
+            proc = subprocess.run(
+                [sys.executable, "-X", "importtime", "-c", script],
+                cwd=settings.BASE_DIR,
+                capture_output=True,
+                text=True,
+            )
+            walls.append(time.perf_counter() - started)
+            if proc.returncode != 0:
+                raise CommandError(f"Startup failed:\n{proc.stderr[-2000:]}")
+            stderr = proc.stderr
+
+        rows = parse_importtime(stderr)
+        packages: dict[str, int] = {}
+        for module, self_us, _ in rows:
+            package = module.split(".")[0]
+            packages[package] = packages.get(package, 0) + self_us
+
+        self.stdout.write(
+            f"startup wall: {', '.join(f'{wall * 1000:.0f}ms' for wall in walls)} "
+            f"(imports: {sum(self_us for _, self_us, _ in rows) / 1000:.0f}ms, {len(rows)} modules)"
+        )
+        self.stdout.write("\nBy top-level package (self time):")
+        for package, total in sorted(packages.items(), key=lambda item: -item[1])[: options["limit"]]:
+            self.stdout.write(f"  {total / 1000:>8.1f}ms  {package}")
+
+        self.stdout.write("\nSlowest modules (cumulative):")
+        for module, _, cumulative in sorted(rows, key=lambda row: -row[2])[: options["limit"]]:
+            self.stdout.write(f"  {cumulative / 1000:>8.1f}ms  {module}")
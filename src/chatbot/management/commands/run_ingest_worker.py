@@ -0,0 +1,60 @@
+import os
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from chatbot.infrastructure.ingestion.jobs import claim_next_job, run_job
+
+
+class Command(BaseCommand):
+    help = "Process queued ingest jobs (load, chunk, embed, store)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=settings.INGEST_WORKER_CONCURRENCY,
+            help="Jobs processed in parallel by this worker.",
+        )
+        parser.add_argument("--poll-interval", type=float, default=2.0, help="Seconds between idle polls.")
+        parser.add_argument("--once", action="store_true", help="Exit when the queue is empty.")
+
+    def handle(self, *args, **options):
+        worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        stop = threading.Event()
+        self.stdout.write(f"Ingest worker {worker_id} running {options['concurrency']} slot(s).")
+
+        def loop(slot: int) -> None:
+            slot_id = f"{worker_id}:{slot}"
+            try:
+                while not stop.is_set():
+                    job = claim_next_job(slot_id)
+                    if job is None:
+                        if options["once"]:
+                            return
+                        stop.wait(options["poll_interval"])
+                        continue
+                    self.stdout.write(f"[{slot_id}] job {job.pk}: {job.filename} (attempt {job.attempts})")
+                    started = time.monotonic()
+                    run_job(job)
+                    job.refresh_from_db(fields=["status", "done_chunks", "total_chunks"])
+                    self.stdout.write(
+                        f"[{slot_id}] job {job.pk}: {job.status} "
+                        f"{job.done_chunks}/{job.total_chunks} chunks in {time.monotonic() - started:.1f}s"
+                    )
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=options["concurrency"]) as pool:
+            futures = [pool.submit(loop, slot) for slot in range(options["concurrency"])]
+            try:
+                for future in futures:
+                    future.result()
+            except KeyboardInterrupt:
+                stop.set()
+                self.stdout.write("Stopping after in-flight jobs finish...")
@@ -0,0 +1,24 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from chatbot.infrastructure.django.canned_answers import warm_canned_answers
+
+
+class Command(BaseCommand):
+    help = "Precompute answers for the suggested chat questions."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Regenerate every answer even if its retrieved context is unchanged.",
+        )
+
+    def handle(self, *args, **options):
+        if not settings.CHAT_SUGGESTED_QUESTIONS:
+            self.stdout.write("No suggested questions configured.")
+            return
+        counts = warm_canned_answers(force=options["force"])
+        message = ", ".join(f"{name}={value}" for name, value in counts.items())
+        style = self.style.WARNING if counts["failed"] else self.style.SUCCESS
+        self.stdout.write(style(f"Warmed answers: {message}"))
@@ -0,0 +1,75 @@
+from django.db import migrations, models
+
+from chatbot.infrastructure.django.indexes import PostgresHnswIndex
+
+
+def backfill_source_type(apps, schema_editor):
+    Chunk = apps.get_model("chatbot", "Chunk")
+    Chunk.objects.filter(source="github-summary").update(source_type="github")
+    Chunk.objects.filter(source__icontains="resume").update(source_type="resume")
+
+
+def hnsw(name, condition=None):
+    return PostgresHnswIndex(
+        name=name,
+        fields=["embedding"],
+        m=16,
+        ef_construction=64,
+        opclasses=["vector_cosine_ops"],
+        condition=condition,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("chatbot", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="chunk",
+            name="source_type",
+            field=models.CharField(
+                choices=[("resume", "Résumé"), ("github", "GitHub summary"), ("document", "Document")],
+                default="document",
+                max_length=32,
+            ),
+        ),
+        migrations.AddField(
+            model_name="chunk",
+            name="document_id",
+            field=models.CharField(blank=True, default="", max_length=255),
+        ),
+        migrations.AddField(
+            model_name="chunk",
+            name="page",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="chunk",
+            name="language",
+            field=models.CharField(blank=True, default="", max_length=16),
+        ),
+        migrations.RunPython(backfill_source_type, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="chunk",
+            index=models.Index(fields=["source_type", "document_id"], name="chunk_type_document_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="chunk",
+            index=models.Index(fields=["language", "source_type"], name="chunk_language_type_idx"),
+        ),
+        migrations.AddIndex(model_name="chunk", index=hnsw("chunk_embedding_hnsw")),
+        migrations.AddIndex(
+            model_name="chunk",
+            index=hnsw("chunk_embedding_resume_hnsw", models.Q(source_type="resume")),
+        ),
+        migrations.AddIndex(
+            model_name="chunk",
+            index=hnsw("chunk_embedding_github_hnsw", models.Q(source_type="github")),
+        ),
+        migrations.AddIndex(
+            model_name="chunk",
+            index=hnsw("chunk_embedding_document_hnsw", models.Q(source_type="document")),
+        ),
+    ]
@@ -0,0 +1,39 @@
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("chatbot", "0002_chunk_metadata"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="IngestJob",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("filename", models.CharField(max_length=255)),
+                ("content", models.BinaryField()),
+                ("source", models.CharField(max_length=255)),
+                ("source_type", models.CharField(choices=[("resume", "Résumé"), ("github", "GitHub summary"), ("document", "Document")], default="document", max_length=32)),
+                ("document_id", models.CharField(blank=True, default="", max_length=255)),
+                ("language", models.CharField(blank=True, default="", max_length=16)),
+                ("clear", models.BooleanField(default=False)),
+                ("status", models.CharField(choices=[("pending", "Pending"), ("running", "Running"), ("succeeded", "Succeeded"), ("failed", "Failed")], default="pending", max_length=16)),
+                ("total_chunks", models.PositiveIntegerField(default=0)),
+                ("done_chunks", models.PositiveIntegerField(default=0)),
+                ("attempts", models.PositiveIntegerField(default=0)),
+                ("last_error", models.TextField(blank=True, default="")),
+                ("run_after", models.DateTimeField(default=django.utils.timezone.now)),
+                ("locked_by", models.CharField(blank=True, default="", max_length=64)),
+                ("locked_at", models.DateTimeField(blank=True, null=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("finished_at", models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                "ordering": ["-created_at"],
+                "indexes": [models.Index(fields=["status", "run_after"], name="ingestjob_status_run_idx")],
+            },
+        ),
+    ]
@@ -0,0 +1,22 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("chatbot", "0003_ingestjob"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CannedAnswer",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("normalized", models.CharField(max_length=500, unique=True)),
+                ("question", models.CharField(max_length=500)),
+                ("answer", models.TextField()),
+                ("sources", models.JSONField(default=list)),
+                ("fingerprint", models.CharField(max_length=64)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,29 @@
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+from chatbot.infrastructure.django.indexes import PostgresGinIndex
+
+
+def trigram(field, name):
+    return PostgresGinIndex(
+        django.contrib.postgres.indexes.OpClass(
+            django.db.models.functions.text.Upper(field),
+            name="gin_trgm_ops",
+        ),
+        name=name,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("chatbot", "0004_cannedanswer"),
+    ]
+
+    operations = [
+        # A no-op outside PostgreSQL, like every CreateExtension.
+        TrigramExtension(),
+        migrations.AddIndex(model_name="chunk", index=trigram("source", "chunk_source_trgm")),
+        migrations.AddIndex(model_name="chunk", index=trigram("content", "chunk_content_trgm")),
+    ]
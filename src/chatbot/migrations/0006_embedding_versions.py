@@ -0,0 +1,79 @@
+import django.db.models.deletion
+import pgvector.django
+from django.db import migrations, models
+
+CASCADE_FOREIGN_KEYS = """
+ALTER TABLE chatbot_chunkembedding
+    ADD CONSTRAINT chunkembedding_chunk_fk FOREIGN KEY (chunk_id)
+        REFERENCES chatbot_chunk (id) ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED,
+    ADD CONSTRAINT chunkembedding_version_fk FOREIGN KEY (version_id)
+        REFERENCES chatbot_embeddingversion (id) ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED;
+"""
+
+DROP_FOREIGN_KEYS = """
+ALTER TABLE chatbot_chunkembedding
+    DROP CONSTRAINT chunkembedding_chunk_fk,
+    DROP CONSTRAINT chunkembedding_version_fk;
+"""
+
+
+def add_cascading_foreign_keys(apps, schema_editor):
+    # SQLite cannot add constraints to an existing table; the dev fallback
+    # goes without the cascade.
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(CASCADE_FOREIGN_KEYS)
+
+
+def drop_cascading_foreign_keys(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(DROP_FOREIGN_KEYS)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("chatbot", "0005_chunk_trgm"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="chunk",
+            name="embedding",
+            field=pgvector.django.VectorField(blank=True, dimensions=1536, null=True),
+        ),
+        migrations.CreateModel(
+            name="EmbeddingVersion",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("name", models.SlugField(max_length=64, unique=True)),
+                ("model", models.CharField(max_length=100)),
+                ("dimensions", models.PositiveIntegerField()),
+                ("status", models.CharField(choices=[("backfilling", "Backfilling"), ("ready", "Ready"), ("active", "Active"), ("retired", "Retired")], default="backfilling", max_length=16)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("activated_at", models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        condition=models.Q(("status", "active")),
+                        fields=("status",),
+                        name="embeddingversion_single_active",
+                    ),
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="ChunkEmbedding",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("embedding", pgvector.django.VectorField()),
+                ("chunk", models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name="embeddings", to="chatbot.chunk")),
+                ("version", models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name="embeddings", to="chatbot.embeddingversion")),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(fields=("version", "chunk"), name="chunkembedding_version_chunk_uniq"),
+                ],
+            },
+        ),
+        migrations.RunPython(add_cascading_foreign_keys, drop_cascading_foreign_keys),
+    ]
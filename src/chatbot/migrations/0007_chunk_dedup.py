@@ -0,0 +1,20 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("chatbot", "0006_embedding_versions"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="chunk",
+            name="simhash",
+            field=models.BigIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="chunk",
+            name="merged_sources",
+            field=models.JSONField(blank=True, default=list),
+        ),
+    ]
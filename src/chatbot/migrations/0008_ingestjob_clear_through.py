@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("chatbot", "0007_chunk_dedup"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="ingestjob",
+            name="clear_through",
+            field=models.BigIntegerField(blank=True, editable=False, null=True),
+        ),
+    ]
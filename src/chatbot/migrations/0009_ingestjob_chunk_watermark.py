@@ -0,0 +1,15 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("chatbot", "0008_ingestjob_clear_through"),
+    ]
+
+    operations = [
+        migrations.RenameField(
+            model_name="ingestjob",
+            old_name="clear_through",
+            new_name="chunk_watermark",
+        ),
+    ]
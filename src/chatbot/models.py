@@ -1,12 +1,195 @@
+from django.contrib.postgres.indexes import OpClass
 from django.db import models
+from django.db.models.functions import Upper
+from django.utils import timezone
 from pgvector.django import VectorField
 
+from chatbot.infrastructure.django.indexes import PostgresGinIndex, PostgresHnswIndex
+
+
+class SourceType(models.TextChoices):
+    RESUME = "resume", "Résumé"
+    GITHUB = "github", "GitHub summary"
+    DOCUMENT = "document", "Document"
+
+
+class ChunkQuerySet(models.QuerySet):
+    def without_embedding(self):
+        # The vector is ~6KB per row; only similarity search needs it.
+        return self.defer("embedding")
+
 
 class Chunk(models.Model):
     content = models.TextField()
     source = models.CharField(max_length=255)
-    embedding = VectorField(dimensions=1536)
+    source_type = models.CharField(
+        max_length=32,
+        choices=SourceType.choices,
+        default=SourceType.DOCUMENT,
+    )
+    document_id = models.CharField(max_length=255, blank=True, default="")
+    page = models.PositiveIntegerField(null=True, blank=True)
+    language = models.CharField(max_length=16, blank=True, default="")
+    # Legacy single-model column, read while no EmbeddingVersion is active.
+    embedding = VectorField(dimensions=1536, null=True, blank=True)
+    # SimHash of the text; ingestion collapses near-duplicates into this chunk
+    # and records the other sources they came from in merged_sources.
+    simhash = models.BigIntegerField(null=True, blank=True, editable=False)
+    merged_sources = models.JSONField(default=list, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = ChunkQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["source_type", "document_id"], name="chunk_type_document_idx"),
+            # Match the UPPER(col) LIKE UPPER('%term%') that icontains (and so
+            # admin search over source OR content) compiles to on PostgreSQL.
+            PostgresGinIndex(OpClass(Upper("source"), name="gin_trgm_ops"), name="chunk_source_trgm"),
+            PostgresGinIndex(OpClass(Upper("content"), name="gin_trgm_ops"), name="chunk_content_trgm"),
+            models.Index(fields=["language", "source_type"], name="chunk_language_type_idx"),
+            PostgresHnswIndex(
+                name="chunk_embedding_hnsw",
+                fields=["embedding"],
+                m=16,
+                ef_construction=64,
+                opclasses=["vector_cosine_ops"],
+            ),
+            # One small graph per source type so a type filter is planned as a
+            # plain index scan instead of filtering the global graph.
+            *[
+                PostgresHnswIndex(
+                    name=f"chunk_embedding_{value}_hnsw",
+                    fields=["embedding"],
+                    m=16,
+                    ef_construction=64,
+                    opclasses=["vector_cosine_ops"],
+                    condition=models.Q(source_type=value),
+                )
+                for value in SourceType.values
+            ],
+        ]
+
     def __str__(self):
         return f"{self.source}: {self.content[:40]}"
+
+
+class EmbeddingVersion(models.Model):
+    """An embedding model/dimension pair whose vectors live in ChunkEmbedding."""
+
+    class Status(models.TextChoices):
+        BACKFILLING = "backfilling", "Backfilling"
+        READY = "ready", "Ready"
+        ACTIVE = "active", "Active"
+        RETIRED = "retired", "Retired"
+
+    name = models.SlugField(max_length=64, unique=True)
+    model = models.CharField(max_length=100)
+    dimensions = models.PositiveIntegerField()
+    status = models.CharField(max_length=16, choices=Status.choices, default=Status.BACKFILLING)
+    created_at = models.DateTimeField(auto_now_add=True)
+    activated_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["status"],
+                condition=models.Q(status="active"),
+                name="embeddingversion_single_active",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.model}, {self.dimensions}d, {self.status})"
+
+    @property
+    def index_name(self) -> str:
+        return f"chunkembedding_v{self.pk}_hnsw"
+
+
+class ChunkEmbedding(models.Model):
+    # ON DELETE CASCADE lives in the database (see migration 0006) so deleting
+    # chunks stays a single fast DELETE instead of loading every row first.
+    chunk = models.ForeignKey(
+        Chunk,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="embeddings",
+    )
+    version = models.ForeignKey(
+        EmbeddingVersion,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="embeddings",
+    )
+    # No fixed dimensions: each version gets a partial expression HNSW index
+    # on embedding::vector(dimensions), created by backfill_embeddings.
+    embedding = VectorField()
+
+    objects = ChunkQuerySet.as_manager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["version", "chunk"], name="chunkembedding_version_chunk_uniq"),
+        ]
+
+
+class CannedAnswer(models.Model):
+    """Precomputed answer for a suggested question, keyed by its normalized text."""
+
+    normalized = models.CharField(max_length=500, unique=True)
+    question = models.CharField(max_length=500)
+    answer = models.TextField()
+    sources = models.JSONField(default=list)
+    fingerprint = models.CharField(max_length=64)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return self.question
+
+
+class IngestJob(models.Model):
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        RUNNING = "running", "Running"
+        SUCCEEDED = "succeeded", "Succeeded"
+        FAILED = "failed", "Failed"
+
+    filename = models.CharField(max_length=255)
+    content = models.BinaryField()
+    source = models.CharField(max_length=255)
+    source_type = models.CharField(
+        max_length=32,
+        choices=SourceType.choices,
+        default=SourceType.DOCUMENT,
+    )
+    document_id = models.CharField(max_length=255, blank=True, default="")
+    language = models.CharField(max_length=16, blank=True, default="")
+    clear = models.BooleanField(default=False)
+    # Highest chunk id when the job first ran. Chunks of this document above it
+    # are the job's own and are deleted if it fails for good; a clearing job
+    # deletes the chunks up to it only once it succeeds, so the site never
+    # serves a partial store.
+    chunk_watermark = models.BigIntegerField(null=True, blank=True, editable=False)
+
+    status = models.CharField(max_length=16, choices=Status.choices, default=Status.PENDING)
+    total_chunks = models.PositiveIntegerField(default=0)
+    done_chunks = models.PositiveIntegerField(default=0)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True, default="")
+    run_after = models.DateTimeField(default=timezone.now)
+    locked_by = models.CharField(max_length=64, blank=True, default="")
+    locked_at = models.DateTimeField(null=True, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "run_after"], name="ingestjob_status_run_idx"),
+        ]
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"{self.filename} ({self.status})"
@@ -0,0 +1 @@
+"""Request tracing and metrics."""
@@ -0,0 +1,134 @@
+import bisect
+import threading
+from collections import defaultdict
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _format_labels(labels: tuple[tuple[str, str], ...]) -> str:
+    if not labels:
+        return ""
+    inner = ",".join(f'{key}="{value}"' for key, value in labels)
+    return "{" + inner + "}"
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help_text = help_text
+        self._values: dict[tuple, float] = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[key] += amount
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for labels, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(labels)} {value}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(sorted(buckets))
+        self._counts: dict[tuple, list[int]] = {}
+        self._sums: dict[tuple, float] = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._counts.setdefault(key, [0] * (len(self.buckets) + 1))
+            counts[index] += 1
+            self._sums[key] += value
+
+    def count(self, **labels: str) -> int:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            return sum(self._counts.get(key, []))
+
+    def quantile(self, q: float, **labels: str) -> float | None:
+        """Upper bucket bound covering the q-th observation, if any."""
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            counts = list(self._counts.get(key, []))
+        total = sum(counts)
+        if not total:
+            return None
+        target = q * total
+        seen = 0
+        for bound, count in zip(self.buckets, counts):
+            seen += count
+            if seen >= target:
+                return bound
+        return self.buckets[-1]
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for labels, counts in sorted(self._counts.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets, counts):
+                    cumulative += count
+                    bucket_labels = labels + (("le", repr(bound)),)
+                    lines.append(f"{self.name}_bucket{_format_labels(bucket_labels)} {cumulative}")
+                cumulative += counts[-1]
+                lines.append(f"{self.name}_bucket{_format_labels(labels + (('le', '+Inf'),))} {cumulative}")
+                lines.append(f"{self.name}_sum{_format_labels(labels)} {self._sums[labels]}")
+                lines.append(f"{self.name}_count{_format_labels(labels)} {cumulative}")
+        return lines
+
+
+class Registry:
+    """In-process metric registry; each gunicorn worker exposes its own."""
+
+    def __init__(self):
+        self._metrics: dict[str, Counter | Histogram] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, help_text: str) -> Counter:
+        with self._lock:
+            return self._metrics.setdefault(name, Counter(name, help_text))
+
+    def histogram(self, name: str, help_text: str, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        with self._lock:
+            return self._metrics.setdefault(name, Histogram(name, help_text, buckets))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: list[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+REQUEST_DURATION = REGISTRY.histogram(
+    "http_request_duration_seconds",
+    "Time spent serving a request.",
+)
+STAGE_DURATION = REGISTRY.histogram(
+    "chat_stage_duration_seconds",
+    "Time spent in each stage of the chat pipeline.",
+)
+TOKENS = REGISTRY.counter(
+    "openai_tokens_total",
+    "Tokens reported by the OpenAI API.",
+)
+CACHE_LOOKUPS = REGISTRY.counter(
+    "chat_cache_lookups_total",
+    "Cache lookups on the chat path, by cache and outcome.",
+)
+UPSTREAM_CALLS = REGISTRY.counter(
+    "upstream_calls_total",
+    "Calls to external APIs, by upstream and outcome.",
+)
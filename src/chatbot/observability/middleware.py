@@ -0,0 +1,59 @@
+import json
+import logging
+
+from django.contrib.sessions.middleware import SessionMiddleware
+
+from chatbot.observability.metrics import REQUEST_DURATION
+from chatbot.observability.tracing import stage, start_trace
+
+logger = logging.getLogger("chatbot.timing")
+
+
+class RequestTimingMiddleware:
+    """Trace each request, emit Server-Timing and a structured timing log."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with start_trace() as trace:
+            response = self.get_response(request)
+            elapsed = trace.elapsed()
+
+        match = getattr(request, "resolver_match", None)
+        route = match.route if match else "unmatched"
+        REQUEST_DURATION.observe(
+            elapsed,
+            route=route,
+            method=request.method,
+            status=str(response.status_code),
+        )
+        response["Server-Timing"] = trace.server_timing()
+
+        if trace.stages:
+            logger.info(
+                json.dumps(
+                    {
+                        "event": "request_timing",
+                        "method": request.method,
+                        "path": request.path,
+                        "status": response.status_code,
+                        "duration_ms": round(elapsed * 1000, 1),
+                        "stages_ms": {
+                            name: round(seconds * 1000, 1)
+                            for name, seconds in trace.stages.items()
+                        },
+                        **trace.attributes,
+                    },
+                    default=str,
+                )
+            )
+        return response
+
+
+class TimedSessionMiddleware(SessionMiddleware):
+    def process_response(self, request, response):
+        if not request.session.modified:
+            return super().process_response(request, response)
+        with stage("session_save"):
+            return super().process_response(request, response)
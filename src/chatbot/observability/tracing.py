@@ -0,0 +1,92 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from chatbot.observability.metrics import CACHE_LOOKUPS, STAGE_DURATION, TOKENS
+
+
+class RequestTrace:
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.stages: dict[str, float] = {}
+        self.attributes: dict[str, object] = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            self.stages[name] = self.stages.get(name, 0.0) + elapsed
+            STAGE_DURATION.observe(elapsed, stage=name)
+
+    def annotate(self, **attributes: object) -> None:
+        self.attributes.update(attributes)
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started_at
+
+    def server_timing(self) -> str:
+        entries = [f"{name};dur={seconds * 1000:.1f}" for name, seconds in self.stages.items()]
+        entries.append(f"total;dur={self.elapsed() * 1000:.1f}")
+        return ", ".join(entries)
+
+
+_current_trace: ContextVar[RequestTrace | None] = ContextVar("chatbot_trace", default=None)
+
+
+@contextmanager
+def start_trace():
+    trace = RequestTrace()
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _current_trace.reset(token)
+
+
+def current_trace() -> RequestTrace | None:
+    return _current_trace.get()
+
+
+@contextmanager
+def stage(name: str):
+    """Time a pipeline stage; still feeds the histogram outside a request."""
+    trace = current_trace()
+    if trace is None:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            STAGE_DURATION.observe(time.perf_counter() - started, stage=name)
+        return
+    with trace.stage(name):
+        yield
+
+
+def annotate(**attributes: object) -> None:
+    trace = current_trace()
+    if trace is not None:
+        trace.annotate(**attributes)
+
+
+def record_tokens(model: str, usage) -> None:
+    if usage is None:
+        return
+    prompt = getattr(usage, "prompt_tokens", 0) or 0
+    completion = getattr(usage, "completion_tokens", 0) or 0
+    TOKENS.inc(prompt, model=model, kind="prompt")
+    if completion:
+        TOKENS.inc(completion, model=model, kind="completion")
+    trace = current_trace()
+    if trace is not None:
+        tokens = trace.attributes.setdefault("tokens", {})
+        tokens[f"{model}:prompt"] = tokens.get(f"{model}:prompt", 0) + prompt
+        if completion:
+            tokens[f"{model}:completion"] = tokens.get(f"{model}:completion", 0) + completion
+
+
+def record_cache(name: str, hit: bool) -> None:
+    CACHE_LOOKUPS.inc(cache=name, outcome="hit" if hit else "miss")
+    annotate(**{f"{name}_cache_hit": hit})
@@ -0,0 +1,79 @@
+import uuid
+from unittest import mock, skipUnless
+
+import numpy as np
+from django.core.cache import cache
+from django.db import connection
+
+from chatbot.application.policies import SimilarityPolicy
+from chatbot.application.use_cases.ask_question import AskQuestionUseCase
+from chatbot.infrastructure.embeddings.hash_embedder import HashEmbedder
+from chatbot.infrastructure.llm.fake_client import FakeLLMClient
+from chatbot.infrastructure.memory.repositories import InMemoryVectorChunkRepository
+from chatbot.interface.api.views import ChatView
+from chatbot.models import Chunk
+from chatbot.observability import middleware
+
+CHUNKS = [
+    ("python django postgres", "backend.md", {"source_type": "resume", "language": "en"}),
+    ("hiking photography travel", "hobbies.md", {"source_type": "document", "language": "en"}),
+    ("react typescript frontend", "frontend.md", {"source_type": "resume", "language": "en"}),
+]
+
+# Vector search, COPY and the replica checks need the real database.
+postgres_only = skipUnless(connection.vendor == "postgresql", "needs PostgreSQL with pgvector")
+
+
+def fake_repository(embedder: HashEmbedder | None = None) -> InMemoryVectorChunkRepository:
+    embedder = embedder or HashEmbedder(64)
+    return InMemoryVectorChunkRepository(
+        embedder,
+        [content for content, _, _ in CHUNKS],
+        [source for _, source, _ in CHUNKS],
+        np.stack([embedder.embed_array(content) for content, _, _ in CHUNKS]),
+        metadata=[metadata for _, _, metadata in CHUNKS],
+    )
+
+
+def create_chunks(embedder: HashEmbedder, rows=CHUNKS) -> list[Chunk]:
+    """Store (content, source, fields) rows with legacy HashEmbedder vectors."""
+    return Chunk.objects.bulk_create(
+        Chunk(content=content, source=source, embedding=embedder.embed(content), **fields)
+        for content, source, fields in rows
+    )
+
+
+class ChatAPIMixin:
+    """Post to the real /api/chat/ view with the RAG pipeline and siteverify faked."""
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.repo = fake_repository()
+        self.llm = FakeLLMClient()
+        self.use_case = AskQuestionUseCase(self.repo, self.llm, SimilarityPolicy(threshold=0.15))
+        self.siteverify = self.patch(
+            "chatbot.interface.api.recaptcha.verify_recaptcha",
+            return_value=(True, ""),
+        )
+        self.patch_object(ChatView, "get_use_case", return_value=self.use_case)
+        self.patch_object(middleware.logger, "disabled", new=True)
+
+    def patch(self, target: str, **kwargs):
+        return self._start(mock.patch(target, **kwargs))
+
+    def patch_object(self, target, attribute: str, **kwargs):
+        return self._start(mock.patch.object(target, attribute, **kwargs))
+
+    def _start(self, patcher):
+        self.addCleanup(patcher.stop)
+        return patcher.start()
+
+    def chat(self, query: str = "django postgres", token: str | None = None, client=None, **data):
+        payload = {
+            "query": query,
+            "recaptcha_token": token or uuid.uuid4().hex,
+            "recaptcha_action": "chat",
+            **data,
+        }
+        return (client or self.client).post("/api/chat/", payload, content_type="application/json")
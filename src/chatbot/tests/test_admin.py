@@ -0,0 +1,104 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from chatbot.infrastructure.embeddings.hash_embedder import HashEmbedder
+from chatbot.models import Chunk, ChunkEmbedding, EmbeddingVersion
+from chatbot.tests.helpers import create_chunks, postgres_only
+
+CHANGELIST = "/admin/chatbot/chunk/"
+
+
+class AdminMixin:
+    def setUp(self):
+        super().setUp()
+        # The active embedding version is cached.
+        cache.clear()
+        admin = get_user_model().objects.create_superuser("admin", "admin@example.com", "pw")
+        self.client.force_login(admin)
+        self.embedder = HashEmbedder(1536)
+        self.chunks = create_chunks(self.embedder)
+
+
+class ChunkAdminTests(AdminMixin, TestCase):
+    def chunk_selects(self, path: str, **params) -> list[str]:
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(path, params)
+        self.assertEqual(response.status_code, 200)
+        return [query["sql"] for query in queries if 'FROM "chatbot_chunk"' in query["sql"]]
+
+    def test_changelist_never_loads_the_vectors(self):
+        for sql in self.chunk_selects(CHANGELIST):
+            self.assertNotIn('"chatbot_chunk"."embedding"', sql)
+
+    def test_search_skips_the_full_result_count(self):
+        response = self.client.get(CHANGELIST, {"q": "django"})
+        self.assertContains(response, "backend.md")
+        self.assertNotContains(response, "hobbies.md")
+        counts = [sql for sql in self.chunk_selects(CHANGELIST, q="django") if "COUNT(" in sql]
+        # Only the filtered count runs; the unfiltered total is not shown.
+        self.assertEqual(len(counts), 1)
+        self.assertIn("WHERE", counts[0])
+
+    def test_change_form_hides_the_embedding(self):
+        response = self.client.get(f"{CHANGELIST}{self.chunks[0].pk}/change/")
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("embedding", response.context["adminform"].form.fields)
+
+    def test_nearest_neighbours_needs_exactly_one_chunk(self):
+        response = self.client.post(
+            CHANGELIST,
+            {"action": "nearest_neighbours", "_selected_action": [chunk.pk for chunk in self.chunks]},
+            follow=True,
+        )
+        self.assertContains(response, "Select exactly one chunk.")
+
+    def test_versioned_models_cannot_be_added_by_hand(self):
+        for model in ("embeddingversion", "cannedanswer", "ingestjob"):
+            with self.subTest(model=model):
+                self.assertEqual(self.client.get(f"/admin/chatbot/{model}/").status_code, 200)
+                self.assertEqual(self.client.get(f"/admin/chatbot/{model}/add/").status_code, 403)
+
+
+@postgres_only
+class NearestNeighbourTests(AdminMixin, TestCase):
+    def neighbours(self, chunk: Chunk):
+        response = self.client.post(
+            CHANGELIST,
+            {"action": "nearest_neighbours", "_selected_action": [chunk.pk]},
+        )
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_uses_the_legacy_column_without_an_active_version(self):
+        response = self.neighbours(self.chunks[0])
+        self.assertContains(response, "legacy column")
+        neighbours = [row["chunk"].pk for row in response.context["neighbours"]]
+        self.assertCountEqual(neighbours, [chunk.pk for chunk in self.chunks[1:]])
+        scores = [row["score"] for row in response.context["neighbours"]]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+
+    def test_uses_the_active_version(self):
+        version = EmbeddingVersion.objects.create(
+            name="v2",
+            model="hash",
+            dimensions=64,
+            status=EmbeddingVersion.Status.ACTIVE,
+        )
+        embedder = HashEmbedder(64)
+        ChunkEmbedding.objects.bulk_create(
+            ChunkEmbedding(chunk=chunk, version=version, embedding=embedder.embed(chunk.content))
+            for chunk in self.chunks[:2]
+        )
+        response = self.neighbours(self.chunks[0])
+        self.assertContains(response, "v2 (hash, 64d)")
+        self.assertEqual([row["chunk"].pk for row in response.context["neighbours"]], [self.chunks[1].pk])
+
+        response = self.client.post(
+            CHANGELIST,
+            {"action": "nearest_neighbours", "_selected_action": [self.chunks[2].pk]},
+            follow=True,
+        )
+        self.assertContains(response, "has no embedding yet")
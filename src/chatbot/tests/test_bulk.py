@@ -0,0 +1,157 @@
+import tempfile
+from io import BytesIO, StringIO
+from pathlib import Path
+
+import numpy as np
+
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase
+
+from chatbot.infrastructure.django.bulk import copy_supported, import_chunks, insert_chunks
+from chatbot.infrastructure.embeddings.hash_embedder import HashEmbedder
+from chatbot.models import Chunk, ChunkEmbedding, EmbeddingVersion
+from chatbot.tests.helpers import CHUNKS, create_chunks, postgres_only
+
+
+def snapshot() -> list[tuple]:
+    return list(
+        Chunk.objects.order_by("content").values_list("content", "source", "source_type", "language", "embedding")
+    )
+
+
+class InsertChunksTests(TestCase):
+    def test_inserts_with_the_vectors_on_any_backend(self):
+        embedder = HashEmbedder(1536)
+        chunks = [
+            Chunk(content=content, source=source, embedding=embedder.embed(content), **fields)
+            for content, source, fields in CHUNKS
+        ]
+        self.assertEqual(insert_chunks(chunks, assign_pks=copy_supported()), 3)
+        stored = Chunk.objects.get(source="hobbies.md")
+        self.assertEqual(stored.content, "hiking photography travel")
+        np.testing.assert_allclose(np.asarray(stored.embedding), embedder.embed_array(stored.content), rtol=1e-6)
+
+    @postgres_only
+    def test_assigned_ids_match_the_stored_rows(self):
+        chunks = [Chunk(content=content, source=source) for content, source, _ in CHUNKS]
+        insert_chunks(chunks, assign_pks=True)
+        self.assertEqual(
+            {chunk.pk: chunk.source for chunk in chunks},
+            dict(Chunk.objects.values_list("pk", "source")),
+        )
+
+
+@postgres_only
+class CopyRoundTripTests(TestCase):
+    def setUp(self):
+        create_chunks(HashEmbedder(1536))
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = Path(tmp.name)
+
+    def export(self, name: str = "chunks.pgcopy.gz", **options) -> Path:
+        path = self.dir / name
+        self.stderr = StringIO()
+        call_command("export_chunks", str(path), stdout=StringIO(), stderr=self.stderr, **options)
+        return path
+
+    def activate(self, name: str = "v2", embedded: int = 3) -> EmbeddingVersion:
+        EmbeddingVersion.objects.filter(status=EmbeddingVersion.Status.ACTIVE).update(
+            status=EmbeddingVersion.Status.RETIRED
+        )
+        version = EmbeddingVersion.objects.create(
+            name=name,
+            model="hash",
+            dimensions=64,
+            status=EmbeddingVersion.Status.ACTIVE,
+        )
+        embedder = HashEmbedder(64)
+        ChunkEmbedding.objects.bulk_create(
+            ChunkEmbedding(chunk=chunk, version=version, embedding=embedder.embed(chunk.content))
+            for chunk in Chunk.objects.order_by("pk")[:embedded]
+        )
+        return version
+
+    def version_vectors(self, version: EmbeddingVersion) -> dict[str, list[float]]:
+        return {
+            content: list(embedding)
+            for content, embedding in ChunkEmbedding.objects
+            .filter(version=version)
+            .values_list("chunk__content", "embedding")
+        }
+
+    def load(self, path: Path, **options) -> str:
+        out = StringIO()
+        call_command("import_chunks", str(path), no_warm=True, stdout=out, **options)
+        return out.getvalue()
+
+    def test_round_trip_restores_every_column(self):
+        before = snapshot()
+        path = self.export()
+        self.assertIn("Imported 3 chunks", self.load(path, clear=True))
+        self.assertEqual(snapshot(), before)
+
+    def test_import_appends_unless_cleared(self):
+        path = self.export("chunks.pgcopy", source_type="document")
+        self.load(path)
+        self.assertEqual(Chunk.objects.filter(source="hobbies.md").count(), 2)
+        self.assertEqual(Chunk.objects.count(), 4)
+
+    def test_rebuilding_the_indexes_restores_them(self):
+        path = self.export()
+        self.load(path, clear=True, rebuild_indexes=True)
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT indexname FROM pg_indexes WHERE tablename = 'chatbot_chunk'")
+            self.assertIn("chunk_embedding_hnsw", {row[0] for row in cursor.fetchall()})
+        self.assertEqual(Chunk.objects.count(), 3)
+
+    def test_rejects_files_that_are_not_copy_dumps(self):
+        with self.assertRaisesMessage(ValueError, "Not a PostgreSQL binary COPY file."):
+            import_chunks(BytesIO(b"content,source\n"))
+        path = self.dir / "chunks.csv"
+        path.write_bytes(b"content,source\n")
+        with self.assertRaises(CommandError):
+            self.load(path)
+        self.assertEqual(Chunk.objects.count(), 3)
+
+    def test_refuses_to_import_while_a_version_is_live(self):
+        path = self.export()
+        EmbeddingVersion.objects.create(name="v2", model="hash", dimensions=64)
+        with self.assertRaisesMessage(CommandError, "Rerun with --backfill"):
+            self.load(path)
+
+    def test_round_trip_carries_the_active_version_vectors(self):
+        version = self.activate()
+        before = self.version_vectors(version)
+        path = self.export()
+        self.load(path, clear=True)
+        self.assertEqual(self.version_vectors(version), before)
+        self.assertEqual(ChunkEmbedding.objects.count(), 3)
+
+    def test_refuses_a_dump_without_the_active_version_vectors(self):
+        legacy = self.export("legacy.pgcopy")
+        self.activate()
+        message = "3 rows in the file have no vector for the active embedding version v2."
+        with self.assertRaisesMessage(CommandError, message):
+            self.load(legacy)
+
+        other = self.export("v2.pgcopy")
+        self.activate("v3")
+        with self.assertRaisesMessage(CommandError, "no vector for the active embedding version v3"):
+            self.load(other)
+        self.assertEqual(Chunk.objects.count(), 3)
+
+    def test_refuses_rows_missing_the_exported_vector(self):
+        self.activate(embedded=2)
+        path = self.export()
+        self.assertIn("1 exported chunks have no v2 vector", self.stderr.getvalue())
+        with self.assertRaisesMessage(CommandError, "1 rows in the file have no vector"):
+            self.load(path)
+
+        Chunk.objects.create(content="no vector", source="new.md")
+        EmbeddingVersion.objects.update(status=EmbeddingVersion.Status.RETIRED)
+        path = self.export("legacy.pgcopy")
+        self.assertIn("1 exported chunks have no legacy vector", self.stderr.getvalue())
+        with self.assertRaisesMessage(CommandError, "no vector for the legacy embedding column"):
+            self.load(path)
@@ -0,0 +1,88 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import DatabaseError
+from django.test import TestCase, override_settings
+
+from chatbot.application.questions import normalize_question
+from chatbot.infrastructure.django import canned_answers
+from chatbot.infrastructure.llm.fake_client import FakeLLMClient
+from chatbot.models import CannedAnswer
+from chatbot.tests.helpers import ChatAPIMixin, fake_repository
+
+QUESTIONS = ["What is your tech stack?", "Where have you traveled?"]
+
+
+def stored_answer(question: str, **fields) -> CannedAnswer:
+    return CannedAnswer.objects.create(
+        normalized=normalize_question(question),
+        question=question,
+        answer=fields.pop("answer", "Python and Django."),
+        sources=fields.pop("sources", ["backend.md"]),
+        fingerprint=fields.pop("fingerprint", "f1"),
+        **fields,
+    )
+
+
+@override_settings(CHAT_SUGGESTED_QUESTIONS=QUESTIONS)
+class CannedAnswerServingTests(ChatAPIMixin, TestCase):
+    def test_suggested_question_is_answered_from_the_store(self):
+        stored_answer(QUESTIONS[0])
+        with mock.patch.object(self.use_case, "execute") as execute:
+            response = self.chat("  what is your TECH stack? ")
+        self.assertEqual(response.json(), {"answer": "Python and Django.", "sources": ["backend.md"]})
+        execute.assert_not_called()
+        history = self.client.session["chat_history"]
+        self.assertEqual(history[-1]["content"], "Python and Django.")
+
+    def test_other_questions_run_the_pipeline(self):
+        stored_answer(QUESTIONS[0])
+        with mock.patch.object(CannedAnswer.objects, "filter") as lookup:
+            response = self.chat("django postgres")
+        lookup.assert_not_called()
+        self.assertTrue(response.json()["answer"].startswith("Synthetic answer"))
+
+    def test_missing_answer_falls_through_to_the_pipeline(self):
+        response = self.chat(QUESTIONS[1])
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()["answer"].startswith("Synthetic answer"))
+
+    def test_database_errors_fall_back_to_the_pipeline(self):
+        with mock.patch.object(
+            canned_answers.DjangoCannedAnswerStore,
+            "get",
+            side_effect=DatabaseError("no such table"),
+        ), mock.patch.object(canned_answers.logger, "disabled", new=True):
+            self.assertIsNone(canned_answers.lookup_canned_answer(QUESTIONS[0]))
+
+
+@override_settings(CHAT_SUGGESTED_QUESTIONS=QUESTIONS)
+class WarmCannedAnswersTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        patcher = mock.patch.object(canned_answers, "PgVectorChunkRepository", fake_repository)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def warm(self, **options) -> dict[str, int]:
+        return canned_answers.warm_canned_answers(llm=FakeLLMClient(), **options)
+
+    def test_generates_then_skips_unchanged_context(self):
+        self.assertEqual(self.warm(), {"generated": 2, "unchanged": 0, "failed": 0, "pruned": 0})
+        self.assertEqual(self.warm(), {"generated": 0, "unchanged": 2, "failed": 0, "pruned": 0})
+        self.assertEqual(self.warm(force=True)["generated"], 2)
+        row = CannedAnswer.objects.get(question=QUESTIONS[1])
+        self.assertIn("hobbies.md", row.sources)
+
+    def test_changed_context_regenerates_the_answer(self):
+        stored_answer(QUESTIONS[0], fingerprint="stale")
+        self.assertEqual(self.warm()["generated"], 2)
+        self.assertNotEqual(CannedAnswer.objects.get(question=QUESTIONS[0]).fingerprint, "stale")
+
+    def test_prunes_answers_to_questions_no_longer_suggested(self):
+        stored_answer("What is your favourite colour?")
+        store = canned_answers.DjangoCannedAnswerStore()
+        store.get(normalize_question("What is your favourite colour?"))
+        self.assertEqual(self.warm()["pruned"], 1)
+        self.assertIsNone(store.get(normalize_question("What is your favourite colour?")))
+        self.assertEqual(CannedAnswer.objects.count(), 2)
@@ -0,0 +1,128 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+
+from chatbot.application.policies import SimilarityPolicy
+from chatbot.application.use_cases.ask_question import AskQuestionUseCase
+from chatbot.infrastructure.embeddings.hash_embedder import HashEmbedder
+from chatbot.infrastructure.ingestion.dedup import NearDuplicateIndex, simhash
+from chatbot.infrastructure.ingestion.pipeline import ChunkMetadata, store_chunks
+from chatbot.infrastructure.llm.fake_client import FakeLLMClient
+from chatbot.models import Chunk
+
+PDF = "Software engineer with five years of experience.\nLed a migration to AWS ECS."
+DOCX = "Software engineer with five years of experience. Led a migration to AWS ECS ."
+HOBBIES = "Hobbies: hiking and photography."
+
+
+class NearDuplicateTests(SimpleTestCase):
+    def test_simhash_ignores_extraction_whitespace(self):
+        self.assertEqual(simhash(PDF), simhash(DOCX))
+        self.assertEqual(simhash("大阪で Django を使った開発"), simhash("大阪でDjangoを使った開発"))
+
+    def test_simhash_separates_unrelated_text(self):
+        distance = bin((simhash(PDF) ^ simhash(HOBBIES)) & (2**64 - 1)).count("1")
+        self.assertGreater(distance, 10)
+
+    def test_index_matches_other_documents_within_distance(self):
+        index = NearDuplicateIndex(max_distance=3)
+        index.add(simhash(PDF), "resume.pdf", "resume-pdf")
+        fingerprint, source, distance = index.match(simhash(DOCX), "resume-docx")
+        self.assertEqual((fingerprint, source, distance), (simhash(PDF), "resume.pdf", 0))
+
+    def test_index_never_matches_the_same_document(self):
+        index = NearDuplicateIndex(max_distance=3)
+        index.add(simhash(PDF), "resume.pdf", "resume")
+        self.assertIsNone(index.match(simhash(DOCX), "resume"))
+
+    def test_negative_distance_disables_matching(self):
+        index = NearDuplicateIndex(max_distance=-1)
+        index.add(simhash(PDF), "resume.pdf", "a")
+        self.assertIsNone(index.match(simhash(PDF), "b"))
+
+    def test_index_grows_geometrically(self):
+        index = NearDuplicateIndex(max_distance=0)
+        for i in range(1000):
+            index.add(i * 7919, f"doc-{i}.md", f"doc-{i}")
+        self.assertEqual((len(index.hashes), len(index.documents), len(index.sources)), (1000, 1000, 1000))
+        self.assertLess(len(index._hashes), 2000)
+        self.assertEqual(index.match(0, "other"), (0, "doc-0.md", 0))
+        self.assertEqual(index.match(999 * 7919, "other"), (999 * 7919, "doc-999.md", 0))
+        self.assertIsNone(index.match(999 * 7919, "doc-999"))
+
+    def test_ask_question_cites_retrieved_and_merged_sources(self):
+        repo = mock.Mock()
+        repo.search.return_value = [
+            {"content": "a", "source": "resume.pdf", "score": 0.9, "merged_sources": ["resume.docx"]},
+            {"content": "b", "source": "github", "score": 0.5},
+        ]
+        result = AskQuestionUseCase(repo, FakeLLMClient(), SimilarityPolicy(0.15)).execute("q")
+        self.assertEqual(result["sources"], ["github", "resume.docx", "resume.pdf"])
+
+
+class StoreChunksDedupTests(TestCase):
+    def store(self, texts: list[str], source: str) -> list:
+        collapsed = []
+        store_chunks(
+            [(1, text) for text in texts],
+            ChunkMetadata(source=source, source_type="resume", document_id=source),
+            HashEmbedder(1536),
+            on_duplicate=collapsed.append,
+        )
+        return collapsed
+
+    def test_near_duplicates_of_other_documents_collapse_into_the_stored_chunk(self):
+        self.store([PDF, HOBBIES], "resume.pdf")
+        [collapse] = self.store([DOCX, "Contact: by email."], "resume.docx")
+        self.assertEqual((collapse.source, collapse.kept_source, collapse.distance), ("resume.docx", "resume.pdf", 0))
+        kept = Chunk.objects.get(content=PDF)
+        self.assertEqual(kept.merged_sources, ["resume.docx"])
+        self.assertEqual(kept.simhash, simhash(PDF))
+        self.assertFalse(Chunk.objects.filter(content=DOCX).exists())
+        self.assertEqual(Chunk.objects.count(), 3)
+
+    def test_a_document_never_collapses_into_itself(self):
+        self.store([PDF], "resume.pdf")
+        self.assertEqual(self.store([DOCX], "resume.pdf"), [])
+        self.assertEqual(Chunk.objects.count(), 2)
+
+    def test_negative_distance_turns_deduplication_off(self):
+        self.store([PDF], "resume.pdf")
+        with self.settings(INGEST_DEDUP_MAX_DISTANCE=-1):
+            self.assertEqual(self.store([DOCX], "resume.docx"), [])
+        self.assertEqual(Chunk.objects.count(), 2)
+
+
+class DedupeChunksCommandTests(TestCase):
+    def setUp(self):
+        Chunk.objects.bulk_create(
+            [
+                Chunk(content=PDF, source="resume.pdf", document_id="pdf", source_type="resume"),
+                Chunk(content=HOBBIES, source="hobbies.md", document_id="hobbies", source_type="resume"),
+                Chunk(content=DOCX, source="resume.docx", document_id="docx", source_type="resume"),
+                Chunk(content=DOCX, source="resume.txt", document_id="txt", source_type="document"),
+            ]
+        )
+
+    def dedupe(self, **options) -> str:
+        out = StringIO()
+        call_command("dedupe_chunks", no_warm=True, stdout=out, **options)
+        return out.getvalue()
+
+    def test_dry_run_changes_nothing(self):
+        self.assertIn("Would collapse 1 near-duplicate chunks.", self.dedupe(dry_run=True))
+        self.assertEqual(Chunk.objects.count(), 4)
+        self.assertFalse(Chunk.objects.filter(simhash__isnull=False).exists())
+
+    def test_newer_duplicates_collapse_into_the_oldest_chunk_per_scope(self):
+        out = self.dedupe()
+        self.assertIn("resume.docx", out)
+        self.assertIn("Collapsed 1 near-duplicate chunks.", out)
+        self.assertEqual(
+            sorted(Chunk.objects.values_list("source", "merged_sources")),
+            [("hobbies.md", []), ("resume.pdf", ["resume.docx"]), ("resume.txt", [])],
+        )
+        self.assertFalse(Chunk.objects.filter(simhash__isnull=True).exists())
+        self.assertIn("Collapsed 0", self.dedupe())
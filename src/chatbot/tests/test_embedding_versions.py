@@ -0,0 +1,135 @@
+from io import StringIO
+from unittest import mock
+
+import numpy as np
+
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from chatbot.infrastructure.django import repositories
+from chatbot.infrastructure.embeddings.hash_embedder import HashEmbedder
+from chatbot.infrastructure.embeddings.versions import (
+    EmbeddingVersionError,
+    activate_version,
+    coverage,
+    get_active_version,
+)
+from chatbot.management.commands import backfill_embeddings
+from chatbot.models import ChunkEmbedding, EmbeddingVersion
+from chatbot.tests.helpers import create_chunks, postgres_only
+
+Status = EmbeddingVersion.Status
+
+
+class VersionMixin:
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.embedder = HashEmbedder(64)
+        self.chunks = create_chunks(HashEmbedder(1536))
+
+    def version(self, name: str = "v2", status: str = Status.BACKFILLING) -> EmbeddingVersion:
+        return EmbeddingVersion.objects.create(name=name, model="hash", dimensions=64, status=status)
+
+    def embed(self, version: EmbeddingVersion, chunks=None) -> None:
+        ChunkEmbedding.objects.bulk_create(
+            ChunkEmbedding(chunk=chunk, version=version, embedding=self.embedder.embed(chunk.content))
+            for chunk in (self.chunks if chunks is None else chunks)
+        )
+
+
+class ActivateVersionTests(VersionMixin, TestCase):
+    def test_refuses_until_every_chunk_is_covered(self):
+        version = self.version()
+        self.embed(version, self.chunks[:2])
+        self.assertEqual(coverage(version), (2, 3))
+        with self.assertRaisesMessage(EmbeddingVersionError, "v2 covers 2/3 chunks; backfill first."):
+            activate_version(version)
+
+    def test_activation_retires_the_previous_version_and_clears_the_cache(self):
+        old = self.version("v1", Status.ACTIVE)
+        self.assertEqual(get_active_version(), old)
+        version = self.version()
+        self.embed(version)
+        with self.captureOnCommitCallbacks(execute=True):
+            activate_version(version)
+        old.refresh_from_db()
+        version.refresh_from_db()
+        self.assertEqual((old.status, version.status), (Status.RETIRED, Status.ACTIVE))
+        self.assertIsNotNone(version.activated_at)
+        self.assertEqual(get_active_version(), version)
+
+    def test_retired_versions_cannot_come_back(self):
+        version = self.version(status=Status.RETIRED)
+        self.embed(version)
+        with self.assertRaisesMessage(EmbeddingVersionError, "v2 is retired."):
+            activate_version(version)
+
+    def test_command_reports_coverage_and_errors(self):
+        self.embed(self.version(), self.chunks[:1])
+        out = StringIO()
+        call_command("activate_embedding_version", stdout=out)
+        self.assertIn("1/3 chunks", out.getvalue())
+        with mock.patch("chatbot.management.commands.activate_embedding_version.ensure_version_index"):
+            with self.assertRaisesMessage(CommandError, "backfill first"):
+                call_command("activate_embedding_version", "v2", no_warm=True, stdout=StringIO())
+            with self.assertRaisesMessage(CommandError, "Unknown version: v9"):
+                call_command("activate_embedding_version", "v9", stdout=StringIO())
+
+
+class BackfillEmbeddingsTests(VersionMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        for target, value in (("embedder_for", self.embedder), ("ensure_version_index", None)):
+            patcher = mock.patch.object(backfill_embeddings, target, return_value=value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def backfill(self, *args, **options) -> str:
+        out = StringIO()
+        call_command("backfill_embeddings", *args, pause=0, no_warm=True, stdout=out, **options)
+        return out.getvalue()
+
+    def test_resumable_batches_then_activation(self):
+        out = self.backfill("v2", model="hash", dimensions=64, batch_size=2, max_batches=1)
+        self.assertIn("Backfill incomplete", out)
+        version = EmbeddingVersion.objects.get(name="v2")
+        self.assertEqual((version.status, coverage(version)), (Status.BACKFILLING, (2, 3)))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            out = self.backfill("v2", batch_size=2, activate=True)
+        self.assertIn("1 chunk(s) to embed", out)
+        self.assertIn("v2 is now active.", out)
+        version.refresh_from_db()
+        self.assertEqual((version.status, coverage(version)), (Status.ACTIVE, (3, 3)))
+        self.assertEqual(get_active_version(), version)
+        stored = ChunkEmbedding.objects.get(version=version, chunk=self.chunks[0])
+        expected = self.embedder.embed_array(self.chunks[0].content)
+        np.testing.assert_allclose(np.asarray(stored.embedding), expected, rtol=1e-6)
+
+    def test_complete_backfill_without_activation_is_ready(self):
+        self.backfill("v2", model="hash", dimensions=64)
+        self.assertEqual(EmbeddingVersion.objects.get(name="v2").status, Status.READY)
+        self.assertIsNone(get_active_version())
+
+    def test_version_options_are_validated(self):
+        with self.assertRaisesMessage(CommandError, "A new version needs --model and --dimensions."):
+            self.backfill("v2")
+        self.version()
+        with self.assertRaisesMessage(CommandError, "v2 uses 64 dimensions."):
+            self.backfill("v2", dimensions=512)
+        self.version("v1", Status.RETIRED)
+        with self.assertRaisesMessage(CommandError, "v1 is retired."):
+            self.backfill("v1")
+
+
+@postgres_only
+class VersionedSearchTests(VersionMixin, TestCase):
+    def test_read_path_searches_the_active_version(self):
+        version = self.version(status=Status.ACTIVE)
+        self.embed(version, self.chunks[:2])
+        with mock.patch.object(repositories, "embedder_for", return_value=self.embedder):
+            results = repositories.PgVectorChunkRepository().search("python django postgres", k=4)
+        self.assertEqual([result["source"] for result in results][0], "backend.md")
+        self.assertNotIn("frontend.md", [result["source"] for result in results])
@@ -0,0 +1,147 @@
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase, TestCase
+
+from chatbot.infrastructure.django.repositories import PgVectorChunkRepository
+from chatbot.infrastructure.embeddings.hash_embedder import HashEmbedder
+from chatbot.management.commands import evaluate_retrieval
+from chatbot.tests.helpers import create_chunks, fake_repository, postgres_only
+
+GOLDEN = [
+    {"question": "django postgres", "expected_sources": ["backend.md"]},
+    {"question": "hiking photography", "expected_sources": ["hobbies.md"]},
+    {"question": "typescript", "expected_sources": ["frontend.md"], "filters": {"source_type": "resume"}},
+]
+
+
+class GateMixin:
+    def setUp(self):
+        super().setUp()
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = Path(tmp.name)
+        self.golden = self.write("golden.json", GOLDEN)
+
+    def write(self, name: str, data) -> Path:
+        path = self.dir / name
+        path.write_text(json.dumps(data), encoding="utf-8")
+        return path
+
+    def evaluate(self, *args, **options) -> str:
+        out = StringIO()
+        call_command("evaluate_retrieval", str(self.golden), *args, stdout=out, **options)
+        return out.getvalue()
+
+    def saved(self, **options) -> dict:
+        path = self.dir / "baseline.json"
+        self.evaluate(save_baseline=str(path), **options)
+        return json.loads(path.read_text(encoding="utf-8"))
+
+
+class GoldenSetTests(SimpleTestCase):
+    def test_accepts_a_list_or_a_questions_mapping(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "set.json"
+            path.write_text(json.dumps({"questions": [{"question": "q"}]}), encoding="utf-8")
+            self.assertEqual(
+                evaluate_retrieval.load_golden_set(path),
+                [{"question": "q", "expected_sources": [], "filters": None}],
+            )
+
+    def test_rejects_empty_sets_and_entries_without_a_question(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "set.json"
+            for data in ([], {"questions": []}, [{"expected_sources": ["a"]}]):
+                path.write_text(json.dumps(data), encoding="utf-8")
+                with self.assertRaises(CommandError):
+                    evaluate_retrieval.load_golden_set(path)
+
+
+class FindRegressionsTests(SimpleTestCase):
+    options = {"max_quality_drop": 0.02, "max_fallback_increase": 0.05, "max_latency_increase": 0.5}
+    baseline = {"recall": 0.9, "mrr": 0.8, "fallback_rate": 0.1, "p95_ms": 10.0}
+
+    def test_within_tolerances(self):
+        current = {"recall": 0.89, "mrr": 0.8, "fallback_rate": 0.12, "p95_ms": 14.0}
+        self.assertEqual(evaluate_retrieval.find_regressions(current, self.baseline, self.options), [])
+
+    def test_reports_each_regressed_metric(self):
+        current = {"recall": 0.8, "mrr": 0.7, "fallback_rate": 0.3, "p95_ms": 16.0}
+        regressions = evaluate_retrieval.find_regressions(current, self.baseline, self.options)
+        self.assertEqual([line.split()[0] for line in regressions], ["recall", "mrr", "fallback_rate", "p95"])
+
+
+class ScoreSourcesTests(SimpleTestCase):
+    ranked = evaluate_retrieval.ranked_sources(
+        [
+            {"source": "resume.pdf", "merged_sources": ["resume.docx"]},
+            {"source": "blog.md"},
+        ]
+    )
+
+    def test_merged_sources_count_at_the_rank_of_their_chunk(self):
+        self.assertEqual(self.ranked, [["resume.pdf", "resume.docx"], ["blog.md"]])
+        self.assertEqual(evaluate_retrieval.score_sources(self.ranked, ["resume.docx"], 4), (1.0, 1.0))
+        self.assertEqual(evaluate_retrieval.score_sources(self.ranked, ["blog.md", "resume.docx"], 4), (1.0, 1.0))
+
+    def test_misses_and_empty_expectations(self):
+        self.assertEqual(evaluate_retrieval.score_sources(self.ranked, ["cv.md", "blog.md"], 4), (0.5, 0.5))
+        self.assertEqual(evaluate_retrieval.score_sources(self.ranked, ["blog.md", "resume.docx"], 1), (1.0, 1.0))
+        self.assertEqual(evaluate_retrieval.score_sources(self.ranked, [], 4), (1.0, 0.0))
+
+
+class EvaluateRetrievalCommandTests(GateMixin, SimpleTestCase):
+    def setUp(self):
+        super().setUp()
+        patcher = mock.patch.object(evaluate_retrieval, "PgVectorChunkRepository", fake_repository)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_scores_the_golden_set(self):
+        metrics = self.saved()["metrics"]
+        self.assertEqual((metrics["recall"], metrics["mrr"], metrics["fallback_rate"]), (1.0, 1.0, 0.0))
+
+    def test_passes_against_its_own_baseline(self):
+        baseline = self.write("baseline.json", {"metrics": {**self.saved()["metrics"], "p95_ms": 0.0}})
+        self.assertIn("No regression", self.evaluate(baseline=str(baseline)))
+
+    def test_fails_when_quality_drops_below_the_baseline(self):
+        baseline = self.write("baseline.json", {"metrics": {"recall": 1.0, "mrr": 1.0}})
+        self.golden = self.write(
+            "golden.json",
+            [*GOLDEN, {"question": "django postgres", "expected_sources": ["missing.md"]}],
+        )
+        with self.assertRaisesMessage(CommandError, "recall dropped 1.000 -> 0.750"):
+            self.evaluate(baseline=str(baseline))
+
+
+@postgres_only
+class EvaluateRetrievalPgVectorTests(GateMixin, TestCase):
+    def test_scores_the_golden_set_against_pgvector(self):
+        embedder = HashEmbedder(1536)
+        create_chunks(embedder)
+        with mock.patch.object(
+            evaluate_retrieval,
+            "PgVectorChunkRepository",
+            lambda: PgVectorChunkRepository(embedder=embedder),
+        ):
+            metrics = self.saved()["metrics"]
+        self.assertEqual((metrics["recall"], metrics["mrr"]), (1.0, 1.0))
+
+    def test_merged_sources_are_hits(self):
+        embedder = HashEmbedder(1536)
+        create_chunks(embedder, [("python django postgres", "resume.pdf", {"merged_sources": ["resume.docx"]})])
+        self.golden = self.write("golden.json", [{"question": "django", "expected_sources": ["resume.docx"]}])
+        with mock.patch.object(
+            evaluate_retrieval,
+            "PgVectorChunkRepository",
+            lambda: PgVectorChunkRepository(embedder=embedder),
+        ):
+            saved = self.saved()
+        self.assertEqual((saved["metrics"]["recall"], saved["metrics"]["mrr"]), (1.0, 1.0))
+        self.assertEqual(saved["queries"][0]["retrieved"], ["resume.pdf", "resume.docx"])
@@ -0,0 +1,110 @@
+import json
+import tempfile
+from importlib import import_module
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+from django.conf import settings
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+from rest_framework.test import APIRequestFactory
+
+from chatbot.application.evaluation import latency_summary, percentile, recall_at_k, reciprocal_rank
+from chatbot.application.policies import SimilarityPolicy
+from chatbot.application.use_cases.ask_question import AskQuestionUseCase
+from chatbot.infrastructure.embeddings.hash_embedder import HashEmbedder
+from chatbot.infrastructure.llm.fake_client import FakeLLMClient
+from chatbot.infrastructure.memory.repositories import InMemoryVectorChunkRepository
+from chatbot.management.commands.benchmark_rag import BenchmarkChatView
+
+
+class EvaluationTests(SimpleTestCase):
+    def test_percentile_is_nearest_rank(self):
+        values = [0.4, 0.1, 0.3, 0.2]
+        self.assertEqual(percentile(values, 50), 0.2)
+        self.assertEqual(percentile(values, 95), 0.4)
+        self.assertEqual(percentile(values, 0), 0.1)
+        self.assertEqual(percentile([], 50), 0.0)
+
+    def test_latency_summary_reports_milliseconds(self):
+        summary = latency_summary([0.010, 0.020, 0.030])
+        self.assertAlmostEqual(summary["p50_ms"], 20.0)
+        self.assertAlmostEqual(summary["max_ms"], 30.0)
+
+    def test_recall_at_k_caps_the_denominator_at_k(self):
+        self.assertEqual(recall_at_k(["a", "b", "c"], ["a", "c"], k=2), 0.5)
+        self.assertEqual(recall_at_k(["a", "b"], ["a", "b", "c"], k=2), 1.0)
+        self.assertEqual(recall_at_k(["a"], [], k=4), 1.0)
+
+    def test_reciprocal_rank(self):
+        self.assertEqual(reciprocal_rank(["x", "a"], ["a"]), 0.5)
+        self.assertEqual(reciprocal_rank(["x"], ["a"]), 0.0)
+
+
+class FakeBackendTests(SimpleTestCase):
+    def setUp(self):
+        self.embedder = HashEmbedder(64)
+        contents = ["python django postgres", "hiking photography travel", "react typescript frontend"]
+        self.repo = InMemoryVectorChunkRepository(
+            self.embedder,
+            contents,
+            ["backend.md", "hobbies.md", "frontend.md"],
+            np.stack([self.embedder.embed_array(text) for text in contents]),
+            metadata=[{"source_type": "resume"}, {"source_type": "document"}, {"source_type": "resume"}],
+        )
+
+    def test_hash_embedder_is_deterministic_and_normalised(self):
+        first = self.embedder.embed("Django and Postgres")
+        self.assertEqual(first, HashEmbedder(64).embed("django and postgres"))
+        self.assertAlmostEqual(float(np.linalg.norm(first)), 1.0, places=5)
+
+    def test_in_memory_search_ranks_by_cosine_and_applies_filters(self):
+        self.assertEqual(self.repo.search("django postgres", k=1)[0]["source"], "backend.md")
+        filtered = self.repo.search("hiking photography", k=3, filters={"source_type": "resume"})
+        self.assertEqual({chunk["source"] for chunk in filtered}, {"backend.md", "frontend.md"})
+
+    def test_fake_llm_is_deterministic(self):
+        self.assertEqual(FakeLLMClient().answer("s", "u"), FakeLLMClient(seed=1).answer("s", "u"))
+
+    def test_ask_question_without_context_cites_nothing(self):
+        use_case = AskQuestionUseCase(self.repo, FakeLLMClient(), SimilarityPolicy(threshold=1.1))
+        self.assertEqual(use_case.execute("django")["sources"], [])
+
+    @override_settings(SESSION_ENGINE="django.contrib.sessions.backends.cache")
+    def test_chat_view_answers_with_fakes(self):
+        use_case = AskQuestionUseCase(self.repo, FakeLLMClient(), SimilarityPolicy(threshold=0.15))
+        view = BenchmarkChatView.as_view(use_case=use_case)
+        request = APIRequestFactory().post(
+            "/api/chat/",
+            {"query": "django postgres", "recaptcha_token": "t", "recaptcha_action": "chat"},
+            format="json",
+        )
+        request.session = import_module(settings.SESSION_ENGINE).SessionStore()
+        with mock.patch.object(BenchmarkChatView, "get_single_flight", return_value=None):
+            response = view(request)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("backend.md", response.data["sources"])
+
+
+@override_settings(SESSION_ENGINE="django.contrib.sessions.backends.cache", CHAT_COALESCE_ENABLED=False)
+class BenchmarkRagCommandTests(SimpleTestCase):
+    def test_memory_backend_reports_exact_recall_and_no_errors(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "bench.json"
+            call_command(
+                "benchmark_rag",
+                sizes="500",
+                dim=32,
+                queries=20,
+                requests=10,
+                concurrency=2,
+                llm_latency=0,
+                json_path=str(path),
+                stdout=StringIO(),
+            )
+            [result] = json.loads(path.read_text(encoding="utf-8"))
+        self.assertEqual(result["chunks"], 500)
+        self.assertEqual(result["retrieval"]["recall@4"], 1.0)
+        self.assertEqual(result["chat"]["errors"], 0)
@@ -0,0 +1,73 @@
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase, override_settings
+
+from chatbot.infrastructure.django.repositories import PgVectorChunkRepository
+from chatbot.infrastructure.embeddings.hash_embedder import HashEmbedder
+from chatbot.interface.api.views import ChatView
+from chatbot.tests.helpers import ChatAPIMixin, create_chunks, postgres_only
+
+
+class ChatFilterTests(ChatAPIMixin, TestCase):
+    def test_filters_narrow_the_retrieved_sources(self):
+        response = self.chat("hiking photography", filters={"source_type": "resume"})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("hobbies.md", response.json()["sources"])
+
+        response = self.chat("hiking photography", filters={"source_type": "document"})
+        self.assertEqual(response.json()["sources"], ["hobbies.md"])
+
+    def test_invalid_filters_are_rejected(self):
+        for filters in ({"source_type": "tweet"}, {"page": 0}, {"language": ""}):
+            with self.subTest(filters=filters):
+                self.assertEqual(self.chat(filters=filters).status_code, 400)
+
+    @override_settings(CHAT_SUGGESTED_QUESTIONS=["django postgres"])
+    def test_filtered_questions_skip_canned_answers(self):
+        with mock.patch.object(ChatView, "get_canned_answer") as canned:
+            self.chat("django postgres", filters={"source_type": "resume"})
+        canned.assert_not_called()
+
+
+@postgres_only
+@override_settings(PGVECTOR_ITERATIVE_SCAN="off")
+class PgVectorFilterTests(TestCase):
+    def setUp(self):
+        self.embedder = HashEmbedder(1536)
+        create_chunks(
+            self.embedder,
+            [
+                ("python django postgres", "resume.pdf", {"source_type": "resume", "document_id": "cv", "page": 1}),
+                ("django rest framework", "resume.pdf", {"source_type": "resume", "document_id": "cv", "page": 2}),
+                ("django unchained review", "blog.md", {"source_type": "document", "language": "en"}),
+                ("django と postgres", "blog-ja.md", {"source_type": "document", "language": "ja"}),
+            ],
+        )
+        self.repo = PgVectorChunkRepository(embedder=self.embedder)
+
+    def sources(self, **filters):
+        return [chunk["source"] for chunk in self.repo.search("django", k=4, filters=filters or None)]
+
+    def test_each_filter_restricts_the_search(self):
+        self.assertEqual(len(self.sources()), 4)
+        self.assertEqual(self.sources(source_type="resume"), ["resume.pdf"] * 2)
+        self.assertEqual(self.sources(language="ja"), ["blog-ja.md"])
+        self.assertEqual(self.sources(document_id="cv", page=2), ["resume.pdf"])
+        self.assertEqual(self.sources(source_type="github"), [])
+
+    @override_settings(PGVECTOR_ITERATIVE_SCAN="relaxed_order")
+    def test_iterative_scan_results_stay_ordered_by_distance(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT string_to_array(extversion, '.')::int[] FROM pg_extension WHERE extname = 'vector'")
+            if cursor.fetchone()[0] < [0, 8]:
+                self.skipTest("pgvector < 0.8 has no iterative index scans")
+        scores = [chunk["score"] for chunk in self.repo.search("django", k=4, filters={"source_type": "document"})]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+
+    def test_partial_indexes_exist_per_source_type(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT indexname FROM pg_indexes WHERE tablename = 'chatbot_chunk'")
+            names = {row[0] for row in cursor.fetchall()}
+        expected = {f"chunk_embedding_{value}_hnsw" for value in ("resume", "github", "document")}
+        self.assertLessEqual({"chunk_embedding_hnsw", *expected}, names)
@@ -0,0 +1,206 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from chatbot.infrastructure.embeddings.hash_embedder import HashEmbedder
+from chatbot.infrastructure.ingestion import jobs
+from chatbot.models import Chunk, ChunkEmbedding, EmbeddingVersion, IngestJob
+
+
+def document(paragraphs: int = 3) -> bytes:
+    # One chunk per paragraph: each is over half of chunk_text's 1000 characters.
+    return "\n".join(
+        " ".join(f"topic{paragraph}-{word}" for word in range(60))
+        for paragraph in range(paragraphs)
+    ).encode()
+
+
+class FailingEmbedder(HashEmbedder):
+    """Fails every embed once `fail_after` calls have succeeded."""
+
+    def __init__(self, fail_after: int):
+        super().__init__(1536)
+        self.calls = 0
+        self.fail_after = fail_after
+
+    def embed(self, text: str) -> list[float]:
+        self.calls += 1
+        if self.calls > self.fail_after:
+            raise RuntimeError("embedding failed")
+        return super().embed(text)
+
+
+class TakeoverEmbedder(HashEmbedder):
+    """Lets another worker re-lease the job while the second chunk is embedded."""
+
+    def __init__(self, job: IngestJob):
+        super().__init__(1536)
+        self.job = job
+        self.calls = 0
+
+    def embed(self, text: str) -> list[float]:
+        self.calls += 1
+        if self.calls == 2:
+            IngestJob.objects.filter(pk=self.job.pk).update(locked_by="worker:2")
+        return super().embed(text)
+
+
+class ClaimNextJobTests(TestCase):
+    def create(self, **fields) -> IngestJob:
+        return IngestJob.objects.create(filename="cv.md", content=document(), source="cv.md", **fields)
+
+    def test_leases_the_oldest_runnable_job(self):
+        first = self.create()
+        self.create()
+        self.create(run_after=timezone.now() + timedelta(minutes=5))
+
+        job = jobs.claim_next_job("worker:1")
+        self.assertEqual(job.pk, first.pk)
+        first.refresh_from_db()
+        self.assertEqual(
+            (first.status, first.locked_by, first.attempts),
+            (IngestJob.Status.RUNNING, "worker:1", 1),
+        )
+
+    def test_live_leases_are_skipped_and_expired_ones_taken_over(self):
+        job = self.create(status=IngestJob.Status.RUNNING, locked_by="worker:1", locked_at=timezone.now())
+        self.assertIsNone(jobs.claim_next_job("worker:2"))
+
+        IngestJob.objects.filter(pk=job.pk).update(locked_at=timezone.now() - timedelta(hours=1))
+        claimed = jobs.claim_next_job("worker:2")
+        self.assertEqual((claimed.pk, claimed.locked_by), (job.pk, "worker:2"))
+
+
+@override_settings(INGEST_BATCH_SIZE=1, INGEST_MAX_ATTEMPTS=2)
+class RunJobTests(TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(jobs, "warm_canned_answers")
+        self.warm = patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(jobs.logger, "disabled", new=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def claim(self, **fields) -> IngestJob:
+        IngestJob.objects.create(
+            filename="cv.md",
+            content=document(),
+            source="cv.md",
+            document_id="cv",
+            **fields,
+        )
+        return jobs.claim_next_job("worker:1")
+
+    def retry(self) -> IngestJob:
+        IngestJob.objects.update(run_after=timezone.now())
+        return jobs.claim_next_job("worker:1")
+
+    def stored(self) -> list[tuple[str, str]]:
+        return list(Chunk.objects.order_by("pk").values_list("source", "document_id"))
+
+    def test_stores_every_chunk_and_warms_the_canned_answers(self):
+        job = self.claim()
+        jobs.run_job(job, embedder=HashEmbedder(1536))
+        job.refresh_from_db()
+        self.assertEqual(job.status, IngestJob.Status.SUCCEEDED)
+        self.assertEqual((job.done_chunks, job.total_chunks), (3, 3))
+        self.assertEqual(bytes(job.content), b"")
+        self.assertEqual(self.stored(), [("cv.md", "cv")] * 3)
+        self.warm.assert_called_once()
+
+    def test_clearing_job_replaces_the_store_only_once_it_succeeds(self):
+        Chunk.objects.create(content="old", source="old.md", document_id="old")
+        jobs.run_job(self.claim(clear=True), embedder=FailingEmbedder(fail_after=1))
+        self.assertEqual(self.stored(), [("old.md", "old"), ("cv.md", "cv")])
+
+        jobs.run_job(self.retry(), embedder=HashEmbedder(1536))
+        self.assertEqual(self.stored(), [("cv.md", "cv")] * 3)
+
+    def test_transient_failure_is_retried_with_backoff_and_resumes(self):
+        job = self.claim()
+        before = timezone.now()
+        jobs.run_job(job, embedder=FailingEmbedder(fail_after=1))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.locked_by, job.done_chunks), (IngestJob.Status.PENDING, "", 1))
+        self.assertIn("embedding failed", job.last_error)
+        self.assertGreaterEqual(job.run_after, before + timedelta(seconds=30))
+
+        embedder = FailingEmbedder(fail_after=10)
+        jobs.run_job(self.retry(), embedder=embedder)
+        self.assertEqual(embedder.calls, 2)
+        self.assertEqual(self.stored(), [("cv.md", "cv")] * 3)
+
+    def test_permanent_failure_removes_the_jobs_own_chunks(self):
+        other = Chunk.objects.create(content="other", source="blog.md", document_id="blog")
+        version = EmbeddingVersion.objects.create(
+            name="v2",
+            model="hash",
+            dimensions=1536,
+            status=EmbeddingVersion.Status.BACKFILLING,
+        )
+        with mock.patch(
+            "chatbot.infrastructure.ingestion.pipeline.embedder_for",
+            return_value=HashEmbedder(1536),
+        ):
+            jobs.run_job(self.claim(), embedder=FailingEmbedder(fail_after=1))
+            job = self.retry()
+            jobs.run_job(job, embedder=FailingEmbedder(fail_after=1))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (IngestJob.Status.FAILED, 2))
+        self.assertEqual(list(Chunk.objects.values_list("pk", flat=True)), [other.pk])
+        self.assertFalse(ChunkEmbedding.objects.filter(version=version).exists())
+
+    def test_unreadable_documents_fail_without_retrying(self):
+        IngestJob.objects.create(filename="cv.md", content=b"\xff\xfe", source="cv.md")
+        job = jobs.claim_next_job("worker:1")
+        jobs.run_job(job, embedder=HashEmbedder(1536))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (IngestJob.Status.FAILED, 1))
+        self.assertIn("Cannot read cv.md", job.last_error)
+
+    def test_a_worker_that_lost_its_lease_stops_without_touching_the_job(self):
+        job = self.claim()
+        jobs.run_job(job, embedder=TakeoverEmbedder(job))
+        job.refresh_from_db()
+        # The second batch committed after the takeover, so it was rolled back.
+        self.assertEqual((job.status, job.locked_by, job.done_chunks), (IngestJob.Status.RUNNING, "worker:2", 1))
+        self.assertEqual(Chunk.objects.count(), 1)
+        self.warm.assert_not_called()
+
+
+class IngestUploadTests(TestCase):
+    def setUp(self):
+        admin = get_user_model().objects.create_superuser("admin", "admin@example.com", "pw")
+        self.client.force_login(admin)
+
+    def upload(self, name: str = "cv.md", content: bytes = b"# CV\n\nDjango", **data):
+        return self.client.post(
+            "/api/ingest/jobs/",
+            {"file": SimpleUploadedFile(name, content), **data},
+        )
+
+    def test_queues_a_job_with_defaults_from_the_filename(self):
+        response = self.upload(source_type="resume")
+        self.assertEqual(response.status_code, 202)
+        job = IngestJob.objects.get(pk=response.json()["id"])
+        self.assertEqual(
+            (job.source, job.document_id, job.source_type, job.status, bytes(job.content)),
+            ("cv.md", "cv", "resume", IngestJob.Status.PENDING, b"# CV\n\nDjango"),
+        )
+        detail = self.client.get(f"/api/ingest/jobs/{job.pk}/").json()
+        self.assertEqual(detail["status"], "pending")
+
+    @override_settings(INGEST_MAX_UPLOAD_BYTES=8)
+    def test_rejects_unsupported_and_oversized_files(self):
+        self.assertEqual(self.upload("cv.exe", b"MZ").status_code, 400)
+        self.assertEqual(self.upload("cv.md").status_code, 400)
+        self.assertFalse(IngestJob.objects.exists())
+
+    def test_requires_an_admin(self):
+        self.client.logout()
+        self.assertEqual(self.upload().status_code, 403)
+        self.assertEqual(self.client.get("/api/ingest/jobs/").status_code, 403)
@@ -0,0 +1,91 @@
+import json
+from types import SimpleNamespace
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from chatbot.observability import middleware
+from chatbot.observability.metrics import Counter, Histogram
+from chatbot.observability.tracing import record_tokens, stage, start_trace
+from chatbot.tests.helpers import ChatAPIMixin
+
+
+class MetricTests(SimpleTestCase):
+    def test_histogram_quantile_is_the_covering_bucket_bound(self):
+        histogram = Histogram("test_seconds", "Test.", buckets=(0.1, 1.0))
+        for value in (0.05, 0.05, 0.5, 5.0):
+            histogram.observe(value, route="x")
+        self.assertEqual(histogram.count(route="x"), 4)
+        self.assertEqual(histogram.quantile(0.5, route="x"), 0.1)
+        self.assertEqual(histogram.quantile(0.75, route="x"), 1.0)
+        self.assertIsNone(histogram.quantile(0.5, route="y"))
+
+    def test_histogram_renders_cumulative_buckets(self):
+        histogram = Histogram("test_seconds", "Test.", buckets=(0.1, 1.0))
+        histogram.observe(0.05, route="x")
+        histogram.observe(0.5, route="x")
+        lines = histogram.render()
+        self.assertIn('test_seconds_bucket{route="x",le="0.1"} 1', lines)
+        self.assertIn('test_seconds_bucket{route="x",le="+Inf"} 2', lines)
+        self.assertIn('test_seconds_count{route="x"} 2', lines)
+
+    def test_counter_renders_labels(self):
+        counter = Counter("test_total", "Test.")
+        counter.inc(2, kind="prompt")
+        self.assertIn('test_total{kind="prompt"} 2.0', counter.render())
+
+
+class TracingTests(SimpleTestCase):
+    def test_stages_accumulate_into_server_timing(self):
+        with start_trace() as trace:
+            with stage("embed"):
+                pass
+            with stage("embed"):
+                pass
+            record_tokens("gpt", SimpleNamespace(prompt_tokens=3, completion_tokens=2))
+        self.assertEqual(list(trace.stages), ["embed"])
+        self.assertRegex(trace.server_timing(), r"^embed;dur=\d+\.\d, total;dur=\d+\.\d$")
+        self.assertEqual(trace.attributes["tokens"], {"gpt:prompt": 3, "gpt:completion": 2})
+
+    def test_stage_outside_a_request_is_harmless(self):
+        with stage("warm"):
+            pass
+
+
+class RequestTimingTests(ChatAPIMixin, TestCase):
+    def test_chat_response_carries_server_timing_and_a_timing_log(self):
+        with mock.patch.object(middleware.logger, "disabled", False):
+            with self.assertLogs("chatbot.timing") as logs:
+                response = self.chat()
+        self.assertRegex(response["Server-Timing"], r"recaptcha;dur=[\d.]+, .*total;dur=[\d.]+$")
+        event = json.loads(logs.records[0].getMessage())
+        self.assertEqual((event["path"], event["status"]), ("/api/chat/", 200))
+        self.assertIn("recaptcha", event["stages_ms"])
+        self.assertTrue(event["context_used"])
+
+    @override_settings(METRICS_TOKEN="s3cret")
+    def test_request_durations_are_exported_by_route(self):
+        self.chat()
+        body = self.client.get("/api/metrics/", HTTP_AUTHORIZATION="Bearer s3cret").content.decode()
+        self.assertIn('http_request_duration_seconds_count{method="POST",route="api/chat/",status="200"}', body)
+
+
+class MetricsEndpointTests(TestCase):
+    @override_settings(METRICS_TOKEN="s3cret")
+    def test_token_is_required_when_configured(self):
+        self.assertEqual(self.client.get("/api/metrics/").status_code, 401)
+        self.assertEqual(
+            self.client.get("/api/metrics/", HTTP_AUTHORIZATION="Bearer wrong").status_code,
+            401,
+        )
+        response = self.client.get("/api/metrics/", HTTP_AUTHORIZATION="Bearer s3cret")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain; version=0.0.4"))
+
+    @override_settings(METRICS_TOKEN="", DEBUG=False)
+    def test_hidden_without_a_token_outside_debug(self):
+        self.assertEqual(self.client.get("/api/metrics/").status_code, 404)
+
+    @override_settings(METRICS_TOKEN="", DEBUG=True)
+    def test_open_in_debug_without_a_token(self):
+        self.assertEqual(self.client.get("/api/metrics/").status_code, 200)
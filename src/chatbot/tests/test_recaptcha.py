@@ -0,0 +1,87 @@
+from unittest import mock
+
+import httpx
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from chatbot.infrastructure.http.client import get_http_client
+from chatbot.interface.api import recaptcha
+from chatbot.tests.helpers import ChatAPIMixin
+
+
+def siteverify_reply(**data):
+    return lambda request: httpx.Response(200, json=data)
+
+
+@override_settings(RECAPTCHA_SECRET_KEY="secret", RECAPTCHA_MIN_SCORE=0.5)
+class VerifyRecaptchaTests(SimpleTestCase):
+    def verify(self, handler, action="chat"):
+        client = httpx.Client(transport=httpx.MockTransport(handler))
+        self.addCleanup(client.close)
+        with mock.patch.object(recaptcha, "get_http_client", return_value=client):
+            return recaptcha.verify_recaptcha("token", action)
+
+    def test_accepts_a_matching_action_above_the_min_score(self):
+        self.assertEqual(self.verify(siteverify_reply(success=True, action="chat", score=0.9)), (True, ""))
+
+    def test_rejects_failures_mismatches_and_low_scores(self):
+        self.assertEqual(self.verify(siteverify_reply(success=False)), (False, "recaptcha_failed"))
+        self.assertEqual(
+            self.verify(siteverify_reply(success=True, action="login", score=0.9)),
+            (False, "recaptcha_action_mismatch"),
+        )
+        self.assertEqual(
+            self.verify(siteverify_reply(success=True, action="chat", score=0.1)),
+            (False, "recaptcha_low_score"),
+        )
+
+    def test_transport_errors_report_unavailable(self):
+        def unreachable(request):
+            raise httpx.ConnectError("down", request=request)
+
+        self.assertEqual(self.verify(unreachable), (False, "recaptcha_unavailable"))
+
+    @override_settings(RECAPTCHA_SECRET_KEY="")
+    def test_missing_secret_fails_closed(self):
+        self.assertEqual(recaptcha.verify_recaptcha("token", "chat"), (False, "recaptcha_not_configured"))
+
+    def test_http_client_is_shared(self):
+        self.assertIs(get_http_client(), get_http_client())
+
+
+class SessionVerificationTests(ChatAPIMixin, TestCase):
+    def test_replayed_token_is_refused(self):
+        self.assertEqual(self.chat(token="once").status_code, 200)
+        response = self.chat(token="once")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["reason"], "recaptcha_token_reused")
+        self.assertEqual(self.siteverify.call_count, 1)
+
+    def test_every_request_is_verified_by_default(self):
+        self.chat()
+        self.chat()
+        self.assertEqual(self.siteverify.call_count, 2)
+
+    @override_settings(RECAPTCHA_SESSION_TTL=60)
+    def test_session_reuses_a_recent_success_for_the_same_action(self):
+        self.assertEqual(self.chat().status_code, 200)
+        self.assertEqual(self.chat().status_code, 200)
+        self.assertEqual(self.siteverify.call_count, 1)
+
+        self.chat(recaptcha_action="other")
+        self.assertEqual(self.siteverify.call_count, 2)
+
+    @override_settings(RECAPTCHA_SESSION_TTL=60)
+    def test_failed_verification_is_not_reused(self):
+        self.siteverify.return_value = (False, "recaptcha_low_score")
+        self.assertEqual(self.chat().status_code, 400)
+        self.siteverify.return_value = (True, "")
+        self.assertEqual(self.chat().status_code, 200)
+        self.assertEqual(self.siteverify.call_count, 2)
+
+    @override_settings(RECAPTCHA_SESSION_TTL=60)
+    def test_reuse_expires_with_the_ttl(self):
+        with mock.patch.object(recaptcha.time, "time", return_value=1000.0):
+            self.chat()
+        with mock.patch.object(recaptcha.time, "time", return_value=1061.0):
+            self.chat()
+        self.assertEqual(self.siteverify.call_count, 2)
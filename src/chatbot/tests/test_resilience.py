@@ -0,0 +1,92 @@
+from unittest import mock
+
+import httpx
+import openai
+from django.test import SimpleTestCase, override_settings
+
+from chatbot.domain.errors import UpstreamUnavailable
+from chatbot.infrastructure import resilience
+
+
+def transient_error() -> Exception:
+    return openai.APIConnectionError(request=httpx.Request("POST", "https://api.openai.com"))
+
+
+class CircuitBreakerTests(SimpleTestCase):
+    def test_opens_after_threshold_and_lets_one_probe_through(self):
+        breaker = resilience.CircuitBreaker("test", failure_threshold=2, reset_timeout=10)
+        with mock.patch.object(resilience.time, "monotonic", return_value=100.0):
+            breaker.record_failure()
+            self.assertTrue(breaker.allow())
+            breaker.record_failure()
+            self.assertFalse(breaker.allow())
+        with mock.patch.object(resilience.time, "monotonic", return_value=111.0):
+            self.assertTrue(breaker.allow())
+            self.assertFalse(breaker.allow())
+            breaker.record_success()
+            self.assertTrue(breaker.allow())
+
+    def test_failed_probe_reopens(self):
+        breaker = resilience.CircuitBreaker("test", failure_threshold=1, reset_timeout=10)
+        with mock.patch.object(resilience.time, "monotonic", return_value=100.0):
+            breaker.record_failure()
+        with mock.patch.object(resilience.time, "monotonic", return_value=111.0):
+            self.assertTrue(breaker.allow())
+            breaker.record_failure()
+            self.assertFalse(breaker.allow())
+
+
+@override_settings(OPENAI_HEDGE_ENABLED=False)
+class CallUpstreamTests(SimpleTestCase):
+    def setUp(self):
+        self.name = f"test-{self._testMethodName}"
+        self.calls = 0
+
+    def failing(self, timeout: float):
+        self.calls += 1
+        raise transient_error()
+
+    def test_retries_transient_errors_then_records_one_failure(self):
+        with mock.patch.object(resilience.time, "sleep"):
+            with self.assertRaises(UpstreamUnavailable):
+                resilience.call_upstream(self.failing, name=self.name, stage="embed", attempt_timeout=1, retries=2)
+        self.assertEqual(self.calls, 3)
+        self.assertEqual(resilience.get_breaker(self.name)._failures, 1)
+
+    def test_spent_deadline_does_not_touch_the_breaker(self):
+        with resilience.deadline(0):
+            with self.assertRaises(UpstreamUnavailable):
+                resilience.call_upstream(self.failing, name=self.name, stage="embed", attempt_timeout=1)
+        self.assertEqual(self.calls, 0)
+        self.assertEqual(resilience.get_breaker(self.name)._failures, 0)
+
+    def half_open_breaker(self) -> resilience.CircuitBreaker:
+        breaker = resilience.CircuitBreaker(self.name, failure_threshold=1, reset_timeout=10)
+        patcher = mock.patch.dict(resilience._breakers, {self.name: breaker})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        with mock.patch.object(resilience.time, "monotonic", return_value=100.0):
+            breaker.record_failure()
+        patcher = mock.patch.object(resilience.time, "monotonic", return_value=111.0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return breaker
+
+    def test_spent_deadline_keeps_the_half_open_probe(self):
+        breaker = self.half_open_breaker()
+        with resilience.deadline(0):
+            with self.assertRaises(UpstreamUnavailable):
+                resilience.call_upstream(self.failing, name=self.name, stage="embed", attempt_timeout=1)
+        self.assertEqual(self.calls, 0)
+
+        result = resilience.call_upstream(lambda timeout: "ok", name=self.name, stage="embed", attempt_timeout=1)
+        self.assertEqual(result, "ok")
+        self.assertIsNone(breaker._opened_at)
+
+    def test_probe_is_released_when_the_budget_runs_out_after_admission(self):
+        breaker = self.half_open_breaker()
+        with mock.patch.object(resilience, "remaining", side_effect=[1.0, 0.0]):
+            with self.assertRaises(UpstreamUnavailable):
+                resilience.call_upstream(self.failing, name=self.name, stage="embed", attempt_timeout=1)
+        self.assertEqual(self.calls, 0)
+        self.assertTrue(breaker.allow())
@@ -0,0 +1,123 @@
+from unittest import mock
+
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, OperationalError, connections
+from django.test import SimpleTestCase, override_settings
+
+from chatbot.infrastructure.django import repositories, routers
+from chatbot.infrastructure.embeddings.hash_embedder import HashEmbedder
+from chatbot.models import CannedAnswer, Chunk, ChunkEmbedding
+
+
+def replica(lag: float | None = 0.0) -> mock.MagicMock:
+    """A connection whose lag query returns `lag`, or fails when it is None."""
+    connection = mock.MagicMock()
+    cursor = connection.cursor.return_value.__enter__.return_value
+    if lag is None:
+        cursor.execute.side_effect = DatabaseError("connection refused")
+    cursor.fetchone.return_value = (lag,)
+    return connection
+
+
+class ReplicaPoolTests(SimpleTestCase):
+    def pool(self, **lags) -> routers.ReplicaPool:
+        self.connections = {alias: replica(lag) for alias, lag in lags.items()}
+        patcher = mock.patch.object(routers, "connections", self.connections)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(routers.logger, "disabled", new=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return routers.ReplicaPool(list(lags), interval=15, max_lag=30)
+
+    def test_round_robins_over_healthy_replicas(self):
+        pool = self.pool(replica0=0.0, replica1=5.0)
+        self.assertEqual([pool.choose() for _ in range(4)], ["replica0", "replica1"] * 2)
+
+    def test_skips_lagging_and_unreachable_replicas(self):
+        pool = self.pool(replica0=120.0, replica1=None, replica2=0.0)
+        self.assertEqual({pool.choose() for _ in range(3)}, {"replica2"})
+        self.connections["replica1"].close.assert_called()
+
+    def test_no_healthy_replica_means_the_primary(self):
+        self.assertIsNone(self.pool(replica0=None).choose())
+        self.assertIsNone(routers.ReplicaPool([], interval=15, max_lag=30).choose())
+
+    def test_health_is_rechecked_only_after_the_interval(self):
+        pool = self.pool(replica0=0.0)
+        with mock.patch.object(routers.time, "monotonic", return_value=100.0):
+            pool.mark_unhealthy("replica0")
+            self.assertIsNone(pool.choose())
+        with mock.patch.object(routers.time, "monotonic", return_value=110.0):
+            self.assertIsNone(pool.choose())
+        self.connections["replica0"].cursor.assert_not_called()
+        with mock.patch.object(routers.time, "monotonic", return_value=116.0):
+            self.assertEqual(pool.choose(), "replica0")
+
+
+class ReplicaRouterTests(SimpleTestCase):
+    def setUp(self):
+        self.router = routers.ReplicaRouter()
+        patcher = mock.patch.object(routers, "get_replica_pool")
+        self.pool = patcher.start().return_value
+        self.pool.choose.return_value = "replica0"
+        self.addCleanup(patcher.stop)
+
+    def test_chunk_reads_go_to_a_replica(self):
+        self.assertEqual(self.router.db_for_read(Chunk), "replica0")
+        self.assertEqual(self.router.db_for_read(ChunkEmbedding), "replica0")
+        self.assertIsNone(self.router.db_for_read(CannedAnswer))
+        self.assertEqual(self.router.db_for_write(Chunk), DEFAULT_DB_ALIAS)
+
+    def test_primary_when_forced_inside_a_transaction_or_without_replicas(self):
+        with routers.use_primary():
+            self.assertEqual(self.router.db_for_read(Chunk), DEFAULT_DB_ALIAS)
+        with mock.patch.object(connections[DEFAULT_DB_ALIAS], "in_atomic_block", True):
+            self.assertEqual(self.router.db_for_read(Chunk), DEFAULT_DB_ALIAS)
+        self.pool.choose.return_value = None
+        self.assertEqual(self.router.db_for_read(Chunk), DEFAULT_DB_ALIAS)
+
+    def test_migrations_only_run_on_the_primary(self):
+        self.assertTrue(self.router.allow_migrate(DEFAULT_DB_ALIAS, "chatbot"))
+        self.assertFalse(self.router.allow_migrate("replica0", "chatbot"))
+
+
+@override_settings(DATABASE_ROUTERS=["chatbot.infrastructure.django.routers.ReplicaRouter"])
+class ReplicaFailoverTests(SimpleTestCase):
+    row = {"content": "python django postgres", "source": "backend.md", "merged_sources": [], "distance": 0.25}
+
+    def setUp(self):
+        pool = mock.MagicMock()
+        pool.choose.return_value = "replica0"
+        for module in (routers, repositories):
+            patcher = mock.patch.object(module, "get_replica_pool", return_value=pool)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.pool = pool
+        self.repo = repositories.PgVectorChunkRepository(embedder=HashEmbedder(64))
+
+    def search(self, *fetched):
+        with (
+            mock.patch.object(self.repo, "_fetch", side_effect=fetched) as fetch,
+            mock.patch.object(repositories, "connections") as conns,
+        ):
+            results = self.repo.search("django")
+        return results, fetch, conns
+
+    def test_a_replica_dropping_mid_query_fails_over_to_the_primary(self):
+        results, fetch, conns = self.search(OperationalError("server closed the connection"), [self.row])
+        self.assertEqual([call.args[1] for call in fetch.call_args_list], ["replica0", DEFAULT_DB_ALIAS])
+        self.pool.mark_unhealthy.assert_called_once_with("replica0")
+        conns.__getitem__.assert_called_with("replica0")
+        self.assertEqual(results[0]["source"], "backend.md")
+        self.assertEqual(results[0]["score"], 0.75)
+
+    def test_primary_errors_are_not_retried(self):
+        self.pool.choose.return_value = None
+        with self.assertRaises(OperationalError):
+            self.search(OperationalError("primary down"))
+        self.pool.mark_unhealthy.assert_not_called()
+
+    def test_use_primary_keeps_the_search_on_the_primary(self):
+        with routers.use_primary():
+            _, fetch, _ = self.search([self.row])
+        self.assertEqual(fetch.call_args.args[1], DEFAULT_DB_ALIAS)
@@ -0,0 +1,106 @@
+import threading
+import time
+from unittest import mock
+
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import Client, SimpleTestCase, override_settings
+
+from chatbot.infrastructure.singleflight import SingleFlight, chat_flight_key
+from chatbot.tests.helpers import ChatAPIMixin
+
+
+def local_cache(name: str) -> LocMemCache:
+    return LocMemCache(name, {})
+
+
+class SingleFlightTests(SimpleTestCase):
+    def flight(self):
+        cache = local_cache(f"flight-{self._testMethodName}")
+        cache.clear()
+        return SingleFlight("test", lock_ttl=5, wait_timeout=5, result_ttl=5, cache=cache)
+
+    def test_concurrent_callers_share_one_computation(self):
+        flight = self.flight()
+        release = threading.Event()
+        calls = []
+        results = []
+
+        def compute():
+            calls.append(1)
+            release.wait(5)
+            return "answer"
+
+        threads = [threading.Thread(target=lambda: results.append(flight.do("key", compute))) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.05)
+        release.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, ["answer"] * 5)
+
+    def test_leader_errors_propagate_and_do_not_stick(self):
+        flight = self.flight()
+
+        def fail():
+            raise ValueError("boom")
+
+        with self.assertRaises(ValueError):
+            flight.do("key", fail)
+        self.assertEqual(flight.do("key", lambda: 42), 42)
+
+    def test_other_workers_wait_for_the_published_result(self):
+        flight = self.flight()
+        flight.poll_interval = 0.01
+        flight.cache.add("flight:test:lock:key", "other-worker", 5)
+        flight.cache.set("flight:test:result:key", "shared", 5)
+        self.assertEqual(flight.do("key", lambda: "local"), "shared")
+
+
+class ChatFlightKeyTests(SimpleTestCase):
+    def test_normalized_questions_share_a_key_per_filter_set(self):
+        key = chat_flight_key("Django Postgres?", None)
+        self.assertEqual(chat_flight_key("  django   postgres? ", {}), key)
+        self.assertNotEqual(chat_flight_key("django postgres?", {"source_type": "resume"}), key)
+
+
+# Cache-backed sessions keep the threaded requests off the test database.
+@override_settings(SESSION_ENGINE="django.contrib.sessions.backends.cache", CHAT_SUGGESTED_QUESTIONS=[])
+class ChatCoalescingTests(ChatAPIMixin, SimpleTestCase):
+    def concurrent_chats(self, queries: list[str]) -> tuple[list[dict], int]:
+        release = threading.Event()
+        execute = self.use_case.execute
+
+        def slow_execute(*args, **kwargs):
+            release.wait(5)
+            return execute(*args, **kwargs)
+
+        results = []
+        with mock.patch.object(self.use_case, "execute", side_effect=slow_execute) as spy:
+            threads = [
+                threading.Thread(target=lambda query=query: results.append(self.chat(query, client=Client()).json()))
+                for query in queries
+            ]
+            for thread in threads:
+                thread.start()
+            time.sleep(0.1)
+            release.set()
+            for thread in threads:
+                thread.join()
+        return results, spy.call_count
+
+    def test_identical_questions_in_flight_are_answered_once(self):
+        results, calls = self.concurrent_chats(["django postgres", "Django  Postgres", "django postgres"])
+        self.assertEqual(calls, 1)
+        self.assertEqual(len({result["answer"] for result in results}), 1)
+        self.assertEqual(len(results), 3)
+
+    def test_different_questions_are_not_coalesced(self):
+        _, calls = self.concurrent_chats(["django postgres", "hiking photography"])
+        self.assertEqual(calls, 2)
+
+    @override_settings(CHAT_COALESCE_ENABLED=False)
+    def test_coalescing_can_be_disabled(self):
+        _, calls = self.concurrent_chats(["django postgres"] * 2)
+        self.assertEqual(calls, 2)
@@ -0,0 +1,149 @@
+import threading
+import time
+from unittest import mock
+
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import Client, SimpleTestCase, TestCase, override_settings
+from rest_framework.exceptions import Throttled
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from rest_framework.throttling import SimpleRateThrottle
+
+from chatbot.interface.api.throttling import ChatIPThrottle, ChatSessionThrottle, ConcurrencyGate, TokenBucketThrottle
+from chatbot.tests.helpers import ChatAPIMixin
+
+
+class TokenBucketThrottleTests(SimpleTestCase):
+    class Bucket(TokenBucketThrottle):
+        scope = "test"
+        rate = "3/min"
+
+        def get_cache_key(self, request, view):
+            return "throttle_test_bucket"
+
+    def setUp(self):
+        self.cache = LocMemCache("throttle-tests", {})
+        self.cache.clear()
+        self.now = 1000.0
+
+    def throttle(self):
+        throttle = self.Bucket()
+        throttle.cache = self.cache
+        throttle.timer = lambda: self.now
+        return throttle
+
+    def test_allows_a_burst_then_refills_at_the_rate(self):
+        self.assertEqual([self.throttle().allow_request(None, None) for _ in range(4)], [True, True, True, False])
+        self.now += 20
+        self.assertTrue(self.throttle().allow_request(None, None))
+        self.assertFalse(self.throttle().allow_request(None, None))
+
+    def test_concurrent_requests_cannot_spend_the_same_token(self):
+        read = self.cache.get
+
+        def slow_read(key, *args):
+            # Widen the read-modify-write window so unsynchronised updates would race.
+            value = read(key, *args)
+            time.sleep(0.005)
+            return value
+
+        self.cache.get = slow_read
+        results = []
+        start = threading.Barrier(12)
+
+        def hit():
+            throttle = self.throttle()
+            throttle.lock_wait = 5
+            start.wait()
+            results.append(throttle.allow_request(None, None))
+
+        threads = [threading.Thread(target=hit) for _ in range(12)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results.count(True), 3)
+
+    def test_session_throttle_falls_back_to_the_client_ip(self):
+        request = APIRequestFactory().post("/api/chat/", REMOTE_ADDR="203.0.113.7")
+        request.session = mock.Mock(session_key=None)
+        key = ChatSessionThrottle().get_cache_key(Request(request), None)
+        self.assertIn("203.0.113.7", key)
+
+
+class ConcurrencyGateTests(SimpleTestCase):
+    def gate(self, limit=1, queue_size=0, queue_timeout=0.0):
+        cache = LocMemCache(f"gate-{self._testMethodName}", {})
+        cache.clear()
+        return ConcurrencyGate("test", limit, queue_size, queue_timeout, slot_ttl=60, cache=cache)
+
+    def test_rejects_when_slots_and_queue_are_full(self):
+        gate = self.gate()
+        with gate.slot():
+            with self.assertRaises(Throttled):
+                with gate.slot():
+                    pass
+        with gate.slot():
+            pass
+
+    def test_queued_request_runs_once_a_slot_frees(self):
+        gate = self.gate(queue_size=1, queue_timeout=5)
+        gate.poll_interval = 0.01
+        entered = threading.Event()
+        finished = []
+
+        def queued():
+            entered.set()
+            with gate.slot():
+                finished.append(True)
+
+        with gate.slot():
+            worker = threading.Thread(target=queued)
+            worker.start()
+            entered.wait()
+            time.sleep(0.05)
+            self.assertEqual(finished, [])
+        worker.join(timeout=5)
+        self.assertEqual(finished, [True])
+
+    def test_zero_limit_disables_the_gate(self):
+        gate = self.gate(limit=0)
+        with gate.slot(), gate.slot():
+            pass
+
+
+class ClientIdentTests(SimpleTestCase):
+    @override_settings(REST_FRAMEWORK={"NUM_PROXIES": 1})
+    def test_spoofed_forwarded_for_entries_do_not_change_the_bucket(self):
+        factory = APIRequestFactory()
+        keys = {
+            ChatIPThrottle().get_cache_key(
+                Request(factory.post("/api/chat/", HTTP_X_FORWARDED_FOR=f"{spoofed}, 203.0.113.9")),
+                None,
+            )
+            for spoofed in ("198.51.100.1", "198.51.100.2")
+        }
+        self.assertEqual(len(keys), 1)
+        self.assertIn("203.0.113.9", keys.pop())
+
+
+class ChatAdmissionTests(ChatAPIMixin, TestCase):
+    def test_session_bucket_returns_429_with_retry_after(self):
+        with mock.patch.dict(SimpleRateThrottle.THROTTLE_RATES, {"chat_session": "2/min"}):
+            # Keyed by client IP until this first response creates the session.
+            self.chat()
+            statuses = [self.chat().status_code for _ in range(3)]
+            self.assertEqual(statuses, [200, 200, 429])
+            self.assertGreater(int(self.chat()["Retry-After"]), 0)
+
+    def test_dropping_the_session_cookie_does_not_escape_the_throttle(self):
+        with mock.patch.dict(SimpleRateThrottle.THROTTLE_RATES, {"chat_session": "2/min"}):
+            statuses = [self.chat(client=Client()).status_code for _ in range(3)]
+        self.assertEqual(statuses, [200, 200, 429])
+
+    @override_settings(CHAT_MAX_CONCURRENCY=1, CHAT_QUEUE_SIZE=0, CHAT_COALESCE_ENABLED=False)
+    def test_full_concurrency_gate_returns_429(self):
+        with ConcurrencyGate.for_chat().slot():
+            response = self.chat()
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(self.chat().status_code, 200)
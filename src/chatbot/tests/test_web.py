@@ -0,0 +1,94 @@
+import gzip
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from chatbot.interface.web import views
+from chatbot.interface.web.compression import pick_encoding
+from chatbot.observability import middleware
+
+
+class PickEncodingTests(SimpleTestCase):
+    available = {"identity": b"", "gzip": b"", "br": b""}
+
+    def test_prefers_brotli_then_gzip(self):
+        self.assertEqual(pick_encoding("gzip, deflate, br", self.available), "br")
+        self.assertEqual(pick_encoding("gzip", self.available), "gzip")
+        self.assertEqual(pick_encoding("gzip", {"identity": b""}), "identity")
+
+    def test_honours_q_zero_and_wildcards(self):
+        self.assertEqual(pick_encoding("br;q=0, gzip", self.available), "gzip")
+        self.assertEqual(pick_encoding("*", self.available), "br")
+        self.assertEqual(pick_encoding("", self.available), "identity")
+
+
+@override_settings(DEBUG=False, PAGE_CACHE_VERSION="test")
+class HomeViewTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_serves_validators_and_varies_on_encoding(self):
+        response = self.client.get("/")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["ETag"].startswith('W/"'))
+        self.assertIn("Last-Modified", response)
+        self.assertEqual(response["Cache-Control"], "public, max-age=300")
+        self.assertIn("Accept-Encoding", response["Vary"])
+        self.assertNotIn("Content-Encoding", response)
+
+    def test_matching_validators_answer_304(self):
+        first = self.client.get("/")
+        response = self.client.get("/", HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+        self.assertEqual(response["ETag"], first["ETag"])
+
+        response = self.client.get("/", HTTP_IF_MODIFIED_SINCE=first["Last-Modified"])
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(self.client.get("/", HTTP_IF_NONE_MATCH='W/"stale"').status_code, 200)
+
+    def test_gzip_variant_decodes_to_the_identity_body(self):
+        identity = self.client.get("/").content
+        response = self.client.get("/", HTTP_ACCEPT_ENCODING="gzip")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(response.content), identity)
+
+    def test_page_is_rendered_once_per_cache_version(self):
+        with mock.patch.object(views, "render_to_string", wraps=views.render_to_string) as render:
+            self.client.get("/")
+            self.client.get("/")
+            self.assertEqual(render.call_count, 1)
+            with override_settings(PAGE_CACHE_VERSION="next"):
+                self.client.get("/")
+            self.assertEqual(render.call_count, 2)
+
+
+class ChatHistoryTests(TestCase):
+    history = [
+        {"role": "user", "content": "What do you build?"},
+        {"role": "assistant", "content": "Django services."},
+    ]
+
+    def setUp(self):
+        cache.clear()
+        session = self.client.session
+        session[views.SESSION_HISTORY_KEY] = self.history
+        session.save()
+        patcher = mock.patch.object(middleware.logger, "disabled", new=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_history_renders_from_cached_fragments(self):
+        with mock.patch.object(views, "render_to_string", wraps=views.render_to_string) as render:
+            response = self.client.get("/chats/")
+            self.client.get("/chats/")
+        self.assertContains(response, "What do you build?")
+        self.assertContains(response, "Django services.")
+        self.assertEqual(render.call_count, 2)
+        self.assertEqual(len(cache.get_many([views._message_cache_key(m) for m in self.history])), 2)
+
+    def test_reset_clears_the_history(self):
+        response = self.client.post("/chat/reset/")
+        self.assertRedirects(response, "/chats/", fetch_redirect_response=False)
+        self.assertNotIn(views.SESSION_HISTORY_KEY, self.client.session)